@@ -2,8 +2,22 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from config import Config
+from utils.riot_api import RiotAPIClient
+from utils.identity_store import IdentityStore
+from utils.match_store import MatchStore
+from utils.storage import LeaderboardStorage
+from utils.lp_series import LpSeriesStore
+from utils.asset_cache import AssetCache
+from utils.champion_atlas import ChampionAtlas
+from utils.champion_registry import ChampionRegistry
+from utils.ddragon import DataDragonUpdater
+from utils.mastery_store import MasteryStore
+from utils.live_radar import LiveGameRadar
+from utils.poll_scheduler import PollScheduler
 
 # Configuration du logging
 def setup_logging():
@@ -66,11 +80,111 @@ class GarenBot(commands.Bot):
             'cogs.leaderboard',
             'cogs.lobby',
             ]
+        
+        # Client Riot API partagé par tous les cogs (un pool, un budget de rate limit)
+        self.riot_api: Optional[RiotAPIClient] = None
+        
+        # Stockage SQLite des leaderboards
+        self.storage: Optional[LeaderboardStorage] = None
+        self.lp_series: Optional[LpSeriesStore] = None
+        
+        # Masteries complètes des joueurs (lobby, summoner)
+        self.masteries: Optional[MasteryStore] = None
+        
+        # Parties en cours et cadence de rafraîchissement des joueurs suivis,
+        # alimentées par LeaderboardCog
+        self.live_radar: Optional[LiveGameRadar] = None
+        self.poll_scheduler: Optional[PollScheduler] = None
+        
+        # Données statiques des champions, partagées par tous les cogs
+        self.champions = ChampionRegistry()
+        
+        # Cache des images Data Dragon, préchargé en tâche de fond
+        self.assets: Optional[AssetCache] = None
+        self.champion_atlas: Optional[ChampionAtlas] = None
+        self.ddragon: Optional[DataDragonUpdater] = None
+        self._assets_warmup: Optional[asyncio.Task] = None
     
     async def setup_hook(self):
         """Hook appelé lors de l'initialisation du bot"""
         logger.info("Initialisation du bot...")
         
+        # Initialiser le client Riot API avant les cogs qui l'empruntent
+        self.riot_api = RiotAPIClient(
+            api_key=Config.RIOT_API_KEY,
+            region=Config.REGION,
+            routing=Config.get_routing(),
+            identity_store=IdentityStore(
+                Path(Config.IDENTITY_DB_PATH),
+                ttl=Config.IDENTITY_TTL,
+                miss_ttl=Config.IDENTITY_MISS_TTL
+            ),
+            match_store=MatchStore(Path(Config.MATCH_STORE_DIR))
+        )
+        await self.riot_api.__aenter__()
+        
+        logger.info("Client Riot API partagé initialisé")
+        
+        self.masteries = MasteryStore(
+            self.riot_api,
+            ttl=Config.MASTERY_TTL,
+            max_players=Config.MASTERY_MAX_PLAYERS
+        )
+        self.assets = AssetCache(Path(Config.ASSET_CACHE_DIR), self.riot_api)
+        self.champion_atlas = ChampionAtlas(self.assets, Config.CHAMPION_ICON_SIZE)
+        
+        # Charger le registre des champions (données enregistrées, sinon Data Dragon)
+        self.ddragon = DataDragonUpdater(
+            self.riot_api,
+            self.champions,
+            self.assets,
+            self.champion_atlas,
+            Path(Config.CHAMPION_DATA_PATH),
+            Path(Config.CHAMPION_FALLBACK_PATH)
+        )
+        # Une panne de Data Dragon ne doit pas empêcher le démarrage : le
+        # bot charge l'instantané fourni et ChampionsCog réessaiera
+        try:
+            if not await self.ddragon.load_saved():
+                await self.ddragon.check()
+        except Exception as e:
+            logger.error(
+                f"Données champions indisponibles au démarrage "
+                f"(version {Config.DDRAGON_VERSION}): {e}",
+                exc_info=True
+            )
+        if not len(self.champions):
+            await self.ddragon.load_fallback()
+        
+        # Cache d'assets : le préchargement ne retarde pas la connexion
+        self._assets_warmup = asyncio.create_task(self.warm_assets())
+        
+        # Ouvrir le stockage et importer les anciens fichiers JSON (une seule fois)
+        self.storage = LeaderboardStorage(Path(Config.STORAGE_DB_PATH))
+        await self.storage.migrate_json(Path(Config.LEADERBOARD_JSON_DIR))
+        
+        # Charger l'historique long terme des classements
+        self.lp_series = LpSeriesStore(
+            Path(Config.LP_SERIES_DB_PATH),
+            season_start=datetime.strptime(Config.SEASON_START, "%Y-%m-%d")
+        )
+        await self.lp_series.load()
+        
+        # Cadence par joueur, initialisée depuis l'historique des scores
+        self.poll_scheduler = PollScheduler(
+            min_interval=Config.SCHEDULER_MIN_INTERVAL,
+            max_interval=Config.SCHEDULER_MAX_INTERVAL,
+            post_game_delay=Config.POST_GAME_REFRESH_DELAY,
+            lp_series=self.lp_series
+        )
+        self.live_radar = LiveGameRadar(
+            self.riot_api,
+            idle_interval=Config.LIVE_IDLE_INTERVAL,
+            ingame_interval=Config.LIVE_INGAME_INTERVAL,
+            min_game_length=Config.LIVE_MIN_GAME_LENGTH,
+            scheduler=self.poll_scheduler
+        )
+        
         # Charger les cogs
         for extension in self.initial_extensions:
             try:
@@ -91,6 +205,32 @@ class GarenBot(commands.Bot):
             await self.tree.sync()
             logger.info("Commandes synchronisées globalement")
     
+    async def warm_assets(self):
+        """Précharge les icônes de tous les champions du registre et construit la planche"""
+        names = self.champions.all_assets()
+        await self.assets.warm("champion", names, Config.CHAMPION_ICON_SIZE)
+        await self.champion_atlas.load(names)
+    
+    async def close(self):
+        """Ferme le bot puis le client Riot API partagé et le stockage"""
+        if self._assets_warmup:
+            self._assets_warmup.cancel()
+        
+        await super().close()
+        
+        if self.storage:
+            await self.storage.close()
+        if self.lp_series:
+            await self.lp_series.close()
+        
+        if self.riot_api:
+            await self.riot_api.__aexit__(None, None, None)
+            if self.riot_api.identity_store:
+                await self.riot_api.identity_store.close()
+            if self.riot_api.match_store:
+                await self.riot_api.match_store.close()
+            logger.info("Client Riot API partagé fermé")
+    
     async def on_ready(self):
         """Appelé quand le bot est prêt"""
         logger.info("=" * 50)
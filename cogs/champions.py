@@ -1,16 +1,16 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import logging
-import aiohttp
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
 from io import BytesIO
-from PIL import Image
-from typing import Optional
-import json
 
 from utils.riot_api import RiotAPIClient, RiotAPIError
 from utils.embed_builder import EmbedBuilder
-from utils.constants import normalize_champion_name
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -21,112 +21,66 @@ class ChampionsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.riot_api: Optional[RiotAPIClient] = None
-        self.champion_map: dict = {}
+        # Dernière rotation rendue : empreinte, PNG, embed et URL CDN Discord
+        self.rotation_cache: Optional[Dict[str, Any]] = None
     
     async def cog_load(self):
-        """Initialise le client API et charge les données champions"""
-        self.riot_api = RiotAPIClient(
-            api_key=Config.RIOT_API_KEY,
-            region=Config.REGION,
-            routing=Config.get_routing()
-        )
-        await self.riot_api.__aenter__()
-        
-        # Charger le mapping champions
-        try:
-            with open("data/champions.json", "r", encoding="utf-8") as f:
-                self.champion_map = json.load(f)
-            logger.info(f"Mapping champions chargé: {len(self.champion_map)} champions")
-        except FileNotFoundError:
-            logger.warning("Fichier champions.json non trouvé")
-        
-        logger.info("Client Riot API initialisé pour ChampionsCog")
+        """Récupère le client API partagé et lance le suivi de Data Dragon"""
+        self.riot_api = self.bot.riot_api
+        logger.info("Client Riot API partagé récupéré pour ChampionsCog")
+        self.poll_ddragon.start()
     
     async def cog_unload(self):
-        """Nettoie le client API"""
-        if self.riot_api and self.riot_api.session:
-            await self.riot_api.__aexit__(None, None, None)
-            logger.info("Client Riot API fermé pour ChampionsCog")
+        """Arrête les tâches de fond"""
+        self.poll_ddragon.cancel()
     
-    async def fetch_champion_icon(
-        self,
-        champion_name: str,
-        size: int = 64
-    ) -> Optional[Image.Image]:
-        """
-        Récupère l'icône d'un champion depuis Data Dragon
-        
-        Args:
-            champion_name: Nom du champion
-            size: Taille de l'image (défaut: 64x64)
-        
-        Returns:
-            Image PIL ou None si échec
-        """
+    @tasks.loop(minutes=Config.DDRAGON_POLL_MINUTES)
+    async def poll_ddragon(self):
+        """Applique à chaud une nouvelle version de Data Dragon"""
         try:
-            safe_name = normalize_champion_name(champion_name)
-            url = (
-                f"{Config.DDRAGON_BASE_URL}/{Config.DDRAGON_VERSION}/"
-                f"img/champion/{safe_name}.png"
-            )
-            
-            if not self.riot_api.session:
-                return None
+            applied = await self.bot.ddragon.check()
             
-            async with self.riot_api.session.get(url) as response:
-                if response.status != 200:
-                    logger.warning(f"Impossible de récupérer l'icône pour {champion_name}")
-                    return None
-                
-                image_data = await response.read()
-                img = Image.open(BytesIO(image_data))
-                img = img.convert("RGBA").resize((size, size), Image.Resampling.LANCZOS)
-                return img
-        
+            # Données champions absentes au démarrage : préchargement rattrapé ici
+            if applied and not len(self.bot.champion_atlas):
+                await self.bot.warm_assets()
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération de l'icône {champion_name}: {e}")
-            return None
+            logger.error(f"Erreur lors de la vérification de Data Dragon: {e}", exc_info=True)
     
-    def create_champion_grid(
-        self,
-        images: list[Image.Image],
-        cols: int = 5
-    ) -> BytesIO:
+    @poll_ddragon.before_loop
+    async def before_poll_ddragon(self):
+        """Attend que le bot soit prêt avant la première vérification"""
+        await self.bot.wait_until_ready()
+    
+    @staticmethod
+    def rotation_key(champion_ids: Sequence[int]) -> str:
+        """Empreinte d'une rotation (liste des champions et version Data Dragon)"""
+        state = f"{Config.DDRAGON_VERSION}:{','.join(map(str, champion_ids))}"
+        return hashlib.sha1(state.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def cdn_url_valid(url: Optional[str]) -> bool:
         """
-        Crée une grille d'images de champions
-        
-        Args:
-            images: Liste des images PIL
-            cols: Nombre de colonnes
+        Vérifie qu'une URL d'attachement Discord est encore utilisable
         
-        Returns:
-            Buffer contenant l'image PNG
+        Les URL signées du CDN portent leur expiration dans le paramètre
+        `ex` (timestamp hexadécimal).
         """
-        if not images:
-            raise ValueError("Liste d'images vide")
+        if not url:
+            return False
         
-        img_size = 64
-        rows = (len(images) + cols - 1) // cols
-        
-        # Créer l'image combinée
-        grid = Image.new(
-            "RGBA",
-            (cols * img_size, rows * img_size),
-            (47, 49, 54, 255)  # Couleur Discord dark
-        )
-        
-        # Coller chaque image
-        for idx, img in enumerate(images):
-            x = (idx % cols) * img_size
-            y = (idx // cols) * img_size
-            grid.paste(img, (x, y), img)
-        
-        # Sauvegarder dans un buffer
-        buffer = BytesIO()
-        grid.save(buffer, format="PNG")
-        buffer.seek(0)
+        try:
+            expires_at = int(parse_qs(urlparse(url).query)["ex"][0], 16)
+        except (KeyError, IndexError, ValueError):
+            return False
         
-        return buffer
+        return expires_at - Config.CDN_URL_MARGIN > time.time()
+    
+    @staticmethod
+    def attachment_url(message: Optional[discord.Message]) -> Optional[str]:
+        """Retourne l'URL CDN de l'image envoyée avec un message"""
+        if message and message.attachments:
+            return message.attachments[0].url
+        return None
     
     @app_commands.command(
         name="garen-rotation",
@@ -160,22 +114,46 @@ class ChampionsCog(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
             
+            key = self.rotation_key(free_champion_ids)
+            cached = self.rotation_cache
+            
+            if cached and cached["key"] == key:
+                embed = cached["embed"].copy()
+                
+                # Réutiliser l'image déjà hébergée par Discord tant que son URL est valide
+                if self.cdn_url_valid(cached["url"]):
+                    embed.set_image(url=cached["url"])
+                    await interaction.followup.send(embed=embed)
+                    logger.info("Rotation servie depuis le cache (URL CDN)")
+                    return
+                
+                message = await interaction.followup.send(
+                    embed=embed,
+                    file=discord.File(fp=BytesIO(cached["png"]), filename="rotation.png"),
+                    wait=True
+                )
+                cached["url"] = self.attachment_url(message)
+                logger.info("Rotation servie depuis le cache (image renvoyée)")
+                return
+            
             logger.info(f"Rotation de {len(free_champion_ids)} champions")
             
-            # Récupérer les icônes
-            icons = []
+            # Noms d'icônes Data Dragon des champions gratuits
+            champion_names = []
             for champion_id in free_champion_ids:
-                champion_name = self.champion_map.get(str(champion_id))
+                asset = self.bot.champions.asset(champion_id)
                 
-                if not champion_name:
-                    logger.warning(f"Champion ID {champion_id} non trouvé dans le mapping")
+                if not asset:
+                    logger.warning(f"Champion ID {champion_id} non trouvé dans le registre")
                     continue
                 
-                icon = await self.fetch_champion_icon(champion_name)
-                if icon:
-                    icons.append(icon)
+                champion_names.append(asset)
             
-            if not icons:
+            # Les icônes viennent de la planche en mémoire (seuls les nouveaux champions sont chargés)
+            atlas = self.bot.champion_atlas
+            await atlas.ensure(champion_names)
+            
+            if not any(name in atlas for name in champion_names):
                 embed = EmbedBuilder.create_error_embed(
                     "Erreur",
                     "Impossible de récupérer les icônes des champions",
@@ -184,18 +162,30 @@ class ChampionsCog(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
             
-            # Créer la grille
-            grid_buffer = self.create_champion_grid(icons, cols=5)
+            # Créer la grille en une passe, hors de la boucle
+            grid_buffer, icon_count = await asyncio.to_thread(
+                atlas.compose_grid,
+                champion_names,
+                5
+            )
+            png = grid_buffer.getvalue()
             
             # Créer l'embed
-            embed = EmbedBuilder.create_rotation_embed(len(icons))
+            embed = EmbedBuilder.create_rotation_embed(icon_count)
             embed.set_image(url="attachment://rotation.png")
             
             # Envoyer
             file = discord.File(fp=grid_buffer, filename="rotation.png")
-            await interaction.followup.send(embed=embed, file=file)
+            message = await interaction.followup.send(embed=embed, file=file, wait=True)
+            
+            self.rotation_cache = {
+                "key": key,
+                "png": png,
+                "embed": embed,
+                "url": self.attachment_url(message)
+            }
             
-            logger.info(f"Rotation envoyée: {len(icons)} champions")
+            logger.info(f"Rotation envoyée: {icon_count} champions")
         
         except RiotAPIError as e:
             logger.error(f"Erreur API Riot: {e}")
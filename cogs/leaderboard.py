@@ -1,18 +1,26 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import logging
-import json
+import asyncio
+import time
 import os
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
-from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 from io import BytesIO
 import aiohttp
 
 from utils.riot_api import RiotAPIClient, RiotAPIError
+from utils.rank_snapshots import RankSnapshotService
+from utils.storage import LeaderboardStorage
 from utils.embed_builder import EmbedBuilder
+from utils.constants import calculate_rank_score
+from utils.lp_graph import render_lp_graph
+from utils.lp_series import downsample
+from utils.lp_aggregates import PERIODS
+from utils.podium import ICON_SIZE as PODIUM_ICON_SIZE, podium_key, render_podium
+from utils.cache import TTLCache
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -23,69 +31,129 @@ class LeaderboardCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.riot_api: Optional[RiotAPIClient] = None
-        self.data_dir = Path("data/leaderboards")
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.rank_snapshots: Optional[RankSnapshotService] = None
+        self.storage: Optional[LeaderboardStorage] = None
+        
+        # Empreinte du top 3 -> PNG du podium
+        self.podium_cache = TTLCache(
+            max_entries=Config.PODIUM_CACHE_ENTRIES,
+            max_bytes=Config.PODIUM_CACHE_ENTRIES * 512 * 1024,
+            sizeof=len
+        )
         
-        # Ordre des rangs pour le tri
-        self.rank_order = {
-            "IRON": 0, "BRONZE": 1, "SILVER": 2, "GOLD": 3,
-            "PLATINUM": 4, "EMERALD": 5, "DIAMOND": 6,
-            "MASTER": 7, "GRANDMASTER": 8, "CHALLENGER": 9
-        }
-        self.division_order = {"IV": 0, "III": 1, "II": 2, "I": 3}
+        # Dernière date de coupure appliquée à l'historique LP
+        self._last_prune: Optional[str] = None
     
     async def cog_load(self):
-        """Initialise le client API"""
-        self.riot_api = RiotAPIClient(
-            api_key=Config.RIOT_API_KEY,
-            region=Config.REGION,
-            routing=Config.get_routing()
+        """Récupère le client API partagé du bot"""
+        self.riot_api = self.bot.riot_api
+        self.storage = self.bot.storage
+        self.rank_snapshots = RankSnapshotService(
+            self.riot_api,
+            max_age=Config.SNAPSHOT_MAX_AGE,
+            lp_series=self.bot.lp_series,
+            scheduler=self.bot.poll_scheduler
         )
-        await self.riot_api.__aenter__()
-        logger.info("Client Riot API initialisé pour LeaderboardCog")
+        self.refresh_riot_ids.start()
+        self.refresh_snapshots.start()
+        self.flush_lp_history.start()
+        self.poll_live_games.start()
+        logger.info("Client Riot API partagé récupéré pour LeaderboardCog")
     
     async def cog_unload(self):
-        """Nettoie le client API"""
-        if self.riot_api and self.riot_api.session:
-            await self.riot_api.__aexit__(None, None, None)
-            logger.info("Client Riot API fermé pour LeaderboardCog")
+        """Arrête les tâches de fond"""
+        self.refresh_riot_ids.cancel()
+        self.refresh_snapshots.cancel()
+        self.flush_lp_history.cancel()
+        self.poll_live_games.cancel()
+        await self.storage.flush_lp()
+        await self.bot.lp_series.flush()
     
-    def get_leaderboard_file(self, guild_id: int) -> Path:
-        """Retourne le chemin du fichier leaderboard pour un serveur"""
-        return self.data_dir / f"{guild_id}.json"
+    @tasks.loop(hours=Config.IDENTITY_REFRESH_HOURS)
+    async def refresh_riot_ids(self):
+        """Re-résout les Riot ID de tous les comptes suivis (renommages)"""
+        try:
+            players = await self.storage.get_all_players()
+            
+            logger.info(f"Re-résolution de {len(players)} Riot ID")
+            
+            # Un seul appel par compte, même s'il est suivi sur plusieurs serveurs
+            puuids = list(players)
+            accounts = await self.riot_api.get_many(
+                self.riot_api.get_account_by_puuid(puuid) for puuid in puuids
+            )
+            
+            for puuid, account in zip(puuids, accounts):
+                current_riot_id = players[puuid]
+                if isinstance(account, Exception):
+                    logger.warning(f"Re-résolution impossible pour {puuid}: {account}")
+                    continue
+                
+                if not account or not account.get("gameName") or not account.get("tagLine"):
+                    continue
+                
+                riot_id = f"{account['gameName']}#{account['tagLine']}"
+                if riot_id != current_riot_id:
+                    logger.info(f"Compte renommé: {current_riot_id} -> {riot_id}")
+                    await self.storage.update_riot_id(puuid, riot_id)
+            
+            if self.riot_api.identity_store:
+                await self.riot_api.identity_store.purge_expired()
+        except Exception as e:
+            logger.error(f"Erreur de la re-résolution des Riot ID: {e}", exc_info=True)
     
-    def load_leaderboard(self, guild_id: int) -> Dict:
-        """Charge le leaderboard d'un serveur"""
-        file_path = self.get_leaderboard_file(guild_id)
-        
-        if not file_path.exists():
-            return {"guild_id": str(guild_id), "players": []}
-        
+    @refresh_riot_ids.before_loop
+    async def before_refresh_riot_ids(self):
+        """Attend que le bot soit prêt avant la première re-résolution"""
+        await self.bot.wait_until_ready()
+    
+    @tasks.loop(seconds=Config.SNAPSHOT_TICK_SECONDS)
+    async def refresh_snapshots(self):
+        """Rafraîchit l'instantané des rangs des joueurs dont l'échéance est venue"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            guild_players = {}
+            for guild_id in await self.storage.get_guild_ids():
+                players = await self.storage.get_players(guild_id)
+                guild_players[guild_id] = [player["puuid"] for player in players]
+            
+            await self.rank_snapshots.refresh_all(guild_players)
+            
+            # Nettoyer les anciennes dates (garder seulement les 7 derniers jours),
+            # une fois par changement de date et non à chaque passage
+            cutoff_date = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
+            if cutoff_date != self._last_prune:
+                await self.storage.prune_lp_history(cutoff_date)
+                self._last_prune = cutoff_date
         except Exception as e:
-            logger.error(f"Erreur lors du chargement du leaderboard: {e}")
-            return {"guild_id": str(guild_id), "players": []}
+            logger.error(f"Erreur du rafraîchissement des rangs: {e}", exc_info=True)
     
-    def save_leaderboard(self, guild_id: int, data: Dict):
-        """Sauvegarde le leaderboard d'un serveur"""
-        file_path = self.get_leaderboard_file(guild_id)
-        
+    @tasks.loop(seconds=Config.LP_FLUSH_SECONDS)
+    async def flush_lp_history(self):
+        """Écrit en différé les relevés LP en attente"""
+        try:
+            await self.storage.flush_lp()
+            await self.bot.lp_series.flush()
+        except Exception as e:
+            logger.error(f"Erreur de l'écriture différée des LP: {e}", exc_info=True)
+    
+    @tasks.loop(seconds=Config.LIVE_TICK_SECONDS)
+    async def poll_live_games(self):
+        """Met à jour le radar des parties en cours (seuls les joueurs dont le tour est venu)"""
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            players = await self.storage.get_all_players()
+            await self.bot.live_radar.poll(players)
         except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde du leaderboard: {e}")
-            raise
+            logger.error(f"Erreur du radar des parties en cours: {e}", exc_info=True)
     
-    def player_exists(self, leaderboard: Dict, puuid: str) -> bool:
-        """Vérifie si un joueur existe déjà dans le leaderboard"""
-        return any(p["puuid"] == puuid for p in leaderboard["players"])
+    @poll_live_games.before_loop
+    async def before_poll_live_games(self):
+        """Attend que le bot soit prêt avant la première vérification"""
+        await self.bot.wait_until_ready()
     
-    def get_player_by_discord_id(self, leaderboard: Dict, discord_id: int) -> List[Dict]:
-        """Récupère tous les comptes d'un utilisateur Discord"""
-        return [p for p in leaderboard["players"] if p["discord_user_id"] == str(discord_id)]
+    @refresh_snapshots.before_loop
+    async def before_refresh_snapshots(self):
+        """Attend que le bot soit prêt avant le premier rafraîchissement"""
+        await self.bot.wait_until_ready()
     
     @app_commands.command(
         name="garen-add-localserver",
@@ -127,11 +195,8 @@ class LeaderboardCog(commands.Cog):
             
             puuid = account["puuid"]
             
-            # Charger le leaderboard
-            leaderboard = self.load_leaderboard(interaction.guild_id)
-            
             # Vérifier si le compte existe déjà
-            if self.player_exists(leaderboard, puuid):
+            if await self.storage.player_exists(interaction.guild_id, puuid):
                 embed = EmbedBuilder.create_error_embed(
                     "Compte Déjà Ajouté",
                     f"Le compte **{riot_id}** est déjà dans le leaderboard !",
@@ -148,11 +213,13 @@ class LeaderboardCog(commands.Cog):
                 "added_at": datetime.utcnow().isoformat()
             }
             
-            leaderboard["players"].append(player_data)
-            self.save_leaderboard(interaction.guild_id, leaderboard)
+            await self.storage.add_player(interaction.guild_id, player_data)
             
             # Compter les comptes de l'utilisateur
-            user_accounts = self.get_player_by_discord_id(leaderboard, interaction.user.id)
+            user_accounts = await self.storage.get_players_by_discord_id(
+                interaction.guild_id,
+                interaction.user.id
+            )
             
             embed = discord.Embed(
                 title="✅ Compte Ajouté",
@@ -192,264 +259,153 @@ class LeaderboardCog(commands.Cog):
             )
             await interaction.followup.send(embed=embed)
     
-    def calculate_rank_score(self, rank_data: Optional[Dict]) -> int:
-        """Calcule un score pour trier les joueurs"""
-        if not rank_data:
-            return -1  # Unranked en dernier
-        
-        tier = rank_data.get("tier", "IRON")
-        rank = rank_data.get("rank", "IV")
-        lp = rank_data.get("leaguePoints", 0)
-        
-        # Score: tier * 1000 + division * 100 + LP
-        tier_score = self.rank_order.get(tier, 0) * 1000
-        
-        # Master+ n'ont pas de division
-        if tier in ["MASTER", "GRANDMASTER", "CHALLENGER"]:
-            division_score = 300
-        else:
-            division_score = self.division_order.get(rank, 0) * 100
-        
-        return tier_score + division_score + lp
-    
     async def fetch_profile_icon(self, icon_id: int) -> Optional[Image.Image]:
-        """Récupère l'icône de profil d'un joueur"""
-        try:
-            url = f"{Config.DDRAGON_BASE_URL}/{Config.DDRAGON_VERSION}/img/profileicon/{icon_id}.png"
-            
-            async with self.riot_api.session.get(url) as response:
-                if response.status != 200:
-                    return None
-                
-                image_data = await response.read()
-                img = Image.open(BytesIO(image_data))
-                return img.convert("RGBA")
-        
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération de l'icône {icon_id}: {e}")
-            return None
-    
-    def create_circular_mask(self, size: int) -> Image.Image:
-        """Crée un masque circulaire"""
-        mask = Image.new("L", (size, size), 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0, size, size), fill=255)
-        return mask
+        """Récupère l'icône de profil d'un joueur, prête pour le podium"""
+        return await self.bot.assets.get("profileicon", icon_id, PODIUM_ICON_SIZE, mask=True)
     
     async def create_podium_image(self, top_players: List[Dict]) -> BytesIO:
-        """Crée une image de podium avec les 3 meilleurs joueurs"""
-        # Dimensions
-        width = 800
-        podium_height = 400
-        
-        # Couleurs
-        bg_color = (47, 49, 54)
-        gold = (255, 215, 0)
-        silver = (192, 192, 192)
-        bronze = (205, 127, 50)
-        
-        # Créer l'image
-        img = Image.new("RGBA", (width, podium_height), bg_color)
-        draw = ImageDraw.Draw(img)
-        
-        # Positions et hauteurs du podium
-        podium_config = [
-            {"pos": 1, "x": 150, "height": 180, "color": gold, "y_offset": 0},      # 1er
-            {"pos": 0, "x": 30, "height": 140, "color": silver, "y_offset": 40},   # 2ème
-            {"pos": 2, "x": 270, "height": 100, "color": bronze, "y_offset": 80}   # 3ème
-        ]
-        
-        try:
-            font_large = ImageFont.truetype("arial.ttf", 24)
-            font_small = ImageFont.truetype("arial.ttf", 16)
-        except:
-            font_large = ImageFont.load_default()
-            font_small = ImageFont.load_default()
-        
-        for idx, config in enumerate(podium_config):
-            if idx >= len(top_players):
-                continue
-            
-            player = top_players[config["pos"]]
-            
-            # Dessiner le podium
-            podium_y = podium_height - config["height"]
-            podium_rect = [
-                config["x"],
-                podium_y,
-                config["x"] + 100,
-                podium_height
-            ]
-            draw.rectangle(podium_rect, fill=config["color"])
-            
-            # Numéro de place
-            place_text = f"#{config['pos'] + 1}"
-            bbox = draw.textbbox((0, 0), place_text, font=font_large)
-            text_width = bbox[2] - bbox[0]
-            draw.text(
-                (config["x"] + 50 - text_width // 2, podium_y + 10),
-                place_text,
-                fill=(0, 0, 0),
-                font=font_large
-            )
-            
-            # Récupérer et afficher l'icône de profil
-            icon = await self.fetch_profile_icon(player.get("profile_icon_id", 1))
-            
-            if icon:
-                icon_size = 80
-                icon = icon.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
-                
-                # Appliquer le masque circulaire
-                mask = self.create_circular_mask(icon_size)
-                
-                # Position de l'icône (au-dessus du podium)
-                icon_x = config["x"] + 10
-                icon_y = podium_y - icon_size - 10 + config["y_offset"]
-                
-                img.paste(icon, (icon_x, icon_y), mask)
-            
-            # Nom du joueur (sous l'icône)
-            name_parts = player["riot_id"].split("#")
-            game_name = name_parts[0] if len(name_parts) > 0 else "Unknown"
-            
-            # Limiter la longueur du nom
-            if len(game_name) > 10:
-                game_name = game_name[:10] + "..."
-            
-            bbox = draw.textbbox((0, 0), game_name, font=font_small)
-            text_width = bbox[2] - bbox[0]
-            draw.text(
-                (config["x"] + 50 - text_width // 2, podium_y - 25 + config["y_offset"]),
-                game_name,
-                fill=(255, 255, 255),
-                font=font_small
-            )
-            
-            # Rang
-            rank_text = player.get("rank_display", "Unranked")
-            bbox = draw.textbbox((0, 0), rank_text, font=font_small)
-            text_width = bbox[2] - bbox[0]
-            draw.text(
-                (config["x"] + 50 - text_width // 2, podium_y + 40),
-                rank_text,
-                fill=(0, 0, 0),
-                font=font_small
-            )
-            
-            # LP
-            lp_text = f"{player.get('lp', 0)} LP"
-            bbox = draw.textbbox((0, 0), lp_text, font=font_small)
-            text_width = bbox[2] - bbox[0]
-            draw.text(
-                (config["x"] + 50 - text_width // 2, podium_y + 65),
-                lp_text,
-                fill=(0, 0, 0),
-                font=font_small
-            )
-        
-        # Sauvegarder
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        
-        return buffer
-    
-    def load_daily_lp_history(self, guild_id: int) -> Dict:
-        """Charge l'historique LP de la journée"""
-        file_path = self.data_dir / f"{guild_id}_lp_history.json"
-        
-        if not file_path.exists():
-            return {}
-        
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement de l'historique LP: {e}")
-            return {}
-    
-    def save_daily_lp_history(self, guild_id: int, data: Dict):
-        """Sauvegarde l'historique LP de la journée"""
-        file_path = self.data_dir / f"{guild_id}_lp_history.json"
-        
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde de l'historique LP: {e}")
+        """
+        Crée une image de podium avec les 3 meilleurs joueurs
+
+        Le PNG est mis en cache par empreinte du top 3 (Riot ID, rang, LP,
+        icône) : un podium inchangé est resservi sans être redessiné.
+        Le dessin se fait dans un thread pour ne pas bloquer la boucle.
+        """
+        key = podium_key(top_players)
+        png = self.podium_cache.get(key)
+
+        if png is None:
+            icons = await asyncio.gather(*(
+                self.fetch_profile_icon(player.get("profile_icon_id", 1))
+                for player in top_players[:3]
+            ))
+            png = await asyncio.to_thread(render_podium, top_players[:3], list(icons))
+            self.podium_cache.set(key, png, Config.PODIUM_CACHE_TTL)
+
+        return BytesIO(png)
     
     def get_today_date(self) -> str:
         """Retourne la date d'aujourd'hui au format YYYY-MM-DD"""
         return datetime.utcnow().strftime("%Y-%m-%d")
     
-    def calculate_lp_gain(self, puuid: str, current_lp: int, guild_id: int) -> int:
-        """Calcule le gain de LP de la journée"""
-        today = self.get_today_date()
-        lp_history = self.load_daily_lp_history(guild_id)
+    async def calculate_lp_gains(self, guild_id: int, current_lps: Dict[str, int]) -> Dict[str, int]:
+        """Calcule le gain de LP de la journée de tous les joueurs d'un serveur"""
+        return await self.storage.record_lp_batch(guild_id, self.get_today_date(), current_lps)
+    
+    def format_snapshot_time(self, snapshots: Dict[str, Dict]) -> str:
+        """Retourne l'heure du plus ancien instantané affiché ("données du ...")"""
+        oldest = min(snapshot["fetched_at"] for snapshot in snapshots.values())
+        return oldest.strftime("%d/%m/%Y %H:%M")
+    
+    async def resolve_user_names(self, guild: discord.Guild, discord_ids: List[str]) -> Dict[str, str]:
+        """
+        Retourne le nom affiché de plusieurs utilisateurs Discord
         
-        # Structure: {puuid: {date: lp}}
-        if puuid not in lp_history:
-            lp_history[puuid] = {}
+        Les utilisateurs en cache sont lus sans appel, les autres sont
+        récupérés en parallèle.
+        """
+        names = {}
+        missing = []
+        for discord_id in discord_ids:
+            user = guild.get_member(int(discord_id)) or self.bot.get_user(int(discord_id))
+            if user:
+                names[discord_id] = user.display_name
+            else:
+                missing.append(discord_id)
         
-        # Si on a déjà une entrée pour aujourd'hui, calculer la différence
-        if today in lp_history[puuid]:
-            start_lp = lp_history[puuid][today]
-            gain = current_lp - start_lp
-        else:
-            # Première entrée de la journée
-            lp_history[puuid][today] = current_lp
-            gain = 0
+        results = await asyncio.gather(
+            *(self.bot.fetch_user(int(discord_id)) for discord_id in missing),
+            return_exceptions=True
+        )
+        for discord_id, result in zip(missing, results):
+            if isinstance(result, discord.HTTPException):
+                names[discord_id] = "Utilisateur Inconnu"
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                names[discord_id] = result.display_name
         
-        # Nettoyer les anciennes dates (garder seulement les 7 derniers jours)
-        cutoff_date = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
-        lp_history[puuid] = {
-            date: lp for date, lp in lp_history[puuid].items()
-            if date >= cutoff_date
+        return names
+    
+    def build_info_row(
+        self,
+        player: Dict,
+        snapshot: Dict,
+        is_online: bool,
+        lp_gain: int
+    ) -> Dict:
+        """Construit la ligne d'un joueur pour /garen-info"""
+        solo_rank = snapshot["solo_rank"]
+        
+        # Préparer les données
+        player_data = {
+            "riot_id": player["riot_id"],
+            "discord_user_id": player["discord_user_id"],
+            "level": snapshot["summoner_level"],
+            "is_online": is_online,
+            "lp_gain": lp_gain
         }
         
-        # Sauvegarder
-        self.save_daily_lp_history(guild_id, lp_history)
-        
-        return gain
-    
-    async def check_player_online_status(self, puuid: str) -> bool:
-        """
-        Vérifie si un joueur est en ligne en regardant sa dernière partie
-        Note: L'API Riot ne fournit pas de statut "en ligne" direct,
-        on considère qu'un joueur est en ligne s'il a joué dans les 5 dernières minutes
-        """
-        try:
-            # Récupérer les 5 dernières parties
-            match_ids = await self.riot_api.get_match_history(puuid, count=5)
+        # Formater les infos de rang
+        if solo_rank:
+            tier = solo_rank.get("tier", "UNRANKED")
+            rank = solo_rank.get("rank", "")
+            lp = solo_rank.get("leaguePoints", 0)
+            wins = solo_rank.get("wins", 0)
+            losses = solo_rank.get("losses", 0)
             
-            if not match_ids:
-                return False
-            
-            # Vérifier la dernière partie
-            last_match_id = match_ids[0]
-            match_data = await self.riot_api.get_match_details(last_match_id)
-            
-            if not match_data:
-                return False
-            
-            # Vérifier le timestamp de la partie
-            game_end_timestamp = match_data.get("info", {}).get("gameEndTimestamp", 0)
+            if tier in ["MASTER", "GRANDMASTER", "CHALLENGER"]:
+                player_data["rank_display"] = f"{tier.capitalize()} {lp} LP"
+            else:
+                player_data["rank_display"] = f"{tier.capitalize()} {rank} - {lp} LP"
             
-            if game_end_timestamp == 0:
-                return False
+            player_data["record"] = f"{wins}W {losses}L"
+            player_data["rank_score"] = calculate_rank_score(solo_rank)
+        else:
+            player_data["rank_display"] = "Unranked"
+            player_data["record"] = "0W 0L"
+            player_data["rank_score"] = -1
+        
+        return player_data
+    
+    def build_leaderboard_row(self, player: Dict, snapshot: Dict) -> Dict:
+        """Construit la ligne d'un joueur pour /garen-leaderboard"""
+        solo_rank = snapshot["solo_rank"]
+        
+        # Préparer les données
+        player_info = {
+            "riot_id": player["riot_id"],
+            "discord_user_id": player["discord_user_id"],
+            "profile_icon_id": snapshot["profile_icon_id"],
+            "rank_data": solo_rank,
+            "rank_score": calculate_rank_score(solo_rank)
+        }
+        
+        # Formater l'affichage du rang
+        if solo_rank:
+            tier = solo_rank.get("tier", "UNRANKED")
+            rank = solo_rank.get("rank", "")
+            lp = solo_rank.get("leaguePoints", 0)
+            wins = solo_rank.get("wins", 0)
+            losses = solo_rank.get("losses", 0)
             
-            # Convertir en secondes
-            game_end_time = game_end_timestamp / 1000
-            current_time = datetime.utcnow().timestamp()
+            if tier in ["MASTER", "GRANDMASTER", "CHALLENGER"]:
+                player_info["rank_display"] = tier.capitalize()
+            else:
+                player_info["rank_display"] = f"{tier.capitalize()} {rank}"
             
-            # Considérer en ligne si partie terminée il y a moins de 5 minutes
-            time_diff = current_time - game_end_time
-            return time_diff < 300  # 5 minutes en secondes
+            player_info["lp"] = lp
+            player_info["wins"] = wins
+            player_info["losses"] = losses
+            player_info["winrate"] = round(wins / (wins + losses) * 100, 1) if (wins + losses) > 0 else 0
+        else:
+            player_info["rank_display"] = "Unranked"
+            player_info["lp"] = 0
+            player_info["wins"] = 0
+            player_info["losses"] = 0
+            player_info["winrate"] = 0
         
-        except Exception as e:
-            logger.error(f"Erreur lors de la vérification du statut en ligne: {e}")
-            return False
+        return player_info
     
     @app_commands.command(
         name="garen-info",
@@ -461,9 +417,9 @@ class LeaderboardCog(commands.Cog):
         
         try:
             # Charger le leaderboard
-            leaderboard_data = self.load_leaderboard(interaction.guild_id)
+            players = await self.storage.get_players(interaction.guild_id)
             
-            if not leaderboard_data["players"]:
+            if not players:
                 embed = EmbedBuilder.create_error_embed(
                     "Aucun Joueur",
                     "Aucun joueur enregistré sur ce serveur.\n"
@@ -473,67 +429,34 @@ class LeaderboardCog(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
             
-            logger.info(f"Récupération des infos pour {len(leaderboard_data['players'])} joueurs")
+            logger.info(f"Récupération des infos pour {len(players)} joueurs")
             
-            # Récupérer les infos de chaque joueur
-            players_info = []
+            # Rangs depuis l'instantané ; en ligne = en partie d'après le radar
+            snapshots = await self.rank_snapshots.get_snapshots(
+                interaction.guild_id,
+                [player["puuid"] for player in players]
+            )
             
-            for player in leaderboard_data["players"]:
-                try:
-                    # Récupérer le summoner
-                    summoner = await self.riot_api.get_summoner_by_puuid(player["puuid"])
-                    if not summoner:
-                        continue
-                    
-                    # Récupérer le rang
-                    league_entries = await self.riot_api.get_league_entries(player["puuid"])
-                    solo_rank = next(
-                        (entry for entry in league_entries 
-                         if entry.get("queueType") == "RANKED_SOLO_5x5"),
-                        None
-                    )
-                    
-                    # Calculer le gain de LP
-                    current_lp = solo_rank.get("leaguePoints", 0) if solo_rank else 0
-                    lp_gain = self.calculate_lp_gain(player["puuid"], current_lp, interaction.guild_id)
-                    
-                    # Vérifier le statut en ligne
-                    is_online = await self.check_player_online_status(player["puuid"])
-                    
-                    # Préparer les données
-                    player_data = {
-                        "riot_id": player["riot_id"],
-                        "discord_user_id": player["discord_user_id"],
-                        "level": summoner.get("summonerLevel", 0),
-                        "is_online": is_online,
-                        "lp_gain": lp_gain
-                    }
-                    
-                    # Formater les infos de rang
-                    if solo_rank:
-                        tier = solo_rank.get("tier", "UNRANKED")
-                        rank = solo_rank.get("rank", "")
-                        lp = solo_rank.get("leaguePoints", 0)
-                        wins = solo_rank.get("wins", 0)
-                        losses = solo_rank.get("losses", 0)
-                        
-                        if tier in ["MASTER", "GRANDMASTER", "CHALLENGER"]:
-                            player_data["rank_display"] = f"{tier.capitalize()} {lp} LP"
-                        else:
-                            player_data["rank_display"] = f"{tier.capitalize()} {rank} - {lp} LP"
-                        
-                        player_data["record"] = f"{wins}W {losses}L"
-                        player_data["rank_score"] = self.calculate_rank_score(solo_rank)
-                    else:
-                        player_data["rank_display"] = "Unranked"
-                        player_data["record"] = "0W 0L"
-                        player_data["rank_score"] = -1
-                    
-                    players_info.append(player_data)
-                
-                except Exception as e:
-                    logger.error(f"Erreur pour le joueur {player['riot_id']}: {e}")
+            # Calculer les gains de LP de tous les joueurs en un seul relevé
+            current_lps = {}
+            for puuid, snapshot in snapshots.items():
+                solo_rank = snapshot["solo_rank"]
+                current_lps[puuid] = solo_rank.get("leaguePoints", 0) if solo_rank else 0
+            lp_gains = await self.calculate_lp_gains(interaction.guild_id, current_lps)
+            
+            players_info = []
+            for player in players:
+                snapshot = snapshots.get(player["puuid"])
+                if not snapshot:
+                    logger.error(f"Aucune donnée pour le joueur {player['riot_id']}")
                     continue
+                
+                players_info.append(self.build_info_row(
+                    player,
+                    snapshot,
+                    self.bot.live_radar.is_in_game(player["puuid"]),
+                    lp_gains.get(player["puuid"], 0)
+                ))
             
             if not players_info:
                 embed = EmbedBuilder.create_error_embed(
@@ -563,13 +486,11 @@ class LeaderboardCog(commands.Cog):
                     users_dict[discord_id] = []
                 users_dict[discord_id].append(player)
             
+            user_names = await self.resolve_user_names(interaction.guild, list(users_dict))
+            
             # Afficher les infos par utilisateur
             for discord_id, accounts in users_dict.items():
-                try:
-                    discord_user = await self.bot.fetch_user(int(discord_id))
-                    user_name = discord_user.display_name
-                except:
-                    user_name = "Utilisateur Inconnu"
+                user_name = user_names[discord_id]
                 
                 accounts_text = ""
                 for account in accounts:
@@ -611,7 +532,7 @@ class LeaderboardCog(commands.Cog):
             total_lp_gain = sum(p["lp_gain"] for p in players_info)
             
             stats_text = (
-                f"🟢 En ligne: **{total_online}/{len(players_info)}**\n"
+                f"🟢 En partie: **{total_online}/{len(players_info)}**\n"
                 f"📊 Gain total du jour: **{total_lp_gain:+d} LP**"
             )
             
@@ -621,7 +542,7 @@ class LeaderboardCog(commands.Cog):
                 inline=False
             )
             
-            embed.set_footer(text=f"Dernière mise à jour: {datetime.utcnow().strftime('%d/%m/%Y %H:%M')} UTC")
+            embed.set_footer(text=f"Données du {self.format_snapshot_time(snapshots)} UTC")
             
             await interaction.followup.send(embed=embed)
             logger.info(f"Infos envoyées pour {interaction.guild.name}")
@@ -654,9 +575,9 @@ class LeaderboardCog(commands.Cog):
         
         try:
             # Charger le leaderboard
-            leaderboard_data = self.load_leaderboard(interaction.guild_id)
+            players = await self.storage.get_players(interaction.guild_id)
             
-            if not leaderboard_data["players"]:
+            if not players:
                 embed = EmbedBuilder.create_error_embed(
                     "Leaderboard Vide",
                     "Aucun joueur enregistré sur ce serveur.\n"
@@ -668,62 +589,20 @@ class LeaderboardCog(commands.Cog):
             
             logger.info(f"Récupération du leaderboard pour {interaction.guild.name}")
             
-            # Récupérer les infos de chaque joueur
-            players_data = []
+            # Récupérer les infos depuis l'instantané (en direct si périmé)
+            snapshots = await self.rank_snapshots.get_snapshots(
+                interaction.guild_id,
+                [player["puuid"] for player in players]
+            )
             
-            for player in leaderboard_data["players"]:
-                try:
-                    # Récupérer le summoner
-                    summoner = await self.riot_api.get_summoner_by_puuid(player["puuid"])
-                    if not summoner:
-                        continue
-                    
-                    # Récupérer le rang
-                    league_entries = await self.riot_api.get_league_entries(player["puuid"])
-                    solo_rank = next(
-                        (entry for entry in league_entries 
-                         if entry.get("queueType") == "RANKED_SOLO_5x5"),
-                        None
-                    )
-                    
-                    # Préparer les données
-                    player_info = {
-                        "riot_id": player["riot_id"],
-                        "discord_user_id": player["discord_user_id"],
-                        "profile_icon_id": summoner.get("profileIconId", 1),
-                        "rank_data": solo_rank,
-                        "rank_score": self.calculate_rank_score(solo_rank)
-                    }
-                    
-                    # Formater l'affichage du rang
-                    if solo_rank:
-                        tier = solo_rank.get("tier", "UNRANKED")
-                        rank = solo_rank.get("rank", "")
-                        lp = solo_rank.get("leaguePoints", 0)
-                        wins = solo_rank.get("wins", 0)
-                        losses = solo_rank.get("losses", 0)
-                        
-                        if tier in ["MASTER", "GRANDMASTER", "CHALLENGER"]:
-                            player_info["rank_display"] = tier.capitalize()
-                        else:
-                            player_info["rank_display"] = f"{tier.capitalize()} {rank}"
-                        
-                        player_info["lp"] = lp
-                        player_info["wins"] = wins
-                        player_info["losses"] = losses
-                        player_info["winrate"] = round(wins / (wins + losses) * 100, 1) if (wins + losses) > 0 else 0
-                    else:
-                        player_info["rank_display"] = "Unranked"
-                        player_info["lp"] = 0
-                        player_info["wins"] = 0
-                        player_info["losses"] = 0
-                        player_info["winrate"] = 0
-                    
-                    players_data.append(player_info)
-                
-                except Exception as e:
-                    logger.error(f"Erreur pour le joueur {player['riot_id']}: {e}")
+            players_data = []
+            for player in players:
+                snapshot = snapshots.get(player["puuid"])
+                if not snapshot:
+                    logger.error(f"Aucune donnée pour le joueur {player['riot_id']}")
                     continue
+                
+                players_data.append(self.build_leaderboard_row(player, snapshot))
             
             if not players_data:
                 embed = EmbedBuilder.create_error_embed(
@@ -762,12 +641,6 @@ class LeaderboardCog(commands.Cog):
                 leaderboard_text = ""
                 
                 for idx, player in enumerate(top_players[start_idx:], start=start_idx + 1):
-                    try:
-                        discord_user = await self.bot.fetch_user(int(player["discord_user_id"]))
-                        discord_name = discord_user.display_name
-                    except:
-                        discord_name = "Inconnu"
-                    
                     leaderboard_text += (
                         f"**#{idx}** • {player['riot_id']}\n"
                         f"└ {player['rank_display']} • {player['lp']} LP • "
@@ -780,7 +653,10 @@ class LeaderboardCog(commands.Cog):
                     inline=False
                 )
             
-            embed.set_footer(text=f"Total: {len(players_data)} joueurs • {datetime.utcnow().strftime('%d/%m/%Y')}")
+            embed.set_footer(
+                text=f"Total: {len(players_data)} joueurs • "
+                     f"Données du {self.format_snapshot_time(snapshots)} UTC"
+            )
             
             # Envoyer
             if podium_buffer:
@@ -809,6 +685,243 @@ class LeaderboardCog(commands.Cog):
             )
             await interaction.followup.send(embed=embed)
 
+    @app_commands.command(
+        name="garen-lp-graph",
+        description="Affiche l'évolution du classement des joueurs du serveur"
+    )
+    @app_commands.describe(
+        riot_id="Riot ID d'un joueur du serveur (tous les joueurs si vide)",
+        jours="Période affichée en jours (défaut: 30)"
+    )
+    async def lp_graph(
+        self,
+        interaction: discord.Interaction,
+        riot_id: Optional[str] = None,
+        jours: app_commands.Range[int, 1, 365] = 30
+    ):
+        """Affiche la courbe de classement d'un joueur ou du serveur"""
+        await interaction.response.defer()
+        
+        try:
+            players = await self.storage.get_players(interaction.guild_id)
+            
+            if riot_id:
+                players = [p for p in players if p["riot_id"].casefold() == riot_id.casefold()]
+                if not players:
+                    embed = EmbedBuilder.create_error_embed(
+                        "Joueur Introuvable",
+                        f"**{riot_id}** n'est pas dans le leaderboard du serveur.",
+                        error_type="warning"
+                    )
+                    await interaction.followup.send(embed=embed)
+                    return
+            
+            end = int(time.time())
+            start = end - jours * 86400
+            
+            # Séries des joueurs, les mieux classés d'abord (8 courbes max)
+            curves = []
+            for player in players:
+                series = self.bot.lp_series.get(player["puuid"])
+                if not series:
+                    continue
+                
+                timestamps, scores = series.range(start, end)
+                if not timestamps:
+                    continue
+                
+                timestamps, scores = downsample(timestamps, scores, buckets=Config.LP_GRAPH_WIDTH // 4)
+                game_name = player["riot_id"].split("#")[0]
+                curves.append((game_name, timestamps, scores))
+            
+            curves.sort(key=lambda curve: curve[2][-1], reverse=True)
+            curves = curves[:8]
+            
+            if not curves:
+                embed = EmbedBuilder.create_error_embed(
+                    "Pas de Données",
+                    "Aucun historique de classement sur cette période.",
+                    error_type="warning"
+                )
+                await interaction.followup.send(embed=embed)
+                return
+            
+            # Rendu PIL hors de la boucle asyncio
+            buffer = await asyncio.to_thread(
+                render_lp_graph,
+                curves,
+                start,
+                end,
+                width=Config.LP_GRAPH_WIDTH
+            )
+            
+            title = riot_id if riot_id else interaction.guild.name
+            embed = discord.Embed(
+                title=f"📈 Évolution du classement - {title}",
+                description=f"**{jours} derniers jours**",
+                color=discord.Color.blue()
+            )
+            embed.set_image(url="attachment://lp_graph.png")
+            
+            file = discord.File(fp=buffer, filename="lp_graph.png")
+            await interaction.followup.send(embed=embed, file=file)
+            logger.info(f"Graphique LP envoyé pour {title}")
+        
+        except Exception as e:
+            logger.error(f"Erreur dans lp_graph: {e}", exc_info=True)
+            embed = EmbedBuilder.create_error_embed(
+                "Erreur Interne",
+                "Une erreur s'est produite lors de la création du graphique.",
+                error_type="error"
+            )
+            await interaction.followup.send(embed=embed)
+
+    @app_commands.command(
+        name="garen-climbers",
+        description="Affiche les plus grosses progressions et pertes du serveur"
+    )
+    @app_commands.describe(periode="Période du classement (défaut: cette semaine)")
+    @app_commands.choices(periode=[
+        app_commands.Choice(name=label, value=period)
+        for period, label in PERIODS.items()
+    ])
+    async def climbers(
+        self,
+        interaction: discord.Interaction,
+        periode: Optional[app_commands.Choice[str]] = None
+    ):
+        """Affiche les meilleurs grimpeurs et les plus grosses pertes sur une période"""
+        await interaction.response.defer()
+        
+        try:
+            period = periode.value if periode else "week"
+            players = await self.storage.get_players(interaction.guild_id)
+            
+            if not players:
+                embed = EmbedBuilder.create_error_embed(
+                    "Aucun Joueur",
+                    "Aucun joueur enregistré sur ce serveur.\n"
+                    "Utilise `/garen-add-localserver` pour ajouter des comptes !",
+                    error_type="warning"
+                )
+                await interaction.followup.send(embed=embed)
+                return
+            
+            # Lecture directe des gains matérialisés (aucun parcours d'historique)
+            riot_ids = {player["puuid"]: player["riot_id"] for player in players}
+            ranking = self.bot.lp_series.aggregates.get_ranking(riot_ids, period)
+            
+            climbers = [(puuid, gain) for puuid, gain in ranking if gain > 0][:5]
+            losers = [(puuid, gain) for puuid, gain in reversed(ranking) if gain < 0][:5]
+            total = sum(gain for _, gain in ranking)
+            
+            embed = discord.Embed(
+                title=f"🧗 Progression - {interaction.guild.name}",
+                description=f"**{PERIODS[period]}** • Total du serveur: **{total:+d} LP**",
+                color=discord.Color.green() if total >= 0 else discord.Color.red()
+            )
+            
+            climbers_text = "\n".join(
+                f"**#{idx}** {riot_ids[puuid]} • 📈 +{gain} LP"
+                for idx, (puuid, gain) in enumerate(climbers, start=1)
+            )
+            embed.add_field(
+                name="🚀 Meilleures progressions",
+                value=climbers_text or "Aucune progression",
+                inline=False
+            )
+            
+            losers_text = "\n".join(
+                f"**#{idx}** {riot_ids[puuid]} • 📉 {gain} LP"
+                for idx, (puuid, gain) in enumerate(losers, start=1)
+            )
+            embed.add_field(
+                name="💀 Plus grosses pertes",
+                value=losers_text or "Aucune perte",
+                inline=False
+            )
+            
+            embed.set_footer(text="Gains en LP sur l'échelle continue des rangs (promotions incluses)")
+            
+            await interaction.followup.send(embed=embed)
+            logger.info(f"Progressions envoyées pour {interaction.guild.name} ({period})")
+        
+        except Exception as e:
+            logger.error(f"Erreur dans climbers: {e}", exc_info=True)
+            embed = EmbedBuilder.create_error_embed(
+                "Erreur Interne",
+                "Une erreur s'est produite lors de la récupération des progressions.",
+                error_type="error"
+            )
+            await interaction.followup.send(embed=embed)
+
+    @app_commands.command(
+        name="garen-live",
+        description="Affiche les joueurs du serveur actuellement en partie"
+    )
+    async def live(self, interaction: discord.Interaction):
+        """Affiche les parties en cours des joueurs du serveur (lecture du radar)"""
+        await interaction.response.defer()
+        
+        try:
+            players = await self.storage.get_players(interaction.guild_id)
+            
+            if not players:
+                embed = EmbedBuilder.create_error_embed(
+                    "Aucun Joueur",
+                    "Aucun joueur enregistré sur ce serveur.\n"
+                    "Utilise `/garen-add-localserver` pour ajouter des comptes !",
+                    error_type="warning"
+                )
+                await interaction.followup.send(embed=embed)
+                return
+            
+            riot_ids = {player["puuid"]: player["riot_id"] for player in players}
+            games = self.bot.live_radar.get_games(riot_ids)
+            games.sort(key=lambda game: game["start"])
+            in_game = sum(1 for puuid in riot_ids if self.bot.live_radar.is_in_game(puuid))
+            
+            embed = discord.Embed(
+                title=f"📡 En partie - {interaction.guild.name}",
+                description=f"**{in_game}/{len(riot_ids)}** joueur(s) en partie",
+                color=discord.Color.green() if games else discord.Color.greyple()
+            )
+            
+            now = time.time()
+            for game in games[:25]:
+                minutes = max(int(now - game["start"]), 0) // 60 if game["start"] else 0
+                lines = []
+                for puuid, champion_id in game["participants"].items():
+                    if puuid in riot_ids:
+                        champion = self.bot.champions.name(champion_id) or "?"
+                        lines.append(f"🟢 **{riot_ids[puuid]}** • {champion}")
+                
+                embed.add_field(
+                    name=f"🎮 {game['game_mode']} • {minutes} min",
+                    value="\n".join(lines),
+                    inline=False
+                )
+            
+            if not games:
+                embed.add_field(
+                    name="Aucune partie",
+                    value="Aucun joueur du serveur n'est en partie actuellement.",
+                    inline=False
+                )
+            
+            embed.set_footer(text="Mis à jour en continu par le radar des parties")
+            await interaction.followup.send(embed=embed)
+            logger.info(f"Parties en cours envoyées pour {interaction.guild.name}")
+        
+        except Exception as e:
+            logger.error(f"Erreur dans live: {e}", exc_info=True)
+            embed = EmbedBuilder.create_error_embed(
+                "Erreur Interne",
+                "Une erreur s'est produite lors de la récupération des parties en cours.",
+                error_type="error"
+            )
+            await interaction.followup.send(embed=embed)
+
 async def setup(bot: commands.Bot):
     """Charge le Cog"""
     await bot.add_cog(LeaderboardCog(bot))
\ No newline at end of file
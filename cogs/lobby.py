@@ -2,11 +2,15 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from typing import Optional
+import asyncio
+from io import BytesIO
+from typing import Any, Dict, List, Optional
 
 from utils.riot_api import RiotAPIClient, RiotAPIError
 from utils.constants import RANK_EMOJIS
 from utils.embed_builder import EmbedBuilder
+from utils.cache import TTLCache, json_size
+from utils.lobby_board import render_lobby_board
 from config import Config
 
 
@@ -18,36 +22,219 @@ class LobbyCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.riot_api: Optional[RiotAPIClient] = None
+        
+        # gameId -> lobby enrichi (borné par sa taille JSON), et
+        # puuid -> gameId de sa partie en cours (borné par le nombre d'entrées)
+        self.lobbies = TTLCache(
+            max_entries=Config.LOBBY_CACHE_ENTRIES,
+            max_bytes=Config.LOBBY_CACHE_ENTRIES * 16 * 1024,
+            sizeof=json_size
+        )
+        self.player_games = TTLCache(max_entries=Config.LOBBY_CACHE_ENTRIES * 10)
+        # gameId -> tableau PNG du lobby, borné par sa taille réelle
+        self.lobby_images = TTLCache(
+            max_entries=Config.LOBBY_IMAGE_CACHE_ENTRIES,
+            max_bytes=Config.LOBBY_IMAGE_CACHE_BYTES,
+            sizeof=len
+        )
+        # Enrichissements en cours par gameId (un seul par partie)
+        self._enriching: Dict[int, asyncio.Task] = {}
 
     async def cog_load(self):
-        """Initialise le client API lors du chargement du Cog"""
-        self.riot_api = RiotAPIClient(
-            api_key=Config.RIOT_API_KEY,
-            region=Config.REGION,
-            routing=Config.get_routing()
+        """Récupère le client API partagé du bot"""
+        self.riot_api = self.bot.riot_api
+        logger.info("Client Riot API partagé récupéré pour LobbyCog")
+    
+
+    def unknown_participant(self, participant: Dict[str, Any], rank: str) -> Dict[str, Any]:
+        """Participant sans statistiques (mode streamer ou données indisponibles)"""
+        return {
+            "riot_id": participant["riotId"],
+            "champion": self.bot.champions.key(participant["championId"]),
+            "champion_asset": self.bot.champions.asset(participant["championId"]),
+            "teamId": participant["teamId"],
+            "rank": rank,
+            "tier": None,
+            "rank_label": rank,
+            "wr" : "?",
+            "tags" : "?",
+            "games" : "?",
+        }
+    
+    async def enrich_participant(self, participant: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Récupère le rang, le winrate et les tags d'un participant
+        
+        Le rang et la maîtrise sont demandés en même temps.
+        
+        Args:
+            participant: Participant renvoyé par spectator-v5
+        
+        Returns:
+            Participant formaté pour create_lobby_embed
+        """
+        champion_id = participant["championId"]
+        participant_puuid = participant["puuid"]
+        
+        if participant_puuid is None:
+            return self.unknown_participant(participant, "STREAMER MODE")
+        
+        league_entries, mastery = await asyncio.gather(
+            self.riot_api.get_league_entries(participant_puuid),
+            self.bot.masteries.get_champion(participant_puuid, champion_id)
         )
-        logger.error(f"RIOT_API_KEY chargé: {repr(Config.RIOT_API_KEY)}")
-        await self.riot_api.__aenter__()
-         
-        # Précharger les données champions
-        await self.riot_api.get_champion_data()
-        logger.info("Client Riot API initialisé pour LobbyCog")
+        
+        #Récupérer les statistiques de rang
+        solo_rank = next(
+            (entry for entry in league_entries 
+            if entry.get("queueType") == "RANKED_SOLO_5x5"),
+            None
+        )
+        rank_emoji= RANK_EMOJIS.get(solo_rank["tier"], "") if solo_rank else ""
+        rank_label = (
+            f"{solo_rank['tier']} {solo_rank['rank']} {solo_rank['leaguePoints']} lp"
+            if solo_rank else "Unranked"
+        )
+        
+        # Calcul du winrate
+        wins = solo_rank["wins"] if solo_rank else 0
+        losses = solo_rank["losses"] if solo_rank else 0
+        wr=round(wins / (wins + losses) * 100, 2) if (wins + losses) > 0 else 0
+        
+        # Calcul du nombre de parties jouées sur le champion
+        games = wins + losses
+        
+        # TAGS 
+        tags = []
+        
+        # 1-Champion Mastery
+        if mastery:
+            points = mastery["championPoints"]
+            if points >= 1000000:
+                tags.append("MILLIONAIRE")
+            elif points >= 100000:
+                tags.append("MAIN")
+            elif points <= 5000:
+                tags.append("NEWBIE")
+        
+        # 2- Tags donnés par RIOT
+        if league_entries:
+            for entry in league_entries:
+                if entry.get("hotStreak"):
+                    tags.append("🔥 HOT STREAK")
+                if entry.get("veteran"):
+                    tags.append("🪖 VETERAN")
+                if entry.get("freshBlood"):
+                    tags.append("CLIMBING")
+                if entry.get("inactive"):
+                    tags.append("💤 INACTIVE")
+        
+        # Formatter les données
+        return {
+            "riot_id": participant["riotId"],
+            "champion": self.bot.champions.key(champion_id),
+            "champion_asset": self.bot.champions.asset(champion_id),
+            "teamId": participant["teamId"],
+            "rank": rank_emoji + " " + rank_label if solo_rank else rank_label,
+            "tier": solo_rank["tier"] if solo_rank else None,
+            "rank_label": rank_label,
+            "wr" : wr,
+            "tags" : tags if tags else "X",
+            "games" : games,
+        }
     
-    async def cog_unload(self):
-        """Nettoie le client API lors du déchargement du Cog"""
-        if self.riot_api:
-            await self.riot_api.__aexit__(None, None, None)
-            logger.info("Client Riot API fermé pour SummonerCog")
+    async def get_lobby(self, lobby: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Retourne le lobby enrichi d'une partie, en cache par gameId
+        
+        Des demandes simultanées pour une même partie partagent le même
+        enrichissement : une partie coûte un seul enrichissement, quel que
+        soit le nombre de joueurs qui la consultent.
+        
+        Args:
+            lobby: Partie renvoyée par spectator-v5
+        
+        Returns:
+            {"game_mode", "participants"} pour create_lobby_embed
+        """
+        game_id = lobby["gameId"]
+        entry = self.lobbies.get(game_id)
+        if entry is not None:
+            return entry
+        
+        task = self._enriching.get(game_id)
+        if task is None:
+            task = asyncio.ensure_future(self.enrich_lobby(lobby))
+            self._enriching[game_id] = task
+            task.add_done_callback(lambda t: self._enriching.pop(game_id, None))
+        
+        return await asyncio.shield(task)
+    
+    async def enrich_lobby(self, lobby: Dict[str, Any]) -> Dict[str, Any]:
+        """Enrichit tous les participants d'une partie et met le résultat en cache"""
+        # Enrichir les 10 participants en parallèle ; un échec n'empêche pas l'affichage des autres
+        participants = lobby["participants"]
+        results = await self.riot_api.get_many(
+            self.enrich_participant(participant) for participant in participants
+        )
+        
+        enriched_participants: List[Dict[str, Any]] = []
+        failures = 0
+        for participant, result in zip(participants, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Enrichissement impossible pour {participant['riotId']}: {result}")
+                result = self.unknown_participant(participant, "Indisponible")
+                failures += 1
+            enriched_participants.append(result)
+        
+        entry = {
+            "game_id": lobby["gameId"],
+            "game_mode": lobby["gameMode"],
+            "participants": enriched_participants
+        }
+        
+        # Un lobby incomplet n'est gardé que brièvement, pour être retenté
+        ttl = Config.LOBBY_PLAYER_TTL if failures else Config.LOBBY_CACHE_TTL
+        self.lobbies.set(lobby["gameId"], entry, ttl)
+        # Un lobby ré-enrichi remplace le tableau dessiné pour l'ancien
+        self.lobby_images.invalidate(lobby["gameId"])
+        for participant in participants:
+            if participant.get("puuid"):
+                self.player_games.set(participant["puuid"], lobby["gameId"], Config.LOBBY_PLAYER_TTL)
+        
+        return entry
+    
+    async def get_lobby_image(self, entry: Dict[str, Any]) -> bytes:
+        """
+        Retourne le tableau (PNG) d'un lobby enrichi
+        
+        L'image est dessinée hors de la boucle à partir de la planche
+        d'icônes, puis gardée par gameId dans un cache borné en octets.
+        """
+        png = self.lobby_images.get(entry["game_id"])
+        if png is None:
+            atlas = self.bot.champion_atlas
+            await atlas.ensure(
+                p["champion_asset"] for p in entry["participants"] if p["champion_asset"]
+            )
+            png = await asyncio.to_thread(
+                render_lobby_board,
+                entry["participants"],
+                entry["game_mode"],
+                atlas
+            )
+            self.lobby_images.set(entry["game_id"], png, Config.LOBBY_CACHE_TTL)
+        return png
     
-
     @app_commands.command(
         name="garen-lobby",
         description="Affiche les informations d'un salon de jeu League of Legends"
     )
     @app_commands.describe(
-        nom="Nom de l'invocateur au format GameName#Tagline (ex: Hide on bush#KR1)"
+        nom="Nom de l'invocateur au format GameName#Tagline (ex: Hide on bush#KR1)",
+        image="Afficher le lobby sous forme de tableau (image)"
     )
-    async def lobby(self, interaction: discord.Interaction, nom: str):
+    async def lobby(self, interaction: discord.Interaction, nom: str, image: bool = False):
         """Commande pour afficher les infos d'un lobby"""
         await interaction.response.defer()
         
@@ -79,113 +266,41 @@ class LobbyCog(commands.Cog):
             
             puuid = account["puuid"]
 
-            # Récupérer les infos du lobby
-            lobby = await self.riot_api.get_lobby_by_puuid(puuid)
-
-            if not lobby:
-                embed = EmbedBuilder.create_error_embed(
-                    "Erreur",
-                    "Le joueur n'est pas en partie actuellement.",
-                    error_type="error"
-                )
-                await interaction.followup.send(embed=embed)
-                return
+            # Partie déjà enrichie pour ce joueur (demandée par un autre participant,
+            # ou confirmée récemment par le radar : une partie plus ancienne peut être finie)
+            game_id = self.player_games.get(puuid) or self.bot.live_radar.get_game_id(
+                puuid, max_age=Config.LOBBY_PLAYER_TTL
+            )
+            entry = self.lobbies.get(game_id) if game_id is not None else None
             
+            if entry is None:
+                # Récupérer les infos du lobby
+                lobby = await self.riot_api.get_lobby_by_puuid(puuid)
 
-
-            participants = lobby["participants"]
-            enriched_participants = []
-
-            for participant in participants:
-                champion_id = participant["championId"]
-                riot_id = participant["riotId"]
-                team_id = participant["teamId"]
-                participant_puuid = participant["puuid"]
-
-                #Récupérer le pseudo du joueur
-                champion_name = self.riot_api.get_champion_name_by_id(champion_id)
-
-                if participant_puuid != None:
-
-                    #Récupérer les statistiques de rang
-                    if participant_puuid != None:
-                        league_entries = await self.riot_api.get_league_entries(participant_puuid)
-                        solo_rank = next(
-                            (entry for entry in league_entries 
-                            if entry.get("queueType") == "RANKED_SOLO_5x5"),
-                            None
-                        )
-                    else:
-                        solo_rank = None
-
-                    rank_emoji= RANK_EMOJIS.get(solo_rank["tier"], "") if solo_rank else ""
-
-
-                    # Calcul du winrate
-                    wins = solo_rank["wins"] if solo_rank else 0
-                    losses = solo_rank["losses"] if solo_rank else 0
-                    wr=round(wins / (wins + losses) * 100, 2) if (wins + losses) > 0 else 0
-                    
-                    # Calcul du nombre de parties jouées sur le champion
-                    games = wins + losses
-
-
-
-                    # TAGS 
-                    tags = []
-
-                    # 1-Champion Mastery
-                    mastery = await self.riot_api.get_champion_mastery_by_champion(participant_puuid, champion_id)
-                    print(mastery)
-                    if mastery:
-                        points = mastery["championPoints"]
-                        level = mastery["championLevel"]
-                        if points >= 1000000:
-                            tags.append("MILLIONAIRE")
-                        elif points >= 100000:
-                            tags.append("MAIN")
-                        elif points <= 5000:
-                            tags.append("NEWBIE")
-                    
-                    # 2- Tags donnés par RIOT
-                    if league_entries:
-                        for entry in league_entries:
-                            if entry.get("hotStreak"):
-                                tags.append("🔥 HOT STREAK")
-                            if entry.get("veteran"):
-                                tags.append("🪖 VETERAN")
-                            if entry.get("freshBlood"):
-                                tags.append("CLIMBING")
-                            if entry.get("inactive"):
-                                tags.append("💤 INACTIVE")
-                    
-                    # Formatter les données
-                    enriched_participants.append({
-                        "riot_id": riot_id,
-                        "champion": champion_name,
-                        "teamId": team_id,
-                        "rank": rank_emoji + " " + solo_rank["tier"] + " " + solo_rank["rank"] + " " + str(solo_rank["leaguePoints"]) + " lp" if solo_rank else "Unranked",
-                        "wr" : wr,
-                        "tags" : tags if tags else "X",
-                        "games" : games,
-                    })
-
-                else :
-                    enriched_participants.append({
-                        "riot_id": riot_id,
-                        "champion": champion_name,
-                        "teamId": team_id,
-                        "rank": "STREAMER MODE",
-                        "wr" : "?",
-                        "tags" : "?",
-                        "games" : "?",
-                    })
-
+                if not lobby:
+                    embed = EmbedBuilder.create_error_embed(
+                        "Erreur",
+                        "Le joueur n'est pas en partie actuellement.",
+                        error_type="error"
+                    )
+                    await interaction.followup.send(embed=embed)
+                    return
+                
+                entry = await self.get_lobby(lobby)
+            
+            if image:
+                png = await self.get_lobby_image(entry)
+                embed = EmbedBuilder.create_lobby_image_embed(entry["game_mode"])
+                embed.set_image(url="attachment://lobby.png")
+                file = discord.File(fp=BytesIO(png), filename="lobby.png")
+                await interaction.followup.send(embed=embed, file=file)
+                logger.info(f"Tableau du lobby envoyé pour {game_name}#{tag_line}")
+                return
             
             #Créer et envoyer l'embed avec les infos du lobby
             embed = EmbedBuilder.create_lobby_embed(
-                enriched_participants, 
-                lobby["gameMode"],
+                entry["participants"], 
+                entry["game_mode"],
             )
             
             await interaction.followup.send(embed=embed)
@@ -18,23 +18,9 @@ class SummonerCog(commands.Cog):
         self.riot_api: Optional[RiotAPIClient] = None
     
     async def cog_load(self):
-        """Initialise le client API lors du chargement du Cog"""
-        self.riot_api = RiotAPIClient(
-            api_key=Config.RIOT_API_KEY,
-            region=Config.REGION,
-            routing=Config.get_routing()
-        )
-        await self.riot_api.__aenter__()
-        
-        # Précharger les données champions
-        await self.riot_api.get_champion_data()
-        logger.info("Client Riot API initialisé pour SummonerCog")
-    
-    async def cog_unload(self):
-        """Nettoie le client API lors du déchargement du Cog"""
-        if self.riot_api:
-            await self.riot_api.__aexit__(None, None, None)
-            logger.info("Client Riot API fermé pour SummonerCog")
+        """Récupère le client API partagé du bot"""
+        self.riot_api = self.bot.riot_api
+        logger.info("Client Riot API partagé récupéré pour SummonerCog")
     
     @app_commands.command(
         name="garen-summoner",
@@ -97,14 +83,12 @@ class SummonerCog(commands.Cog):
             )
             
             # Récupérer la maîtrise
-            masteries = await self.riot_api.get_champion_masteries(puuid, count=1)
+            masteries = await self.bot.masteries.get_top(puuid, count=1)
             mastery_data = None
             
             if masteries:
                 top_mastery = masteries[0]
-                champion_name = self.riot_api.get_champion_name_by_id(
-                    top_mastery["championId"]
-                )
+                champion_name = self.bot.champions.key(top_mastery["championId"])
                 
                 if champion_name:
                     mastery_data = {
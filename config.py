@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,15 +16,91 @@ class Config:
     REGION = os.getenv("REGION", "euw1")
     
     # Data Dragon
+    # Version de repli : remplacée au démarrage puis à chaud par DataDragonUpdater
     DDRAGON_VERSION = "15.24.1"
     DDRAGON_BASE_URL = "https://ddragon.leagueoflegends.com/cdn"
-    DDRAGON_CHAMPION_DATA_URL = f"{DDRAGON_BASE_URL}/{DDRAGON_VERSION}/data/en_US/champion.json"
+    DDRAGON_VERSIONS_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+    DDRAGON_POLL_MINUTES = 60   # Intervalle de vérification d'une nouvelle version
+    CHAMPION_DATA_PATH = "data/champions.json"  # Dernières données champions téléchargées
+    CHAMPION_FALLBACK_PATH = "data/champions_fallback.json"  # Instantané fourni avec le bot
+    
+    # Cache des images Data Dragon (icônes redimensionnées et masquées)
+    ASSET_CACHE_DIR = "data/assets"
+    ASSET_MEMORY_MAX_ENTRIES = 2000
+    ASSET_MEMORY_MAX_BYTES = 64 * 1024 * 1024  # 64 Mo
+    ASSET_MEMORY_TTL = 24 * 3600
+    CHAMPION_ICON_SIZE = 64   # Taille des icônes de champions (rotation)
+    CDN_URL_MARGIN = 3600     # Marge avant expiration (ex=) d'une URL d'attachement Discord
     
     # Rate Limiting
-    RATE_LIMIT_CALLS = 20  # Appels par seconde autorisés
-    RATE_LIMIT_PERIOD = 1  # Période en secondes
+    # Limites applicatives (appels, période en secondes) utilisées tant que
+    # Riot n'a pas renvoyé ses headers X-App-Rate-Limit
+    RATE_LIMITS = [(20, 1), (100, 120)]
     REQUEST_TIMEOUT = 10   # Timeout des requêtes en secondes
     MAX_RETRIES = 3        # Nombre de tentatives en cas d'échec
+    FANOUT_CONCURRENCY = 10  # Appels simultanés max pour les requêtes groupées
+    
+    # Cache des réponses Riot API (durée de vie en secondes par endpoint)
+    CACHE_TTLS = {
+        "account-v1.by-riot-id": 6 * 3600,
+        "summoner-v4.by-puuid": 5 * 60,
+        "league-v4.entries-by-puuid": 60,
+        "match-v5.ids-by-puuid": 60,
+        "champion-v3.rotations": 5 * 60,  # Rotation hebdomadaire : un appel toutes les 5 min max
+    }
+    CACHE_MAX_ENTRIES = 5000
+    CACHE_MAX_BYTES = 20 * 1024 * 1024  # 20 Mo
+    
+    # Stockage des leaderboards
+    STORAGE_DB_PATH = "data/garen.sqlite3"
+    LEADERBOARD_JSON_DIR = "data/leaderboards"   # Anciens fichiers JSON à migrer
+    LP_FLUSH_SECONDS = 30   # Intervalle d'écriture différée des relevés LP
+    LP_SERIES_DB_PATH = "data/lp_series.sqlite3"  # Historique long terme des classements
+    LP_GRAPH_WIDTH = 800    # Largeur du graphique /garen-lp-graph (pixels)
+    SEASON_START = os.getenv("SEASON_START", "2026-01-08")  # Début de saison (YYYY-MM-DD)
+    PODIUM_CACHE_TTL = 6 * 3600   # Durée de conservation d'une image de podium (secondes)
+    PODIUM_CACHE_ENTRIES = 64     # Nombre d'images de podium conservées
+    
+    # Cache persistant Riot ID <-> PUUID
+    IDENTITY_DB_PATH = "data/identity.sqlite3"
+    IDENTITY_TTL = 24 * 3600        # Durée de validité d'une résolution Riot ID -> PUUID
+    IDENTITY_MISS_TTL = 10 * 60     # Durée de mémorisation d'un Riot ID introuvable
+    IDENTITY_REFRESH_HOURS = 12     # Intervalle de re-résolution des comptes suivis
+    
+    # Stockage local des parties (match-v5)
+    MATCH_STORE_DIR = "data/matches"
+    
+    # Instantané des rangs (leaderboard)
+    SNAPSHOT_TICK_SECONDS = 60      # Passage du rafraîchissement (seuls les joueurs dus sont récupérés)
+    SNAPSHOT_MAX_AGE = 15 * 60      # Âge max (secondes) avant récupération en direct
+    
+    # Cadence adaptative par joueur (voir PollScheduler)
+    SCHEDULER_MIN_INTERVAL = 5 * 60      # Joueur en partie ou en pleine session
+    SCHEDULER_MAX_INTERVAL = 6 * 3600    # Compte inactif depuis plus d'une semaine
+    POST_GAME_REFRESH_DELAY = 90         # Délai de rafraîchissement après une fin de partie
+    
+    # Masteries complètes par joueur (lobby, summoner)
+    MASTERY_TTL = 6 * 3600          # Âge au-delà duquel la liste est rafraîchie en tâche de fond
+    MASTERY_MAX_PLAYERS = 2000      # Nombre de joueurs gardés en mémoire
+    
+    # Radar des parties en cours (/garen-live, statut en ligne de /garen-info)
+    LIVE_TICK_SECONDS = 30          # Intervalle de la boucle du radar
+    LIVE_IDLE_INTERVAL = 3 * 60     # Vérification d'un joueur hors partie
+    LIVE_INGAME_INTERVAL = 60       # Vérification d'une partie en cours
+    LIVE_MIN_GAME_LENGTH = 15 * 60  # Aucune vérification d'une partie plus jeune
+    
+    # Cache des lobbies (/garen-lobby)
+    LOBBY_CACHE_TTL = 60 * 60       # Durée max d'une partie : lobby enrichi gardé par gameId
+    LOBBY_PLAYER_TTL = 2 * 60       # Durée pendant laquelle un joueur est supposé dans la même partie
+    LOBBY_CACHE_ENTRIES = 500
+    LOBBY_IMAGE_CACHE_ENTRIES = 100
+    LOBBY_IMAGE_CACHE_BYTES = 32 * 1024 * 1024  # 32 Mo de tableaux PNG
+    
+    # Pool de connexions HTTP (partagé par tous les cogs)
+    HTTP_POOL_SIZE = 100          # Connexions simultanées max
+    HTTP_POOL_PER_HOST = 20       # Connexions simultanées max par hôte
+    HTTP_DNS_CACHE_TTL = 300      # Cache DNS en secondes
+    HTTP_KEEPALIVE_TIMEOUT = 60   # Durée de vie des connexions inactives
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -44,6 +121,11 @@ class Config:
         "ru": "europe"
     }
     
+    @classmethod
+    def get_champion_data_url(cls, version: Optional[str] = None) -> str:
+        """Retourne l'URL de champion.json pour une version (par défaut la version courante)"""
+        return f"{cls.DDRAGON_BASE_URL}/{version or cls.DDRAGON_VERSION}/data/en_US/champion.json"
+    
     @classmethod
     def get_routing(cls) -> str:
         """Retourne le routing pour la région configurée"""
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Les modules du bot sont importés depuis la racine du dépôt (utils, config...)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+class FakeResponse:
+    """Réponse aiohttp minimale (status, headers, json)"""
+
+    def __init__(self, status: int, data: Any = None, headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.data = data
+        self.headers = headers or {}
+
+    async def json(self) -> Any:
+        return self.data
+
+    async def text(self) -> str:
+        return str(self.data)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+class FakeSession:
+    """Session aiohttp qui rejoue des réponses prédéfinies et compte les appels"""
+
+    def __init__(self, responses: List[FakeResponse]):
+        self.responses = list(responses)
+        self.calls: List[str] = []
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        self.calls.append(url)
+        # La dernière réponse se répète une fois la liste épuisée
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+SOLO = {"queueType": "RANKED_SOLO_5x5", "tier": "GOLD", "rank": "II", "leaguePoints": 40}
+
+class FakeAPI:
+    """
+    Client Riot minimal pour les services en arrière-plan
+
+    Args:
+        fail: PUUID dont la lecture du profil échoue
+        ranks: Entrées solo successives renvoyées (la dernière se répète), SOLO par défaut
+        last_games: puuid -> timestamp (s) de fin de sa dernière partie
+        lobby: Partie renvoyée par spectator-v5 (None : personne en partie)
+    """
+
+    def __init__(self, fail=(), ranks=(), last_games=None, lobby=None):
+        self.fail = set(fail)
+        self.ranks = list(ranks)
+        self.last_games = dict(last_games or {})
+        self.lobby = lobby
+        # Appels reçus, par endpoint
+        self.calls: List[str] = []
+        self.history_calls: List[str] = []
+        self.lobby_calls = 0
+
+    async def get_summoner_by_puuid(self, puuid):
+        self.calls.append(puuid)
+        if puuid in self.fail:
+            raise RuntimeError("indisponible")
+        return {"summonerLevel": 100, "profileIconId": 1}
+
+    async def get_league_entries(self, puuid):
+        if len(self.ranks) > 1:
+            return [self.ranks.pop(0)]
+        return [self.ranks[0] if self.ranks else SOLO]
+
+    async def get_match_history(self, puuid, count=20):
+        self.history_calls.append(puuid)
+        return [f"EUW1_{puuid}"] if puuid in self.last_games else []
+
+    async def get_match_details(self, match_id):
+        puuid = match_id.split("_", 1)[1]
+        return {"info": {"gameEndTimestamp": self.last_games[puuid] * 1000}}
+
+    async def get_lobby_by_puuid(self, puuid):
+        self.lobby_calls += 1
+        return self.lobby
+
+    async def get_many(self, calls):
+        return await asyncio.gather(*calls, return_exceptions=True)
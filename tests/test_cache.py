@@ -0,0 +1,77 @@
+from utils.cache import TTLCache, json_size
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    cache = TTLCache(max_entries=2, max_bytes=1000, sizeof=len)
+    cache.set("a", "1", ttl=60)
+    cache.set("b", "2", ttl=60)
+    assert cache.get("a") == "1"  # "a" devient la plus récente
+
+    cache.set("c", "3", ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.evictions == 1
+
+def test_evicts_by_bytes_and_tracks_size():
+    cache = TTLCache(max_entries=100, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx", ttl=60)
+    cache.set("b", "yyyy", ttl=60)
+    assert cache.current_bytes == 8
+
+    cache.set("c", "zzzz", ttl=60)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.current_bytes == 8
+
+def test_replacing_a_key_updates_its_size():
+    cache = TTLCache(max_entries=10, max_bytes=100, sizeof=len)
+    cache.set("a", "xxxx", ttl=60)
+    cache.set("a", "xx", ttl=60)
+    assert cache.current_bytes == 2
+    assert len(cache) == 1
+
+def test_value_larger_than_cache_is_not_stored():
+    cache = TTLCache(max_entries=10, max_bytes=4, sizeof=len)
+    cache.set("small", "xx", ttl=60)
+    cache.set("big", "xxxxx", ttl=60)
+    assert cache.get("big") is None
+    assert cache.get("small") == "xx"
+
+def test_expired_entries_are_misses():
+    cache = TTLCache(max_entries=10, max_bytes=100, sizeof=len)
+    cache.set("a", "x", ttl=-1)
+    assert cache.get("a", "default") == "default"
+    assert cache.current_bytes == 0
+    assert cache.stats()["misses"] == 1
+
+def test_cached_none_is_distinguished_from_missing():
+    missing = object()
+    cache = TTLCache(max_entries=10, max_bytes=100, sizeof=lambda value: 1)
+    cache.set("a", None, ttl=60)
+    assert cache.get("a", missing) is None
+    assert cache.get("b", missing) is missing
+
+def test_invalidate_and_clear_release_bytes():
+    cache = TTLCache(max_entries=10, max_bytes=100, sizeof=len)
+    cache.set("a", "xxx", ttl=60)
+    cache.set("b", "yy", ttl=60)
+    cache.invalidate("a")
+    assert cache.current_bytes == 2
+    cache.clear()
+    assert cache.current_bytes == 0
+    assert len(cache) == 0
+
+def test_json_size_counts_nested_content():
+    cache = TTLCache(max_entries=10, max_bytes=300, sizeof=json_size)
+    lobby = {"participants": [{"riot_id": "x" * 50} for _ in range(10)]}
+    assert json_size(lobby) > 500
+
+    cache.set(1, lobby, ttl=60)
+    assert cache.get(1) is None
+
+def test_without_max_bytes_only_entries_are_bounded():
+    cache = TTLCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key * 10_000, ttl=60)
+    assert len(cache) == 2
+    assert cache.current_bytes == 0
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+from config import Config
+from utils.champion_registry import ChampionRegistry
+from utils.ddragon import DataDragonUpdater
+
+FALLBACK = Path(__file__).resolve().parent.parent / Config.CHAMPION_FALLBACK_PATH
+
+@pytest.mark.asyncio
+async def test_cold_start_without_ddragon_loads_bundled_snapshot(tmp_path):
+    champions = ChampionRegistry()
+    updater = DataDragonUpdater(None, champions, None, None, tmp_path / "champions.json", FALLBACK)
+
+    assert not await updater.load_saved()
+    assert await updater.load_fallback()
+
+    assert champions.version == Config.DDRAGON_VERSION
+    assert champions.get(62)["key"] == "MonkeyKing"
+    assert champions.get_by_name("kaisa")["name"] == "Kai'Sa"
+
+@pytest.mark.asyncio
+async def test_missing_snapshot_leaves_registry_empty(tmp_path):
+    champions = ChampionRegistry()
+    updater = DataDragonUpdater(None, champions, None, None, tmp_path / "champions.json", tmp_path / "missing.json")
+
+    assert not await updater.load_fallback()
+    assert len(champions) == 0
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from config import Config
+from utils.identity_store import IdentityStore
+from utils.riot_api import RiotAPIClient, RiotAPIError
+from tests.fakes import FakeResponse, FakeSession
+
+ACCOUNT = {"puuid": "puuid-1", "gameName": "Garen", "tagLine": "EUW"}
+RATE_LIMITED = FakeResponse(429, headers={"Retry-After": "0", "X-Rate-Limit-Type": "application"})
+
+def make_client(tmp_path, responses):
+    store = IdentityStore(tmp_path / "identity.sqlite3", ttl=3600, miss_ttl=600)
+    client = RiotAPIClient("key", "euw1", "europe", identity_store=store)
+    client.session = FakeSession(responses)
+    return client, store
+
+@pytest.mark.asyncio
+async def test_not_found_is_cached_as_miss(tmp_path):
+    client, store = make_client(tmp_path, [FakeResponse(404)])
+    try:
+        assert await client.get_account_by_riot_id("Garen", "EUW") is None
+        assert await store.lookup("garen", "euw") == (True, None)
+        # Le miss est servi sans nouvel appel
+        assert await client.get_account_by_riot_id("Garen", "EUW") is None
+        assert len(client.session.calls) == 1
+    finally:
+        await store.close()
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_not_cached_as_miss(tmp_path):
+    client, store = make_client(tmp_path, [RATE_LIMITED])
+    try:
+        with pytest.raises(RiotAPIError):
+            await client.get_account_by_riot_id("Garen", "EUW")
+        assert len(client.session.calls) == Config.MAX_RETRIES
+        assert await store.lookup("Garen", "EUW") == (False, None)
+    finally:
+        await store.close()
+
+@pytest.mark.asyncio
+async def test_found_account_is_cached_until_ttl(tmp_path):
+    client, store = make_client(tmp_path, [FakeResponse(200, ACCOUNT)])
+    try:
+        assert await client.get_account_by_riot_id("Garen", "EUW") == ACCOUNT
+        assert await store.lookup("GAREN", "euw") == (True, ACCOUNT)
+
+        # Au-delà du TTL, le Riot ID doit être re-résolu
+        store.ttl = 0
+        assert await store.lookup("Garen", "EUW") == (False, None)
+    finally:
+        await store.close()
+
+@pytest.mark.asyncio
+async def test_purge_expired_drops_stale_accounts(tmp_path):
+    store = IdentityStore(tmp_path / "identity.sqlite3", ttl=3600, miss_ttl=0)
+    try:
+        await store.save_account(ACCOUNT)
+        await store.save_miss("Nobody", "EUW")
+        store.ttl = 0
+        await store.purge_expired()
+
+        store.ttl = time.time()
+        assert await store.lookup("Garen", "EUW") == (False, None)
+        row = await store.db.fetchone("SELECT COUNT(*) AS n FROM misses")
+        assert row["n"] == 0
+    finally:
+        await store.close()
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from utils.live_radar import LiveGameRadar, MAX_IDLE_FACTOR
+from utils.poll_scheduler import PollScheduler
+from tests.fakes import FakeAPI
+
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 6 * 3600
+
+def make_radar(api, scheduler=None) -> LiveGameRadar:
+    return LiveGameRadar(api, idle_interval=180, ingame_interval=60,
+                         min_game_length=900, scheduler=scheduler)
+
+def make_lobby(players, started_ago: float):
+    return {
+        "gameId": 1,
+        "gameMode": "CLASSIC",
+        "gameStartTime": (time.time() - started_ago) * 1000,
+        "participants": [{"puuid": puuid, "championId": 86} for puuid in players]
+    }
+
+def test_radar_idle_delay_is_bounded():
+    scheduler = PollScheduler(MIN_INTERVAL, MAX_INTERVAL, post_game_delay=90)
+    scheduler.sync(["idle"])
+    scheduler._last_activity["idle"] = time.time() - 30 * 24 * 3600
+
+    radar = make_radar(None, scheduler)
+    assert radar._idle_delay("idle") == 180 * MAX_IDLE_FACTOR
+
+@pytest.mark.asyncio
+async def test_radar_hits_mark_players_in_game():
+    scheduler = PollScheduler(MIN_INTERVAL, MAX_INTERVAL, post_game_delay=90)
+    scheduler.sync(["a", "b"])
+    radar = make_radar(FakeAPI(lobby=make_lobby(["a", "b"], started_ago=60)), scheduler)
+
+    await radar.poll(["a", "b"])
+    assert radar.get_game_id("a") == radar.get_game_id("b") == 1
+    assert scheduler.interval("a") == scheduler.interval("b") == MIN_INTERVAL
+
+    # Partie connue : pas de nouvelle vérification avant la durée minimale
+    assert await radar.poll(["a", "b"]) == 0
+
+@pytest.mark.asyncio
+async def test_known_game_is_checked_once_per_ingame_interval():
+    api = FakeAPI(lobby=make_lobby(["a", "b", "c"], started_ago=1800))
+    radar = make_radar(api)
+    await radar.poll(["a", "b", "c"])
+    api.lobby_calls = 0
+
+    # Intervalle écoulé : un seul joueur revérifie la partie pour tous
+    for puuid in ("a", "b", "c"):
+        radar._next_check[puuid] = 0
+    assert await radar.poll(["a", "b", "c"]) == 1
+    assert await radar.poll(["a", "b", "c"]) == 0
+    assert api.lobby_calls == 1
+
+@pytest.mark.asyncio
+async def test_games_without_tracked_players_are_pruned():
+    radar = make_radar(FakeAPI(lobby=make_lobby(["a"], started_ago=0)))
+    await radar.poll(["a"])
+    assert radar.get_game_id("a") == 1
+
+    await radar.poll([])
+    assert radar._games == {}
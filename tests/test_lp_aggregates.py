@@ -0,0 +1,85 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from utils.constants import calculate_ladder_score
+from utils.lp_aggregates import LpAggregates, period_start
+
+SEASON_START = datetime(2026, 1, 8)
+
+@pytest.fixture
+def new_york_tz(monkeypatch):
+    """Fuseau local différent d'UTC (les relevés restent des timestamps Unix)"""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def ts(year, month, day, hour=12) -> int:
+    return int((datetime(year, month, day, hour) - datetime(1970, 1, 1)).total_seconds())
+
+def test_period_start_boundaries():
+    wednesday = ts(2026, 3, 18)
+    assert period_start("day", wednesday, SEASON_START) == datetime(2026, 3, 18)
+    assert period_start("week", wednesday, SEASON_START) == datetime(2026, 3, 16)
+    assert period_start("month", wednesday, SEASON_START) == datetime(2026, 3, 1)
+    assert period_start("season", wednesday, SEASON_START) == SEASON_START
+
+def test_gain_within_a_period():
+    aggregates = LpAggregates(SEASON_START)
+    aggregates.update("a", ts(2026, 3, 18, 9), 1000)
+    aggregates.update("a", ts(2026, 3, 18, 15), 1040)
+
+    assert aggregates.get_gain("a", "day", now=ts(2026, 3, 18, 20)) == 40
+    assert aggregates.get_gain("a", "season", now=ts(2026, 3, 18, 20)) == 40
+
+def test_new_period_starts_from_last_known_score():
+    aggregates = LpAggregates(SEASON_START)
+    aggregates.update("a", ts(2026, 3, 18), 1000)
+    aggregates.update("a", ts(2026, 3, 18, 20), 1040)
+    aggregates.update("a", ts(2026, 3, 19), 1020)
+
+    now = ts(2026, 3, 19, 20)
+    assert aggregates.get_gain("a", "day", now=now) == -20
+    assert aggregates.get_gain("a", "week", now=now) == 20
+
+def test_stale_period_reports_no_gain():
+    aggregates = LpAggregates(SEASON_START)
+    aggregates.update("a", ts(2026, 3, 18, 9), 1000)
+    aggregates.update("a", ts(2026, 3, 18, 15), 1040)
+
+    assert aggregates.get_gain("a", "day", now=ts(2026, 3, 19)) == 0
+    assert aggregates.get_gain("unknown", "day") == 0
+
+def test_ranking_orders_by_gain():
+    aggregates = LpAggregates(SEASON_START)
+    aggregates.seed("a", "season", SEASON_START, 1000, 1100)
+    aggregates.seed("b", "season", SEASON_START, 1000, 900)
+    aggregates.seed("c", "season", SEASON_START, 1000, 1300)
+
+    assert aggregates.get_ranking(["a", "b", "c"], "season") == [("c", 300), ("a", 100), ("b", -100)]
+
+def test_promotion_does_not_dominate_the_ranking():
+    def score(tier, rank, lp):
+        return calculate_ladder_score({"tier": tier, "rank": rank, "leaguePoints": lp})
+
+    aggregates = LpAggregates(SEASON_START)
+    aggregates.update("promoted", ts(2026, 3, 18, 9), score("GOLD", "I", 95))
+    aggregates.update("promoted", ts(2026, 3, 18, 10), score("PLATINUM", "IV", 15))
+    aggregates.update("grinder", ts(2026, 3, 18, 9), score("SILVER", "III", 10))
+    aggregates.update("grinder", ts(2026, 3, 18, 15), score("SILVER", "II", 30))
+
+    now = ts(2026, 3, 18, 20)
+    assert aggregates.get_gain("promoted", "day", now=now) == 20
+    assert aggregates.get_gain("grinder", "day", now=now) == 120
+
+def test_current_gain_ignores_the_local_timezone(new_york_tz):
+    aggregates = LpAggregates(SEASON_START)
+    now = int(time.time())
+    aggregates.update("a", now - 60, 1000)
+    aggregates.update("a", now, 1040)
+
+    assert aggregates.get_gain("a", "day") == 40
+    assert aggregates.get_gains(["a"], "day") == {"a": 40}
@@ -0,0 +1,141 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.lp_series import LpSeries
+from utils.poll_scheduler import PollScheduler, UNKNOWN_ACTIVITY_INTERVAL, FREQUENT_CHANGES
+from utils.rank_snapshots import RankSnapshotService, MATCH_END_LOOKUPS_PER_TICK, SCHEDULED_MAX_AGE_FACTOR
+from tests.fakes import FakeAPI
+
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 6 * 3600
+
+def make_scheduler() -> PollScheduler:
+    return PollScheduler(MIN_INTERVAL, MAX_INTERVAL, post_game_delay=90)
+
+def test_unknown_player_gets_mid_range_interval():
+    scheduler = make_scheduler()
+    scheduler.sync(["new"])
+    assert MIN_INTERVAL < scheduler.interval("new") < MAX_INTERVAL
+    assert scheduler.interval("new") == UNKNOWN_ACTIVITY_INTERVAL
+
+def test_interval_stays_within_bounds():
+    scheduler = make_scheduler()
+    scheduler.sync(["active", "idle"])
+
+    for _ in range(FREQUENT_CHANGES + 1):
+        scheduler.record_refresh("active", changed=True)
+    assert scheduler.interval("active") == MIN_INTERVAL
+
+    scheduler._last_activity["idle"] = time.time() - 30 * 24 * 3600
+    assert scheduler.interval("idle") == MAX_INTERVAL
+
+def test_new_players_are_due_once_then_rescheduled():
+    scheduler = make_scheduler()
+    scheduler.sync(["a", "b"])
+    assert sorted(scheduler.pop_due()) == ["a", "b"]
+    assert scheduler.pop_due() == []
+    assert sorted(scheduler.pop_due(time.time() + MAX_INTERVAL + 1)) == ["a", "b"]
+
+def test_untracked_players_are_forgotten():
+    scheduler = make_scheduler()
+    scheduler.sync(["a", "b"])
+    scheduler.sync(["a"])
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(time.time() + MAX_INTERVAL + 1) == ["a"]
+
+def test_game_hooks_pull_the_next_refresh_forward():
+    scheduler = make_scheduler()
+    scheduler.sync(["a"])
+    scheduler.pop_due()
+
+    scheduler.record_game_start("a")
+    assert scheduler.interval("a") == MIN_INTERVAL
+    assert scheduler.next_due_in("a") <= MIN_INTERVAL
+
+    scheduler.record_game_end("a")
+    assert scheduler.next_due_in("a") <= 90
+
+def test_snapshot_freshness_is_capped():
+    scheduler = make_scheduler()
+    scheduler.sync(["idle"])
+    scheduler._last_activity["idle"] = time.time() - 30 * 24 * 3600
+
+    service = RankSnapshotService(None, max_age=15 * 60, scheduler=scheduler)
+
+    def snapshot(age: int):
+        return {"puuid": "idle", "fetched_at": datetime.utcnow() - timedelta(seconds=age)}
+
+    limit = 15 * 60 * SCHEDULED_MAX_AGE_FACTOR
+    assert service.is_fresh(snapshot(limit - 60))
+    assert not service.is_fresh(snapshot(limit + 60))
+    assert not service.is_fresh(snapshot(5 * 3600))
+
+def test_activity_is_seeded_from_lp_series():
+    now = int(time.time())
+    series = LpSeries()
+    for minutes_ago in (90, 60, 30, 10):
+        series.timestamps.append(now - minutes_ago * 60)
+        series.scores.append(1000 + minutes_ago)
+
+    class FakeStore:
+        def get(self, puuid):
+            return series if puuid == "grinder" else None
+
+    scheduler = PollScheduler(MIN_INTERVAL, MAX_INTERVAL, post_game_delay=90, lp_series=FakeStore())
+    scheduler.sync(["grinder", "unknown"])
+    assert scheduler.interval("grinder") == MIN_INTERVAL
+    assert scheduler.interval("unknown") == UNKNOWN_ACTIVITY_INTERVAL
+
+@pytest.mark.asyncio
+async def test_empty_scheduler_is_synced_on_first_refresh():
+    scheduler = make_scheduler()
+    service = RankSnapshotService(FakeAPI(), max_age=15 * 60, scheduler=scheduler)
+    await service.refresh_all({1: ["a", "b"]})
+
+    assert len(scheduler) == 2
+    assert scheduler.pop_due() == []
+
+@pytest.mark.asyncio
+async def test_new_players_start_from_their_last_match():
+    now = time.time()
+    api = FakeAPI(last_games={"recent": now - 20 * 60, "idle": now - 10 * 24 * 3600})
+
+    scheduler = make_scheduler()
+    service = RankSnapshotService(api, max_age=15 * 60, scheduler=scheduler)
+
+    await service.refresh_all({1: ["recent", "idle", "never"]})
+    await service._match_end_task
+
+    assert scheduler.interval("recent") == MIN_INTERVAL
+    assert scheduler.interval("idle") == MAX_INTERVAL
+    assert scheduler.interval("never") == UNKNOWN_ACTIVITY_INTERVAL
+    assert scheduler.next_due_in("recent") <= MIN_INTERVAL
+
+@pytest.mark.asyncio
+async def test_match_end_lookups_skip_known_players_and_are_capped():
+    series = LpSeries()
+    series.timestamps.append(int(time.time()) - 600)
+    series.scores.append(1000)
+
+    class FakeStore:
+        def get(self, puuid):
+            return series if puuid == "known" else None
+
+    api = FakeAPI()
+    scheduler = PollScheduler(MIN_INTERVAL, MAX_INTERVAL, post_game_delay=90, lp_series=FakeStore())
+    service = RankSnapshotService(api, max_age=15 * 60, scheduler=scheduler)
+    players = ["known"] + [f"new-{index}" for index in range(MATCH_END_LOOKUPS_PER_TICK + 5)]
+
+    await service.refresh_all({1: players})
+    await service._match_end_task
+    first_tick = list(api.history_calls)
+
+    await service.refresh_all({1: players})
+    await service._match_end_task
+
+    assert len(first_tick) == MATCH_END_LOOKUPS_PER_TICK
+    assert "known" not in api.history_calls
+    assert len(api.history_calls) == len(players) - 1
+
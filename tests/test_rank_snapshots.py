@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.constants import calculate_ladder_score, format_rank_score
+from utils.lp_series import LpSeriesStore
+from utils.rank_snapshots import RankSnapshotService
+from tests.fakes import FakeAPI, SOLO
+
+@pytest.mark.asyncio
+async def test_refresh_all_fetches_each_player_once_across_guilds():
+    api = FakeAPI()
+    service = RankSnapshotService(api, max_age=900)
+
+    await service.refresh_all({1: ["a", "b"], 2: ["b", "c"]})
+    assert sorted(api.calls) == ["a", "b", "c"]
+    assert service.get_guilds("b") == {1, 2}
+
+@pytest.mark.asyncio
+async def test_get_snapshots_answers_from_memory_when_fresh():
+    api = FakeAPI()
+    service = RankSnapshotService(api, max_age=900)
+    await service.refresh_all({1: ["a", "b"]})
+    api.calls.clear()
+
+    snapshots = await service.get_snapshots(1, ["a", "b"])
+    assert set(snapshots) == {"a", "b"}
+    assert snapshots["a"]["solo_rank"] == SOLO
+    assert api.calls == []
+
+@pytest.mark.asyncio
+async def test_get_snapshots_refetches_only_stale_players():
+    api = FakeAPI()
+    service = RankSnapshotService(api, max_age=900)
+    await service.refresh_all({1: ["a", "b"]})
+    service._snapshots["b"]["fetched_at"] = datetime.utcnow() - timedelta(seconds=901)
+    api.calls.clear()
+
+    await service.get_snapshots(1, ["a", "b", "new"])
+    assert sorted(api.calls) == ["b", "new"]
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_previous_snapshot():
+    api = FakeAPI()
+    service = RankSnapshotService(api, max_age=900)
+    await service.refresh_all({1: ["a"]})
+    previous = service._snapshots["a"]
+
+    api.fail.add("a")
+    await service.refresh_all({1: ["a"]})
+    assert service._snapshots["a"] is previous
+
+@pytest.mark.asyncio
+async def test_untracked_players_are_dropped():
+    service = RankSnapshotService(FakeAPI(), max_age=900)
+    await service.refresh_all({1: ["a", "b"]})
+    await service.refresh_all({1: ["a"]})
+    assert set(service._snapshots) == {"a"}
+
+def solo(tier, rank, lp):
+    return {"queueType": "RANKED_SOLO_5x5", "tier": tier, "rank": rank, "leaguePoints": lp}
+
+@pytest.mark.asyncio
+async def test_promotion_game_records_its_real_lp_delta(tmp_path):
+    api = FakeAPI(ranks=[solo("GOLD", "I", 95), solo("PLATINUM", "IV", 15)])
+    lp_series = LpSeriesStore(tmp_path / "lp_series.sqlite3", datetime(2026, 1, 8))
+    service = RankSnapshotService(api, max_age=900, lp_series=lp_series)
+
+    await service.refresh_all({1: ["a"]})
+    lp_series.get("a").timestamps[0] -= 60
+    await service.refresh_all({1: ["a"]})
+
+    scores = lp_series.get("a").scores
+    assert scores[1] - scores[0] == 20
+    assert lp_series.aggregates.get_gain("a", "day") == 20
+
+def test_apex_tiers_share_one_ladder():
+    master = calculate_ladder_score(solo("MASTER", "I", 180))
+    grandmaster = calculate_ladder_score(solo("GRANDMASTER", "I", 210))
+    diamond = calculate_ladder_score(solo("DIAMOND", "I", 90))
+
+    assert grandmaster - master == 30
+    assert master - diamond == 190
+    assert format_rank_score(diamond) == "Diamond I"
+    assert format_rank_score(master) == "Master+ 180"
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from utils.riot_api import RateLimiter, RateLimitWindow
+
+HOST = "euw1.api.riotgames.com"
+
+def test_window_allows_limit_then_waits_for_oldest_slot():
+    window = RateLimitWindow(limit=2, period=10)
+
+    for at in (window.next_free(0.0), window.next_free(0.0)):
+        window.reserve(at)
+    assert list(window.slots) == [0.0, 0.0]
+
+    # Troisième appel : il faut que le premier créneau sorte de la fenêtre
+    assert window.next_free(1.0) == 10.0
+
+@pytest.mark.asyncio
+async def test_acquire_serves_callers_in_arrival_order():
+    limiter = RateLimiter(default_limits=[(2, 0.05)])
+    order = []
+
+    async def call(index):
+        await limiter.acquire(HOST, "summoner")
+        order.append(index)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(call(index) for index in range(6)))
+
+    assert order == list(range(6))
+    # 6 appels à 2 par 50 ms : au moins deux fenêtres d'attente
+    assert loop.time() - start >= 0.1
+
+@pytest.mark.asyncio
+async def test_update_syncs_limits_and_counts_from_headers():
+    limiter = RateLimiter(default_limits=[(20, 1), (100, 120)])
+    limiter.update(HOST, "league", {
+        "X-App-Rate-Limit": "20:1,100:120",
+        "X-App-Rate-Limit-Count": "3:1,40:120",
+        "X-Method-Rate-Limit": "50:10",
+        "X-Method-Rate-Limit-Count": "7:10"
+    })
+
+    app = {window.period: window for window in limiter._buckets[f"app:{HOST}"]}
+    assert {period: window.limit for period, window in app.items()} == {1: 20, 120: 100}
+    assert len(app[1].slots) == 3
+    assert len(app[120].slots) == 40
+
+    method = limiter._buckets[f"method:{HOST}:league"]
+    assert [(window.limit, window.period, len(window.slots)) for window in method] == [(50, 10, 7)]
+
+@pytest.mark.asyncio
+async def test_update_resizes_existing_window():
+    limiter = RateLimiter(default_limits=[(20, 1)])
+    await limiter.acquire(HOST, "league")
+    limiter.update(HOST, "league", {"X-App-Rate-Limit": "10:1"})
+
+    (window,) = limiter._buckets[f"app:{HOST}"]
+    assert window.limit == 10
+    assert len(window.slots) == 1
+
+@pytest.mark.asyncio
+async def test_method_429_does_not_delay_other_methods():
+    limiter = RateLimiter(default_limits=[(20, 1)])
+    delay = limiter.penalize(HOST, "match", {"Retry-After": "10", "X-Rate-Limit-Type": "method"})
+    pending = asyncio.create_task(limiter.acquire(HOST, "match"))
+    await asyncio.sleep(0)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.wait_for(limiter.acquire(HOST, "account"), timeout=1)
+    elapsed = loop.time() - start
+
+    assert not pending.done()
+    pending.cancel()
+    assert delay == 10.0
+    assert elapsed < 0.05
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_keeps_no_slot():
+    limiter = RateLimiter(default_limits=[(1, 0.2)])
+    await limiter.acquire(HOST, "league")
+
+    waiter = asyncio.create_task(limiter.acquire(HOST, "league"))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    # Aucun créneau n'est réservé dans le futur pour l'appelant annulé
+    now = asyncio.get_running_loop().time()
+    (window,) = limiter._buckets[f"app:{HOST}"]
+    assert [slot for slot in window.slots if slot > now] == []
+
+def test_parse_limits_ignores_malformed_parts():
+    assert RateLimiter._parse_limits("20:1,oops,100:120") == [(20, 1), (100, 120)]
+    assert RateLimiter._parse_limits(None) == []
@@ -0,0 +1,50 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from utils.lp_series import LpSeriesStore
+from utils.storage import LeaderboardStorage
+
+def fail_once(db):
+    """Fait échouer la prochaine écriture groupée de la base"""
+    executemany = db.executemany
+
+    async def failing(sql, rows):
+        db.executemany = executemany
+        raise sqlite3.OperationalError("database is locked")
+
+    db.executemany = failing
+
+@pytest.mark.asyncio
+async def test_failed_lp_flush_keeps_the_batch(tmp_path):
+    storage = LeaderboardStorage(tmp_path / "storage.sqlite3")
+    try:
+        await storage.record_lp_batch(1, "2026-03-18", {"a": 1040, "b": 980})
+
+        fail_once(storage.db)
+        with pytest.raises(sqlite3.OperationalError):
+            await storage.flush_lp()
+
+        await storage.flush_lp()
+        rows = await storage.db.fetchall("SELECT puuid, lp FROM lp_snapshots ORDER BY puuid")
+        assert [(row["puuid"], row["lp"]) for row in rows] == [("a", 1040), ("b", 980)]
+    finally:
+        await storage.close()
+
+@pytest.mark.asyncio
+async def test_failed_series_flush_keeps_the_points(tmp_path):
+    lp_series = LpSeriesStore(tmp_path / "lp_series.sqlite3", datetime(2026, 1, 8))
+    try:
+        lp_series.append("a", 1000, 1200)
+
+        fail_once(lp_series.db)
+        with pytest.raises(sqlite3.OperationalError):
+            await lp_series.flush()
+
+        lp_series.append("a", 2000, 1220)
+        await lp_series.flush()
+        rows = await lp_series.db.fetchall("SELECT ts, score FROM lp_points ORDER BY ts")
+        assert [(row["ts"], row["score"]) for row in rows] == [(1000, 1200), (2000, 1220)]
+    finally:
+        await lp_series.close()
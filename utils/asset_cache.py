@@ -0,0 +1,225 @@
+import os
+import shutil
+import asyncio
+import logging
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageDraw
+
+from utils.cache import TTLCache
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Type d'asset -> chemin Data Dragon (relatif à la version)
+ASSET_PATHS = {
+    "champion": "img/champion/{name}.png",
+    "profileicon": "img/profileicon/{name}.png"
+}
+
+AssetKey = Tuple[str, str, str, int, bool]
+
+def circular_mask(size: int) -> Image.Image:
+    """Crée un masque circulaire"""
+    mask = Image.new("L", (size, size), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.ellipse((0, 0, size, size), fill=255)
+    return mask
+
+def _image_size(img: Image.Image) -> int:
+    """Taille mémoire approximative d'une image RGBA"""
+    return img.width * img.height * 4
+
+def _prepare(data: bytes, size: int, mask: bool) -> Tuple[Image.Image, bytes]:
+    """
+    Redimensionne (et masque en cercle) une image téléchargée
+
+    Fonction synchrone (PIL) : à exécuter hors de la boucle asyncio.
+
+    Returns:
+        (image RGBA prête à coller, PNG à écrire sur disque)
+    """
+    img = Image.open(BytesIO(data)).convert("RGBA")
+    img = img.resize((size, size), Image.Resampling.LANCZOS)
+
+    if mask:
+        img.putalpha(ImageChops.multiply(img.getchannel("A"), circular_mask(size)))
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return img, buffer.getvalue()
+
+def _load(path: Path) -> Optional[Image.Image]:
+    """Charge une image préparée depuis le disque"""
+    try:
+        with Image.open(path) as img:
+            return img.convert("RGBA")
+    except (FileNotFoundError, OSError):
+        return None
+
+def _write(path: Path, png: bytes):
+    """Écrit un fichier de façon atomique"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(png)
+    os.replace(tmp_path, path)
+
+class AssetCache:
+    """
+    Cache des images Data Dragon (icônes de champions et de profil)
+
+    Une entrée est identifiée par (version, type, nom, taille, masque) et
+    stockée déjà redimensionnée et masquée : en mémoire (LRU) puis sur
+    disque sous {root}/{version}/{type}/{nom}_{taille}[_round].png.
+    Le réseau n'est sollicité que pour un asset jamais vu dans la version
+    courante de Data Dragon.
+    """
+
+    def __init__(self, root: Path, riot_api):
+        """
+        Args:
+            root: Dossier du cache disque
+            riot_api: Client Riot API partagé (sa session HTTP sert aux téléchargements)
+        """
+        self.root = Path(root)
+        self.riot_api = riot_api
+        self.memory = TTLCache(
+            max_entries=Config.ASSET_MEMORY_MAX_ENTRIES,
+            max_bytes=Config.ASSET_MEMORY_MAX_BYTES,
+            sizeof=_image_size
+        )
+        self._inflight: Dict[AssetKey, asyncio.Task] = {}
+
+        # Compteur de téléchargements (un cache chaud n'en fait aucun)
+        self.downloads = 0
+
+    def _path(self, key: AssetKey) -> Path:
+        version, kind, name, size, mask = key
+        suffix = "_round" if mask else ""
+        return self.root / version / kind / f"{name}_{size}{suffix}.png"
+
+    async def get(
+        self,
+        kind: str,
+        name: str,
+        size: int,
+        mask: bool = False,
+        version: Optional[str] = None
+    ) -> Optional[Image.Image]:
+        """
+        Retourne un asset prêt à coller
+
+        Args:
+            kind: Type d'asset ("champion" ou "profileicon")
+            name: Nom Data Dragon (ex: "MonkeyKing") ou ID d'icône
+            size: Côté de l'image en pixels
+            mask: Masque circulaire
+            version: Version Data Dragon (par défaut la version courante)
+
+        Returns:
+            Image PIL RGBA ou None si indisponible
+        """
+        key = (version or Config.DDRAGON_VERSION, kind, str(name), size, mask)
+
+        img = self.memory.get(key)
+        if img is not None:
+            return img
+
+        # Mutualiser les chargements simultanés du même asset
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_or_download(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def _load_or_download(self, key: AssetKey) -> Optional[Image.Image]:
+        """Charge un asset depuis le disque, sinon le télécharge et le prépare"""
+        path = self._path(key)
+        img = await asyncio.to_thread(_load, path)
+
+        if img is None:
+            data = await self._download(key)
+            if data is None:
+                return None
+
+            _, _, _, size, mask = key
+            img, png = await asyncio.to_thread(_prepare, data, size, mask)
+            await asyncio.to_thread(_write, path, png)
+
+        self.memory.set(key, img, Config.ASSET_MEMORY_TTL)
+        return img
+
+    async def _download(self, key: AssetKey) -> Optional[bytes]:
+        """Télécharge l'image d'origine depuis Data Dragon"""
+        version, kind, name, _, _ = key
+        url = f"{Config.DDRAGON_BASE_URL}/{version}/{ASSET_PATHS[kind].format(name=name)}"
+
+        if not self.riot_api.session:
+            return None
+
+        try:
+            async with self.riot_api.session.get(url) as response:
+                if response.status != 200:
+                    logger.warning(f"Asset introuvable ({response.status}): {url}")
+                    return None
+                self.downloads += 1
+                return await response.read()
+        except Exception as e:
+            logger.error(f"Erreur lors du téléchargement de {url}: {e}")
+            return None
+
+    async def get_many(
+        self,
+        kind: str,
+        names: Iterable[str],
+        size: int,
+        mask: bool = False,
+        version: Optional[str] = None
+    ) -> List[Optional[Image.Image]]:
+        """Retourne plusieurs assets (None pour ceux indisponibles), dans l'ordre"""
+        return await asyncio.gather(*(
+            self.get(kind, name, size, mask, version) for name in names
+        ))
+
+    async def warm(
+        self,
+        kind: str,
+        names: Iterable[str],
+        size: int,
+        mask: bool = False,
+        version: Optional[str] = None
+    ):
+        """Précharge des assets (démarrage, nouvelle version), avec une concurrence bornée"""
+        semaphore = asyncio.Semaphore(Config.FANOUT_CONCURRENCY)
+
+        async def _warm_one(name: str) -> bool:
+            async with semaphore:
+                return await self.get(kind, name, size, mask, version) is not None
+
+        names = list(names)
+        results = await asyncio.gather(*(_warm_one(name) for name in names))
+        logger.info(
+            f"Cache d'assets préchargé: {sum(results)}/{len(names)} {kind} "
+            f"({self.downloads} téléchargement(s))"
+        )
+
+    async def purge_versions(self, keep: str):
+        """Supprime du disque les assets des autres versions de Data Dragon"""
+        def _purge():
+            if not self.root.exists():
+                return []
+            removed = []
+            for version_dir in self.root.iterdir():
+                if version_dir.is_dir() and version_dir.name != keep:
+                    shutil.rmtree(version_dir, ignore_errors=True)
+                    removed.append(version_dir.name)
+            return removed
+
+        removed = await asyncio.to_thread(_purge)
+        if removed:
+            logger.info(f"Assets des anciennes versions supprimés: {', '.join(removed)}")
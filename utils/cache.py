@@ -0,0 +1,107 @@
+import sys
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+def json_size(value: Any) -> int:
+    """Estime la taille mémoire d'une valeur JSON (réponse API, lobby...)"""
+    return len(json.dumps(value, separators=(",", ":")))
+
+class TTLCache:
+    """Cache mémoire borné avec expiration par entrée et éviction LRU"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof
+    ):
+        """
+        Args:
+            max_entries: Nombre maximum d'entrées
+            max_bytes: Taille mémoire maximale estimée (octets), None pour ne
+                borner que le nombre d'entrées
+            sizeof: Fonction d'estimation de la taille d'une valeur
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        # clé -> (expiration, valeur, taille), de la moins à la plus récemment utilisée
+        self._data: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self.current_bytes = 0
+
+        # Compteurs
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retourne la valeur en cache ou `default` si absente ou expirée"""
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Ajoute une valeur pour `ttl` secondes, en évinçant les entrées les plus anciennes"""
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+
+        # Une valeur plus grosse que le cache entier n'est pas conservée
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (time.monotonic() + ttl, value, size)
+        self.current_bytes += size
+
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.current_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """Supprime une entrée du cache"""
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self):
+        """Vide le cache"""
+        self._data.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retourne les statistiques du cache"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.current_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total * 100, 1) if total > 0 else 0
+        }
+
+    def _remove(self, key: Hashable):
+        """Supprime une entrée et met à jour la taille"""
+        _, _, size = self._data.pop(key)
+        self.current_bytes -= size
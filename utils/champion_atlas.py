@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from utils.asset_cache import AssetCache
+
+logger = logging.getLogger(__name__)
+
+# Couleur de fond Discord (dark)
+BG_COLOR = (47, 49, 54, 255)
+
+def _build_sheet(
+    icons: Dict[str, Image.Image],
+    size: int,
+    columns: int
+) -> Tuple[Image.Image, Dict[str, Tuple[int, int, int, int]]]:
+    """
+    Assemble des icônes dans une seule planche
+
+    Fonction synchrone (PIL) : à exécuter hors de la boucle asyncio.
+
+    Returns:
+        (planche RGBA, nom -> zone (gauche, haut, droite, bas))
+    """
+    rows = max((len(icons) + columns - 1) // columns, 1)
+    sheet = Image.new("RGBA", (columns * size, rows * size), (0, 0, 0, 0))
+    regions = {}
+
+    for idx, (name, icon) in enumerate(sorted(icons.items())):
+        x = (idx % columns) * size
+        y = (idx // columns) * size
+        sheet.paste(icon, (x, y))
+        regions[name] = (x, y, x + size, y + size)
+
+    return sheet, regions
+
+class ChampionAtlas:
+    """
+    Planche en mémoire des icônes de tous les champions
+
+    Les icônes sont chargées une fois depuis le cache d'assets puis assemblées
+    dans une seule image : une grille se compose ensuite en une passe de
+    découpes/collages, sans aucun appel réseau. Planche et zones sont
+    remplacées ensemble, un rendu en cours n'est jamais affecté.
+    """
+
+    def __init__(self, assets: AssetCache, size: int, columns: int = 16):
+        """
+        Args:
+            assets: Cache d'assets partagé (source des icônes)
+            size: Côté d'une icône en pixels
+            columns: Nombre de colonnes de la planche
+        """
+        self.assets = assets
+        self.size = size
+        self.columns = columns
+
+        # (planche, nom Data Dragon -> zone)
+        self._sheet: Tuple[Optional[Image.Image], Dict[str, Tuple[int, int, int, int]]] = (None, {})
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sheet[1]
+
+    def __len__(self) -> int:
+        return len(self._sheet[1])
+
+    async def load(self, names: Iterable[str], version: Optional[str] = None):
+        """
+        (Re)construit la planche pour une liste de champions
+
+        Args:
+            names: Noms Data Dragon des champions (ex: "MonkeyKing")
+            version: Version Data Dragon des icônes (par défaut la version courante)
+        """
+        async with self._lock:
+            await self._build(list(names), version)
+
+    async def ensure(self, names: Iterable[str]):
+        """Ajoute à la planche les champions qui n'y sont pas encore (nouveaux champions)"""
+        missing = [name for name in names if name not in self]
+        if not missing:
+            return
+
+        async with self._lock:
+            missing = [name for name in missing if name not in self]
+            if missing:
+                await self._build(list(self._sheet[1]) + missing)
+
+    async def _build(self, names: List[str], version: Optional[str] = None):
+        """Charge les icônes et remplace la planche"""
+        images = await self.assets.get_many("champion", names, self.size, version=version)
+        icons = {name: icon for name, icon in zip(names, images) if icon is not None}
+
+        self._sheet = await asyncio.to_thread(_build_sheet, icons, self.size, self.columns)
+        logger.info(f"Planche d'icônes construite: {len(icons)}/{len(names)} champions")
+
+    def crop(self, name: str) -> Optional[Image.Image]:
+        """Retourne l'icône d'un champion (None si absente)"""
+        sheet, regions = self._sheet
+        region = regions.get(name)
+        return sheet.crop(region) if region else None
+
+    def compose_grid(
+        self,
+        names: Sequence[str],
+        cols: int = 5,
+        background: Tuple[int, int, int, int] = BG_COLOR
+    ) -> Tuple[BytesIO, int]:
+        """
+        Compose une grille d'icônes de champions
+
+        Fonction synchrone (PIL) : à exécuter hors de la boucle asyncio.
+
+        Args:
+            names: Noms Data Dragon des champions, dans l'ordre d'affichage
+            cols: Nombre de colonnes
+            background: Couleur de fond
+
+        Returns:
+            (buffer PNG, nombre d'icônes placées)
+        """
+        sheet, regions = self._sheet
+        placed = [regions[name] for name in names if name in regions]
+        if not placed:
+            raise ValueError("Aucune icône disponible")
+
+        rows = (len(placed) + cols - 1) // cols
+        grid = Image.new("RGBA", (cols * self.size, rows * self.size), background)
+
+        for idx, region in enumerate(placed):
+            icon = sheet.crop(region)
+            grid.paste(icon, ((idx % cols) * self.size, (idx // cols) * self.size), icon)
+
+        buffer = BytesIO()
+        grid.save(buffer, format="PNG")
+        buffer.seek(0)
+
+        return buffer, len(placed)
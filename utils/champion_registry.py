@@ -0,0 +1,103 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def normalize_key(name: str) -> str:
+    """
+    Clé de recherche d'un champion : minuscules, lettres et chiffres seulement
+
+    "Kog'Maw", "kogmaw" et "KogMaw" donnent la même clé.
+    """
+    return "".join(char for char in name.casefold() if char.isalnum())
+
+class ChampionRegistry:
+    """
+    Données statiques des champions, indexées une fois pour toutes
+
+    Construit à partir du champion.json de Data Dragon. Chaque champion est
+    un dict {"id", "key", "name", "asset"} :
+        id: ID numérique (championId des API Riot)
+        key: Identifiant Data Dragon (ex: "MonkeyKing")
+        name: Nom affiché (ex: "Wukong")
+        asset: Nom du fichier d'icône Data Dragon, sans extension
+
+    Toutes les recherches sont des accès dict en O(1). load() construit de
+    nouveaux index puis les remplace d'un coup : un lecteur voit toujours
+    un état complet.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._by_name: Dict[str, int] = {}
+        self._by_key: Dict[str, int] = {}
+        self.version: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def load(self, champion_data: Dict[str, Any], version: Optional[str] = None):
+        """
+        Construit les index à partir des données Data Dragon
+
+        Args:
+            champion_data: Contenu du champ "data" de champion.json
+            version: Version Data Dragon des données
+        """
+        by_id: Dict[int, Dict[str, Any]] = {}
+        by_name: Dict[str, int] = {}
+        by_key: Dict[str, int] = {}
+
+        for ddragon_key, data in champion_data.items():
+            champion_id = int(data["key"])
+            image = data.get("image", {}).get("full", f"{ddragon_key}.png")
+            record = {
+                "id": champion_id,
+                "key": ddragon_key,
+                "name": data.get("name", ddragon_key),
+                "asset": image.rsplit(".", 1)[0]
+            }
+
+            by_id[champion_id] = record
+            by_name[record["name"]] = champion_id
+            by_key[normalize_key(record["name"])] = champion_id
+            by_key[normalize_key(ddragon_key)] = champion_id
+
+        self._by_id, self._by_name, self._by_key = by_id, by_name, by_key
+        self.version = version
+        logger.info(f"Registre champions chargé: {len(by_id)} champions (version {version})")
+
+    def get(self, champion_id: int) -> Optional[Dict[str, Any]]:
+        """Retourne un champion à partir de son ID"""
+        return self._by_id.get(int(champion_id))
+
+    def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne un champion à partir de son nom
+
+        Accepte le nom affiché exact, l'identifiant Data Dragon ou toute
+        variante de casse/ponctuation ("kaisa", "Kai'Sa", "wukong"...).
+        """
+        champion_id = self._by_name.get(name)
+        if champion_id is None:
+            champion_id = self._by_key.get(normalize_key(name))
+        return self._by_id.get(champion_id) if champion_id is not None else None
+
+    def key(self, champion_id: int) -> Optional[str]:
+        """Retourne l'identifiant Data Dragon d'un champion (ex: "MonkeyKing")"""
+        record = self.get(champion_id)
+        return record["key"] if record else None
+
+    def name(self, champion_id: int) -> Optional[str]:
+        """Retourne le nom affiché d'un champion (ex: "Wukong")"""
+        record = self.get(champion_id)
+        return record["name"] if record else None
+
+    def asset(self, champion_id: int) -> Optional[str]:
+        """Retourne le nom d'icône Data Dragon d'un champion"""
+        record = self.get(champion_id)
+        return record["asset"] if record else None
+
+    def all_assets(self) -> List[str]:
+        """Retourne les noms d'icônes de tous les champions"""
+        return [record["asset"] for record in self._by_id.values()]
@@ -1,26 +1,20 @@
 """Constantes utilisées dans le bot"""
 
-# Exceptions pour les noms de champions Data Dragon
-CHAMPION_NAME_EXCEPTIONS = {
-    "Wukong": "MonkeyKing",
-    "Kog'Maw": "KogMaw",
-    "Tahm Kench": "TahmKench",
-    "Cho'Gath": "Chogath",
-    "Dr. Mundo": "DrMundo",
-    "Jarvan IV": "JarvanIV",
-    "Kai'Sa": "Kaisa",
-    "Lee Sin": "LeeSin",
-    "Master Yi": "MasterYi",
-    "Miss Fortune": "MissFortune",
-    "Rek'Sai": "RekSai",
-    "Vel'Koz": "Velkoz",
-    "Aurelion Sol": "AurelionSol",
-    "Nunu & Willump": "Nunu",
-    "Kha'Zix": "Khazix",
-    "Renata Glasc": "Renata",
-    "Bel'Veth": "Belveth",
-    "Le Blanc": "LeBlanc"
+from typing import Any, Dict, Optional
+
+# Ordre des tiers et divisions pour le classement
+TIER_ORDER = {
+    "IRON": 0, "BRONZE": 1, "SILVER": 2, "GOLD": 3,
+    "PLATINUM": 4, "EMERALD": 5, "DIAMOND": 6,
+    "MASTER": 7, "GRANDMASTER": 8, "CHALLENGER": 9
 }
+DIVISION_ORDER = {"IV": 0, "III": 1, "II": 2, "I": 3}
+APEX_TIERS = ["MASTER", "GRANDMASTER", "CHALLENGER"]
+
+# Échelle continue : 4 divisions de 100 LP par tier, puis une seule
+# échelle de LP partagée par Master, Grandmaster et Challenger
+LADDER_TIER_SIZE = 400
+APEX_LADDER_BASE = TIER_ORDER["MASTER"] * LADDER_TIER_SIZE
 
 # Couleurs des tiers pour les embeds
 TIER_COLORS = {
@@ -86,20 +80,87 @@ def get_winrate_color(winrate: float) -> int:
     else:
         return DISCORD_COLORS["RED"]
 
-def normalize_champion_name(champion_name: str) -> str:
+def calculate_rank_score(rank_data: Optional[Dict[str, Any]]) -> int:
     """
-    Normalise le nom d'un champion pour Data Dragon
+    Calcule un score de tri des classements (tier * 1000 + division * 100 + LP)
+    
+    Sert uniquement à ordonner des joueurs : l'écart entre deux tiers n'est
+    pas un nombre de LP (voir calculate_ladder_score).
     
     Args:
-        champion_name: Nom du champion
+        rank_data: Entrée league-v4 (ou None si non classé)
     
     Returns:
-        Nom normalisé pour les URLs Data Dragon
+        Score de classement, -1 si non classé
+    """
+    if not rank_data:
+        return -1  # Unranked en dernier
+    
+    tier = rank_data.get("tier", "IRON")
+    rank = rank_data.get("rank", "IV")
+    lp = rank_data.get("leaguePoints", 0)
+    
+    tier_score = TIER_ORDER.get(tier, 0) * 1000
+    
+    # Master+ n'ont pas de division
+    if tier in APEX_TIERS:
+        division_score = 300
+    else:
+        division_score = DIVISION_ORDER.get(rank, 0) * 100
+    
+    return tier_score + division_score + lp
+
+def calculate_ladder_score(rank_data: Optional[Dict[str, Any]]) -> int:
     """
-    # Vérifier les exceptions
-    normalized = CHAMPION_NAME_EXCEPTIONS.get(champion_name, champion_name)
+    Calcule la position sur l'échelle continue des LP (tier * 400 + division * 100 + LP)
+    
+    Une promotion ou une rétrogradation ne change le score que des LP
+    réellement gagnés ou perdus (Or I 95 LP -> Platine IV 15 LP = +20).
+    Master, Grandmaster et Challenger partagent une seule échelle de LP.
+    Utilisé pour l'historique et les gains de LP.
+    
+    Args:
+        rank_data: Entrée league-v4 (ou None si non classé)
+    
+    Returns:
+        Score sur l'échelle, -1 si non classé
+    """
+    if not rank_data:
+        return -1
+    
+    tier = rank_data.get("tier", "IRON")
+    rank = rank_data.get("rank", "IV")
+    lp = rank_data.get("leaguePoints", 0)
+    
+    if tier in APEX_TIERS:
+        return APEX_LADDER_BASE + lp
+    
+    return (
+        TIER_ORDER.get(tier, 0) * LADDER_TIER_SIZE
+        + DIVISION_ORDER.get(rank, 0) * 100
+        + lp
+    )
+
+def format_rank_score(score: int) -> str:
+    """
+    Convertit un score de l'échelle continue en libellé court (ex: "Gold II")
+    
+    Args:
+        score: Score calculé par calculate_ladder_score
+    
+    Returns:
+        Libellé du tier et de la division (LP au-delà de Master)
+    """
+    if score < 0:
+        return "Unranked"
+    
+    if score >= APEX_LADDER_BASE:
+        lp = score - APEX_LADDER_BASE
+        return f"Master+ {lp}" if lp else "Master"
     
-    # Supprimer espaces et apostrophes
-    normalized = normalized.replace(" ", "").replace("'", "")
+    tiers = list(TIER_ORDER)
+    tier = tiers[score // LADDER_TIER_SIZE]
     
-    return normalized
\ No newline at end of file
+    divisions = list(DIVISION_ORDER)
+    division = divisions[(score % LADDER_TIER_SIZE) // 100]
+    return f"{tier.capitalize()} {division}"
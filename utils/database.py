@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+class SQLiteDatabase:
+    """
+    Base SQLite asynchrone
+
+    Toutes les requêtes sont exécutées dans un thread dédié pour ne jamais
+    bloquer la boucle asyncio. Le thread unique sérialise les accès, ce qui
+    permet de partager une seule connexion sans verrou.
+    """
+
+    def __init__(self, path: Path, schema: str):
+        """
+        Args:
+            path: Chemin du fichier SQLite
+            schema: Script SQL de création des tables (idempotent)
+        """
+        self.path = Path(path)
+        self.schema = schema
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"sqlite-{self.path.stem}"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Ouvre la connexion au premier accès (dans le thread dédié)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.schema)
+            self._conn.commit()
+            logger.info(f"Base SQLite ouverte: {self.path}")
+        return self._conn
+
+    async def run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Exécute une fonction synchrone recevant la connexion, hors de la boucle"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            lambda: func(self._connection())
+        )
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()):
+        """Exécute une requête d'écriture et valide la transaction"""
+        def _execute(conn: sqlite3.Connection):
+            with conn:
+                conn.execute(sql, params)
+
+        await self.run(_execute)
+
+    async def executemany(self, sql: str, rows: Iterable[Sequence[Any]]):
+        """Exécute une requête d'écriture pour plusieurs lignes en une transaction"""
+        rows = list(rows)
+
+        def _executemany(conn: sqlite3.Connection):
+            with conn:
+                conn.executemany(sql, rows)
+
+        await self.run(_executemany)
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        """Retourne la première ligne d'une requête"""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Retourne toutes les lignes d'une requête"""
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def close(self):
+        """Ferme la connexion et arrête le thread dédié"""
+        def _close(conn: sqlite3.Connection):
+            conn.close()
+
+        if self._conn is not None:
+            await self.run(_close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,158 @@
+import os
+import json
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.riot_api import RiotAPIClient
+from utils.champion_registry import ChampionRegistry
+from utils.asset_cache import AssetCache
+from utils.champion_atlas import ChampionAtlas
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _read_champion_file(path: Path) -> Optional[Dict[str, Any]]:
+    """Lit les données champions enregistrées ({"version", "data"})"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            content = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    # Ancien format (ID -> nom, sans version) : ignoré, il sera remplacé
+    if "version" not in content or "data" not in content:
+        return None
+    return content
+
+def _write_champion_file(path: Path, content: Dict[str, Any]):
+    """Écrit les données champions de façon atomique"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(content, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+class DataDragonUpdater:
+    """
+    Suivi automatique de la version de Data Dragon
+
+    Au démarrage, les dernières données champions enregistrées dans
+    data/champions.json sont chargées sans appel réseau. Au premier
+    démarrage sans Data Dragon, load_fallback() charge l'instantané fourni
+    avec le bot (data/champions_fallback.json). Ensuite, check()
+    interroge versions.json et, seulement si la version a changé, télécharge
+    le nouveau champion.json, précharge les icônes de la nouvelle version,
+    puis bascule d'un coup registre, planche d'icônes et Config.DDRAGON_VERSION.
+    """
+
+    def __init__(
+        self,
+        riot_api: RiotAPIClient,
+        champions: ChampionRegistry,
+        assets: AssetCache,
+        atlas: ChampionAtlas,
+        data_path: Path,
+        fallback_path: Optional[Path] = None
+    ):
+        self.riot_api = riot_api
+        self.champions = champions
+        self.assets = assets
+        self.atlas = atlas
+        self.data_path = Path(data_path)
+        self.fallback_path = Path(fallback_path) if fallback_path else None
+        self._lock = asyncio.Lock()
+
+    async def load_saved(self) -> bool:
+        """
+        Charge les données champions enregistrées lors du dernier démarrage
+
+        Returns:
+            True si des données ont été chargées
+        """
+        content = await asyncio.to_thread(_read_champion_file, self.data_path)
+        if not content:
+            return False
+
+        Config.DDRAGON_VERSION = content["version"]
+        self.champions.load(content["data"], content["version"])
+        return True
+
+    async def load_fallback(self) -> bool:
+        """
+        Charge l'instantané des champions fourni avec le bot
+
+        Utilisé quand aucune donnée n'a encore été enregistrée et que Data
+        Dragon est injoignable ; check() le remplacera dès que possible.
+
+        Returns:
+            True si l'instantané a été chargé
+        """
+        content = None
+        if self.fallback_path is not None:
+            content = await asyncio.to_thread(_read_champion_file, self.fallback_path)
+        if not content:
+            logger.error(
+                f"Aucune donnée champions disponible ({self.data_path} absent, "
+                f"Data Dragon injoignable, instantané {self.fallback_path} illisible) : "
+                f"noms et icônes des champions indisponibles jusqu'au prochain check()"
+            )
+            return False
+
+        logger.warning(
+            f"Data Dragon injoignable : instantané des champions chargé "
+            f"(version {content['version']}), mise à jour au prochain check()"
+        )
+        Config.DDRAGON_VERSION = content["version"]
+        self.champions.load(content["data"], content["version"])
+        return True
+
+    async def check(self) -> bool:
+        """
+        Vérifie la dernière version de Data Dragon et l'applique si elle a changé
+
+        Returns:
+            True si une nouvelle version a été appliquée
+        """
+        async with self._lock:
+            versions = await self.riot_api.get_ddragon_versions()
+            if not versions:
+                logger.warning("Liste des versions Data Dragon indisponible")
+                return False
+
+            latest = versions[0]
+            if latest == self.champions.version and len(self.champions):
+                return False
+
+            data = await self.riot_api.get_champion_data(latest)
+            if not data:
+                logger.warning(f"Données champions indisponibles pour la version {latest}")
+                return False
+
+            await self._apply(latest, data)
+            return True
+
+    async def _apply(self, version: str, data: Dict[str, Any]):
+        """Prépare la nouvelle version puis remplace l'ancienne"""
+        previous = self.champions.version
+        logger.info(f"Nouvelle version Data Dragon: {previous} -> {version}")
+
+        # Préparer les icônes et la planche avant la bascule (au premier
+        # démarrage, c'est le préchargement du bot qui s'en charge)
+        if previous is not None:
+            staged = ChampionRegistry()
+            staged.load(data, version)
+            await self.assets.warm("champion", staged.all_assets(), self.atlas.size, version=version)
+            await self.atlas.load(staged.all_assets(), version)
+
+        # Bascule : les prochaines requêtes utilisent la nouvelle version
+        self.champions.load(data, version)
+        Config.DDRAGON_VERSION = version
+
+        await asyncio.to_thread(
+            _write_champion_file,
+            self.data_path,
+            {"version": version, "data": data}
+        )
+        await self.assets.purge_versions(keep=version)
@@ -75,13 +75,8 @@ class EmbedBuilder:
         return embed
     
     @staticmethod
-    def create_lobby_embed(participants: List[Dict], game_mode: str) -> discord.Embed:
-        """Crée un embed pour afficher un lobby"""
-        
-        # Séparer les équipes
-        team_red = [p for p in participants if p["teamId"] == 100]
-        team_blue = [p for p in participants if p["teamId"] == 200]
-        
+    def create_lobby_image_embed(game_mode: str) -> discord.Embed:
+        """Crée l'en-tête d'un lobby (seul, il accompagne le tableau en image)"""
         # Mapper le game mode
         mode_names = {
             "CLASSIC": "🏆 Ranked Solo/Duo",
@@ -90,11 +85,21 @@ class EmbedBuilder:
             # ... autres modes
         }
         
-        embed = discord.Embed(
+        return discord.Embed(
             title=f"🎮 Lobby en cours",
             description=f"Mode: **{mode_names.get(game_mode, game_mode)}**",
             color=discord.Color.blue()
         )
+    
+    @staticmethod
+    def create_lobby_embed(participants: List[Dict], game_mode: str) -> discord.Embed:
+        """Crée un embed pour afficher un lobby"""
+        
+        # Séparer les équipes
+        team_red = [p for p in participants if p["teamId"] == 100]
+        team_blue = [p for p in participants if p["teamId"] == 200]
+        
+        embed = EmbedBuilder.create_lobby_image_embed(game_mode)
         
         # Fonction helper pour formater un joueur
         def format_player(player_data):
@@ -0,0 +1,120 @@
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from utils.database import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    puuid TEXT PRIMARY KEY,
+    riot_id_key TEXT NOT NULL UNIQUE,
+    game_name TEXT NOT NULL,
+    tag_line TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS misses (
+    riot_id_key TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+);
+"""
+
+def make_riot_id_key(game_name: str, tag_line: str) -> str:
+    """Normalise un Riot ID (insensible à la casse) pour l'indexation"""
+    return f"{game_name.strip()}#{tag_line.strip()}".casefold()
+
+class IdentityStore:
+    """
+    Cache persistant de la résolution Riot ID -> PUUID
+
+    Les comptes trouvés sont servis pendant `ttl` secondes (au-delà, le
+    Riot ID est re-résolu : un compte renommé libère son ancien nom), les
+    Riot ID introuvables (404) sont mémorisés pendant `miss_ttl` secondes.
+    """
+
+    def __init__(self, db_path: Path, ttl: int, miss_ttl: int):
+        self.db = SQLiteDatabase(db_path, SCHEMA)
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+
+    async def lookup(
+        self,
+        game_name: str,
+        tag_line: str
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Cherche un Riot ID dans le cache
+
+        Returns:
+            (connu, compte) : connu vaut False si l'API doit être interrogée,
+            compte vaut None pour un Riot ID mémorisé comme introuvable
+        """
+        key = make_riot_id_key(game_name, tag_line)
+
+        row = await self.db.fetchone(
+            "SELECT puuid, game_name, tag_line FROM accounts "
+            "WHERE riot_id_key = ? AND updated_at > ?",
+            (key, time.time() - self.ttl)
+        )
+        if row:
+            return True, {
+                "puuid": row["puuid"],
+                "gameName": row["game_name"],
+                "tagLine": row["tag_line"]
+            }
+
+        row = await self.db.fetchone(
+            "SELECT expires_at FROM misses WHERE riot_id_key = ?",
+            (key,)
+        )
+        if row and row["expires_at"] > time.time():
+            return True, None
+
+        return False, None
+
+    async def save_account(self, account: Dict[str, Any]):
+        """Enregistre (ou renomme) un compte renvoyé par account-v1"""
+        game_name = account.get("gameName")
+        tag_line = account.get("tagLine")
+        if not game_name or not tag_line:
+            return
+
+        key = make_riot_id_key(game_name, tag_line)
+
+        def _save(conn):
+            with conn:
+                # OR REPLACE libère aussi un Riot ID repris par un autre compte
+                conn.execute(
+                    "INSERT OR REPLACE INTO accounts "
+                    "(puuid, riot_id_key, game_name, tag_line, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (account["puuid"], key, game_name, tag_line, time.time())
+                )
+                conn.execute("DELETE FROM misses WHERE riot_id_key = ?", (key,))
+
+        await self.db.run(_save)
+
+    async def save_miss(self, game_name: str, tag_line: str):
+        """Mémorise un Riot ID introuvable"""
+        await self.db.execute(
+            "INSERT OR REPLACE INTO misses (riot_id_key, expires_at) VALUES (?, ?)",
+            (make_riot_id_key(game_name, tag_line), time.time() + self.miss_ttl)
+        )
+
+    async def purge_expired(self):
+        """Supprime les comptes périmés et les Riot ID introuvables expirés"""
+        now = time.time()
+
+        def _purge(conn):
+            with conn:
+                conn.execute("DELETE FROM accounts WHERE updated_at <= ?", (now - self.ttl,))
+                conn.execute("DELETE FROM misses WHERE expires_at <= ?", (now,))
+
+        await self.db.run(_purge)
+
+    async def close(self):
+        """Ferme la base"""
+        await self.db.close()
@@ -0,0 +1,234 @@
+import time
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from utils.riot_api import RiotAPIClient
+from utils.poll_scheduler import PollScheduler
+
+logger = logging.getLogger(__name__)
+
+# Un joueur peu actif n'est jamais vérifié moins souvent que
+# MAX_IDLE_FACTOR * idle_interval : le radar doit voir ses parties
+MAX_IDLE_FACTOR = 2
+
+class LiveGameRadar:
+    """
+    Parties en cours des joueurs suivis (spectator-v5)
+
+    Garde en mémoire la table puuid -> partie en cours, mise à jour par
+    poll() en tâche de fond : /garen-live et le statut en ligne de
+    /garen-info la lisent sans appel API.
+
+    Le calendrier s'adapte :
+    - un joueur hors partie est vérifié toutes les `idle_interval` secondes ;
+    - une partie connue n'est revérifiée que via un seul de ses joueurs
+      suivis, et pas avant `min_game_length` secondes de jeu ;
+    - une réponse spectator place d'un coup tous les joueurs suivis de la
+      partie, qui ne sont donc pas interrogés séparément.
+
+    Avec un PollScheduler, l'intervalle hors partie est multiplié par le
+    facteur d'activité du joueur (borné à MAX_IDLE_FACTOR), et chaque
+    début/fin de partie lui est signalé pour avancer le rafraîchissement
+    du rang.
+    """
+
+    def __init__(
+        self,
+        riot_api: RiotAPIClient,
+        idle_interval: float,
+        ingame_interval: float,
+        min_game_length: float,
+        scheduler: Optional[PollScheduler] = None
+    ):
+        """
+        Args:
+            riot_api: Client Riot API partagé
+            idle_interval: Intervalle (secondes) de vérification d'un joueur hors partie
+            ingame_interval: Intervalle (secondes) de vérification d'une partie en cours
+            min_game_length: Durée (secondes) avant laquelle une partie n'est pas revérifiée
+            scheduler: Cadence adaptative des joueurs (optionnelle)
+        """
+        self.riot_api = riot_api
+        self.idle_interval = idle_interval
+        self.ingame_interval = ingame_interval
+        self.min_game_length = min_game_length
+        self.scheduler = scheduler
+
+        # gameId -> partie, puuid -> gameId
+        self._games: Dict[int, Dict[str, Any]] = {}
+        self._player_games: Dict[str, int] = {}
+        # puuid -> prochaine vérification (time.monotonic)
+        self._next_check: Dict[str, float] = {}
+
+    def get_game(self, puuid: str) -> Optional[Dict[str, Any]]:
+        """Retourne la partie en cours d'un joueur (None s'il n'est pas en partie)"""
+        game_id = self._player_games.get(puuid)
+        return self._games.get(game_id) if game_id is not None else None
+
+    def get_game_id(self, puuid: str, max_age: Optional[float] = None) -> Optional[int]:
+        """
+        Retourne l'ID de la partie en cours d'un joueur
+
+        Args:
+            puuid: Joueur concerné
+            max_age: Si fourni, ignore une partie qui n'a pas été confirmée
+                par spectator depuis `max_age` secondes (elle peut être finie)
+        """
+        game_id = self._player_games.get(puuid)
+        if game_id is None or max_age is None:
+            return game_id
+
+        game = self._games.get(game_id)
+        if game is None or time.monotonic() - game["confirmed_at"] > max_age:
+            return None
+        return game_id
+
+    def is_in_game(self, puuid: str) -> bool:
+        """Vérifie si un joueur est en partie"""
+        return puuid in self._player_games
+
+    def get_games(self, puuids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Retourne les parties en cours d'un groupe de joueurs (une fois par partie)"""
+        game_ids = {self._player_games[puuid] for puuid in puuids if puuid in self._player_games}
+        return [self._games[game_id] for game_id in game_ids]
+
+    def schedule(self, puuid: str, delay: float):
+        """Programme la prochaine vérification d'un joueur"""
+        self._next_check[puuid] = time.monotonic() + delay
+
+    def _idle_delay(self, puuid: str) -> float:
+        """Délai avant la prochaine vérification d'un joueur hors partie"""
+        if self.scheduler is not None:
+            return self.idle_interval * min(self.scheduler.activity_factor(puuid), MAX_IDLE_FACTOR)
+        return self.idle_interval
+
+    def _due(self, puuids: Set[str], now: float) -> List[str]:
+        """Retourne les joueurs à vérifier (un seul représentant par partie en cours)"""
+        due = []
+        checked_games: Set[int] = set()
+
+        for puuid in puuids:
+            if self._next_check.get(puuid, 0) > now:
+                continue
+
+            game_id = self._player_games.get(puuid)
+            if game_id is not None:
+                if game_id in checked_games:
+                    continue
+                checked_games.add(game_id)
+            due.append(puuid)
+
+        return due
+
+    def _end_game(self, game_id: int):
+        """Retire une partie terminée : ses joueurs repassent au rythme hors partie"""
+        game = self._games.pop(game_id, None)
+        if not game:
+            return
+
+        for puuid in game["tracked"]:
+            if self._player_games.get(puuid) == game_id:
+                del self._player_games[puuid]
+            if self.scheduler is not None:
+                self.scheduler.record_game_end(puuid)
+            self._next_check[puuid] = time.monotonic() + self._idle_delay(puuid)
+
+    def _prune_games(self):
+        """Oublie les parties qu'aucun joueur suivi ne référence plus"""
+        referenced = set(self._player_games.values())
+        for game_id in [game_id for game_id in self._games if game_id not in referenced]:
+            del self._games[game_id]
+
+    def _record_game(self, lobby: Dict[str, Any], tracked: Set[str], now: float):
+        """Enregistre une partie et y place tous les joueurs suivis qui y participent"""
+        game_id = lobby["gameId"]
+        participants = {
+            p["puuid"]: p["championId"] for p in lobby.get("participants", []) if p.get("puuid")
+        }
+        members = tracked & set(participants)
+
+        self._games[game_id] = {
+            "game_id": game_id,
+            "game_mode": lobby.get("gameMode"),
+            "queue_id": lobby.get("gameQueueConfigId"),
+            "start": lobby.get("gameStartTime", 0) / 1000,
+            "participants": participants,
+            "tracked": members,
+            # Dernière réponse spectator confirmant la partie (time.monotonic)
+            "confirmed_at": now
+        }
+
+        # Pas de nouvelle vérification avant la durée minimale d'une partie
+        elapsed = max(time.time() - self._games[game_id]["start"], 0)
+        delay = max(self.min_game_length - elapsed, self.ingame_interval)
+
+        for puuid in members:
+            previous = self._player_games.get(puuid)
+            if previous is not None and previous != game_id:
+                self._end_game(previous)
+            self._player_games[puuid] = game_id
+            self._next_check[puuid] = now + delay
+            if self.scheduler is not None:
+                self.scheduler.record_game_start(puuid)
+
+    async def poll(self, puuids: Iterable[str]) -> int:
+        """
+        Vérifie les joueurs dont le tour est venu
+
+        Args:
+            puuids: Tous les joueurs suivis (tous serveurs confondus)
+
+        Returns:
+            Nombre d'appels spectator effectués
+        """
+        tracked = set(puuids)
+        now = time.monotonic()
+
+        # Oublier les joueurs qui ne sont plus suivis
+        for puuid in [p for p in self._next_check if p not in tracked]:
+            del self._next_check[puuid]
+            self._player_games.pop(puuid, None)
+
+        due = self._due(tracked, now)
+        if not due:
+            self._prune_games()
+            return 0
+
+        results = await self.riot_api.get_many(
+            self.riot_api.get_lobby_by_puuid(puuid) for puuid in due
+        )
+
+        for puuid, lobby in zip(due, results):
+            if isinstance(lobby, Exception):
+                logger.warning(f"Vérification spectator impossible pour {puuid}: {lobby}")
+                self._next_check[puuid] = now + self._idle_delay(puuid)
+                continue
+
+            current = self._player_games.get(puuid)
+
+            if lobby:
+                if current is not None and current != lobby["gameId"]:
+                    self._end_game(current)
+                if lobby["gameId"] in self._games:
+                    # Partie déjà connue : repousser la vérification de tous ses
+                    # joueurs suivis, sinon un autre la revérifierait au passage suivant
+                    game = self._games[lobby["gameId"]]
+                    game["tracked"].add(puuid)
+                    game["confirmed_at"] = now
+                    for member in game["tracked"]:
+                        self._next_check[member] = now + self.ingame_interval
+                    self._player_games[puuid] = lobby["gameId"]
+                    if self.scheduler is not None:
+                        self.scheduler.record_game_start(puuid)
+                else:
+                    self._record_game(lobby, tracked, now)
+            else:
+                if current is not None:
+                    self._end_game(current)
+                self._next_check[puuid] = now + self._idle_delay(puuid)
+
+        self._prune_games()
+        games = len(self._games)
+        in_game = len(self._player_games)
+        logger.debug(f"Radar: {len(due)} vérification(s), {in_game} joueur(s) dans {games} partie(s)")
+        return len(due)
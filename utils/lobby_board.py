@@ -0,0 +1,121 @@
+from io import BytesIO
+from typing import Any, Dict, List, Sequence
+
+from PIL import Image, ImageDraw
+
+from utils.champion_atlas import ChampionAtlas
+from utils.constants import TIER_COLORS
+from utils.podium import get_font
+
+# Dimensions
+COLUMN_WIDTH = 460
+HEADER_HEIGHT = 44
+ROW_HEIGHT = 76
+PADDING = 10
+
+# Couleurs
+BG_COLOR = (47, 49, 54)
+ROW_COLOR = (54, 57, 63)
+TEXT_COLOR = (255, 255, 255)
+MUTED_COLOR = (185, 187, 190)
+UNRANKED_COLOR = (114, 118, 125)
+
+# Équipes : (teamId, titre, couleur), dans le même ordre que create_lobby_embed
+TEAMS = [
+    (100, "EQUIPE ROUGE", (237, 66, 69)),
+    (200, "EQUIPE BLEUE", (52, 152, 219))
+]
+
+def _printable(text: str) -> str:
+    """Retire les caractères que les polices PIL ne savent pas dessiner (emojis)"""
+    return "".join(char for char in text if ord(char) < 0x2000).strip()
+
+def _tier_color(tier: str) -> tuple:
+    """Couleur RGB d'un tier"""
+    color = TIER_COLORS.get(tier)
+    if color is None:
+        return UNRANKED_COLOR
+    return ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+
+def _draw_player(
+    img: Image.Image,
+    draw: ImageDraw.ImageDraw,
+    atlas: ChampionAtlas,
+    player: Dict[str, Any],
+    x: int,
+    y: int
+):
+    """Dessine la ligne d'un joueur (portrait, nom, badge de rang, WR, tags)"""
+    font_name = get_font(18)
+    font_small = get_font(14)
+
+    draw.rectangle([x, y, x + COLUMN_WIDTH - PADDING, y + ROW_HEIGHT - 6], fill=ROW_COLOR)
+
+    # Portrait du champion (planche en mémoire)
+    portrait = atlas.crop(player.get("champion_asset") or "")
+    if portrait:
+        img.paste(portrait, (x + 4, y + 4), portrait)
+
+    text_x = x + atlas.size + 14
+    draw.text((text_x, y + 4), _printable(player["riot_id"])[:28], fill=TEXT_COLOR, font=font_name)
+
+    # Badge de rang coloré selon le tier
+    rank_label = _printable(player.get("rank_label", ""))
+    bbox = draw.textbbox((0, 0), rank_label, font=font_small)
+    badge_right = text_x + bbox[2] - bbox[0] + 12
+    draw.rounded_rectangle(
+        [text_x, y + 28, badge_right, y + 48],
+        radius=6,
+        fill=_tier_color(player.get("tier"))
+    )
+    draw.text((text_x + 6, y + 30), rank_label, fill=(0, 0, 0), font=font_small)
+
+    # Winrate et nombre de parties
+    stats = f"{player['wr']}% WR - {player['games']} games"
+    draw.text((badge_right + 10, y + 30), stats, fill=MUTED_COLOR, font=font_small)
+
+    # Tags
+    tags = player["tags"]
+    tags_text = " | ".join(_printable(tag) for tag in tags) if isinstance(tags, list) else ""
+    draw.text((text_x, y + 52), tags_text[:48], fill=MUTED_COLOR, font=font_small)
+
+def render_lobby_board(
+    participants: Sequence[Dict[str, Any]],
+    game_mode: str,
+    atlas: ChampionAtlas
+) -> bytes:
+    """
+    Dessine le tableau d'un lobby : une colonne par équipe
+
+    Fonction synchrone (PIL) : à exécuter hors de la boucle asyncio. Les
+    portraits viennent de la planche d'icônes, sans aucun décodage.
+
+    Args:
+        participants: Participants enrichis (voir LobbyCog.enrich_participant)
+        game_mode: Mode de jeu affiché dans l'en-tête
+        atlas: Planche des icônes de champions
+
+    Returns:
+        Contenu du fichier PNG
+    """
+    teams: List[List[Dict[str, Any]]] = [
+        [p for p in participants if p["teamId"] == team_id] for team_id, _, _ in TEAMS
+    ]
+    rows = max((len(team) for team in teams), default=0)
+
+    width = COLUMN_WIDTH * len(TEAMS) + PADDING
+    height = HEADER_HEIGHT + rows * ROW_HEIGHT + PADDING
+    img = Image.new("RGBA", (width, height), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+    font_title = get_font(20)
+
+    for column, ((_, title, color), team) in enumerate(zip(TEAMS, teams)):
+        x = PADDING + column * COLUMN_WIDTH
+        draw.text((x, 12), f"{title} - {game_mode}", fill=color, font=font_title)
+
+        for row, player in enumerate(team):
+            _draw_player(img, draw, atlas, player, x, HEADER_HEIGHT + row * ROW_HEIGHT)
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,85 @@
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Périodes suivies et leur libellé
+PERIODS = {
+    "day": "Aujourd'hui",
+    "week": "Cette semaine",
+    "month": "Ce mois-ci",
+    "season": "Cette saison"
+}
+
+def period_start(period: str, ts: int, season_start: datetime) -> datetime:
+    """Retourne le début (UTC) de la période contenant ts"""
+    now = datetime.utcfromtimestamp(ts)
+    day = datetime(now.year, now.month, now.day)
+
+    if period == "day":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return datetime(now.year, now.month, 1)
+    return season_start
+
+class LpAggregates:
+    """
+    Gains de classement matérialisés par joueur et par période
+
+    Les scores sont ceux de l'échelle continue (calculate_ladder_score) :
+    un gain se lit directement en LP, promotions comprises.
+
+    Pour chaque joueur et chaque période (jour, semaine, mois, saison), on
+    garde le score de début de période et le dernier score : un nouveau
+    relevé met à jour ces valeurs en O(1) et la lecture d'un gain ne relit
+    jamais l'historique.
+    """
+
+    def __init__(self, season_start: datetime):
+        self.season_start = season_start
+
+        # (puuid, période) -> (début de période, score de départ, dernier score)
+        self._entries: Dict[Tuple[str, str], Tuple[datetime, int, int]] = {}
+
+    def update(self, puuid: str, ts: int, score: int):
+        """Prend en compte un nouveau relevé"""
+        for period in PERIODS:
+            start = period_start(period, ts, self.season_start)
+            entry = self._entries.get((puuid, period))
+
+            if entry is None:
+                self._entries[(puuid, period)] = (start, score, score)
+            elif entry[0] != start:
+                # Nouvelle période : le dernier score connu sert de référence
+                self._entries[(puuid, period)] = (start, entry[2], score)
+            else:
+                self._entries[(puuid, period)] = (start, entry[1], score)
+
+    def seed(self, puuid: str, period: str, start: datetime, baseline: int, last: int):
+        """Initialise une entrée (reconstruction au démarrage)"""
+        self._entries[(puuid, period)] = (start, baseline, last)
+
+    def get_gain(self, puuid: str, period: str, now: Optional[int] = None) -> int:
+        """Retourne le gain d'un joueur sur la période en cours"""
+        entry = self._entries.get((puuid, period))
+        if entry is None:
+            return 0
+
+        now = now if now is not None else int(time.time())
+        start, baseline, last = entry
+
+        # Aucun relevé depuis le début de la période : pas de variation
+        if start != period_start(period, now, self.season_start):
+            return 0
+        return last - baseline
+
+    def get_gains(self, puuids: Iterable[str], period: str) -> Dict[str, int]:
+        """Retourne les gains de plusieurs joueurs (ex: membres d'un serveur)"""
+        now = int(time.time())
+        return {puuid: self.get_gain(puuid, period, now) for puuid in puuids}
+
+    def get_ranking(self, puuids: Iterable[str], period: str) -> List[Tuple[str, int]]:
+        """Retourne les joueurs triés du plus gros gain à la plus grosse perte"""
+        gains = self.get_gains(puuids, period)
+        return sorted(gains.items(), key=lambda item: item[1], reverse=True)
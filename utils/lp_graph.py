@@ -0,0 +1,105 @@
+from datetime import datetime
+from io import BytesIO
+from typing import List, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from utils.constants import APEX_LADDER_BASE, LADDER_TIER_SIZE, format_rank_score
+
+# Couleurs des courbes (une par joueur)
+CURVE_COLORS = [
+    (87, 242, 135), (52, 152, 219), (254, 231, 92), (237, 66, 69),
+    (155, 89, 182), (230, 126, 34), (26, 188, 156), (236, 240, 241)
+]
+
+BG_COLOR = (47, 49, 54)
+GRID_COLOR = (64, 68, 75)
+TIER_GRID_COLOR = (114, 118, 125)
+TEXT_COLOR = (220, 221, 222)
+
+Curve = Tuple[str, Sequence[int], Sequence[int]]
+
+def render_lp_graph(
+    curves: List[Curve],
+    start: int,
+    end: int,
+    width: int = 800,
+    height: int = 400
+) -> BytesIO:
+    """
+    Dessine l'évolution du classement d'un ou plusieurs joueurs
+
+    Fonction synchrone (PIL) : à exécuter hors de la boucle asyncio.
+
+    Args:
+        curves: (nom, horodatages, scores) pour chaque joueur
+        start: Début de la période (timestamp)
+        end: Fin de la période (timestamp)
+        width: Largeur de l'image
+        height: Hauteur de l'image
+
+    Returns:
+        Buffer contenant l'image PNG
+    """
+    font = ImageFont.load_default()
+    left, right, top, bottom = 90, 20, 20, 40 + 16 * ((len(curves) + 3) // 4)
+
+    img = Image.new("RGBA", (width, height + bottom - 40), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    plot_w = width - left - right
+    plot_h = height - top - 40
+
+    # Bornes verticales arrondies à la division
+    all_scores = [score for _, _, scores in curves for score in scores]
+    y_min = (min(all_scores) - 50) // 100 * 100
+    y_max = (max(all_scores) + 150) // 100 * 100
+    span_x = max(end - start, 1)
+    span_y = max(y_max - y_min, 1)
+
+    def to_px(ts: int, score: int) -> Tuple[float, float]:
+        x = left + (max(ts, start) - start) / span_x * plot_w
+        y = top + (y_max - score) / span_y * plot_h
+        return x, y
+
+    # Grille : une ligne par division, plus marquée à chaque tier
+    division_px = plot_h / span_y * 100
+    for y_value in range(y_min, y_max + 1, 100):
+        _, y = to_px(start, y_value)
+        is_tier = y_value % LADDER_TIER_SIZE == 0 and y_value <= APEX_LADDER_BASE
+        draw.line([(left, y), (left + plot_w, y)], fill=TIER_GRID_COLOR if is_tier else GRID_COLOR)
+
+        if is_tier or division_px >= 14:
+            draw.text((5, y - 6), format_rank_score(y_value), fill=TEXT_COLOR, font=font)
+
+    # Dates (début, milieu, fin)
+    for ts in (start, (start + end) // 2, end):
+        x, _ = to_px(ts, y_min)
+        label = datetime.utcfromtimestamp(ts).strftime("%d/%m")
+        draw.text((x - 12, top + plot_h + 6), label, fill=TEXT_COLOR, font=font)
+
+    # Courbes en escalier : le score reste constant jusqu'au relevé suivant
+    for idx, (name, timestamps, scores) in enumerate(curves):
+        color = CURVE_COLORS[idx % len(CURVE_COLORS)]
+
+        points = []
+        for i, (ts, score) in enumerate(zip(timestamps, scores)):
+            x, y = to_px(ts, score)
+            if i > 0:
+                points.append((x, points[-1][1]))
+            points.append((x, y))
+        if points:
+            points.append((left + plot_w, points[-1][1]))
+            draw.line(points, fill=color, width=2)
+
+        # Légende
+        legend_x = left + (idx % 4) * (plot_w // 4)
+        legend_y = top + plot_h + 24 + (idx // 4) * 16
+        draw.rectangle([legend_x, legend_y + 2, legend_x + 10, legend_y + 12], fill=color)
+        draw.text((legend_x + 15, legend_y), name[:18], fill=TEXT_COLOR, font=font)
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    buffer.seek(0)
+
+    return buffer
@@ -0,0 +1,183 @@
+import time
+import calendar
+import logging
+from array import array
+from datetime import datetime
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.database import SQLiteDatabase
+from utils.lp_aggregates import PERIODS, LpAggregates, period_start
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lp_points (
+    puuid TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (puuid, ts)
+) WITHOUT ROWID;
+"""
+
+class LpSeries:
+    """Série temporelle d'un joueur : deux tableaux compacts (horodatages, scores)"""
+
+    __slots__ = ("timestamps", "scores")
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.scores = array("l")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def last_score(self) -> Optional[int]:
+        """Retourne le dernier score connu"""
+        return self.scores[-1] if self.scores else None
+
+    def value_at(self, ts: int) -> Optional[int]:
+        """Retourne le score en vigueur à un instant (dernier relevé <= ts)"""
+        idx = bisect_right(self.timestamps, ts)
+        return self.scores[idx - 1] if idx > 0 else None
+
+    def range(self, start: int, end: int) -> Tuple[array, array]:
+        """
+        Retourne les points entre start et end (inclus)
+
+        Le dernier point antérieur à start est ajouté pour que la courbe
+        démarre à la bonne valeur.
+        """
+        lo = max(bisect_left(self.timestamps, start) - 1, 0)
+        hi = bisect_right(self.timestamps, end)
+        return self.timestamps[lo:hi], self.scores[lo:hi]
+
+def downsample(
+    timestamps: array,
+    scores: array,
+    buckets: int
+) -> Tuple[List[int], List[int]]:
+    """
+    Réduit une série à environ 4 points par intervalle (premier, min, max, dernier)
+
+    Conserve la forme de la courbe (pics compris) pour un rendu de `buckets`
+    pixels de large. Les min/max se font sur des tranches de tableaux.
+    """
+    if len(timestamps) <= buckets * 4:
+        return list(timestamps), list(scores)
+
+    start, end = timestamps[0], timestamps[-1]
+    step = (end - start) / buckets or 1
+
+    out_ts: List[int] = []
+    out_scores: List[int] = []
+    lo = 0
+    for bucket in range(1, buckets + 1):
+        hi = bisect_right(timestamps, start + step * bucket) if bucket < buckets else len(timestamps)
+        if hi <= lo:
+            continue
+
+        chunk = scores[lo:hi]
+        low, high = min(chunk), max(chunk)
+        i_low = lo + chunk.index(low)
+        i_high = lo + chunk.index(high)
+
+        for i in sorted({lo, i_low, i_high, hi - 1}):
+            out_ts.append(timestamps[i])
+            out_scores.append(scores[i])
+        lo = hi
+
+    return out_ts, out_scores
+
+class LpSeriesStore:
+    """
+    Historique long terme des scores de classement (calculate_ladder_score)
+
+    Un point n'est ajouté que lorsque le score change : plusieurs mois
+    d'historique tiennent dans quelques tableaux compacts par joueur.
+    Les nouveaux points sont écrits en différé par flush(), et chaque point
+    met à jour les gains par période (self.aggregates).
+    """
+
+    def __init__(self, db_path: Path, season_start: datetime):
+        self.db = SQLiteDatabase(db_path, SCHEMA)
+        self._series: Dict[str, LpSeries] = {}
+        self._pending: List[Tuple[str, int, int]] = []
+        self.aggregates = LpAggregates(season_start)
+
+    async def load(self):
+        """Charge toutes les séries en mémoire"""
+        rows = await self.db.fetchall("SELECT puuid, ts, score FROM lp_points ORDER BY puuid, ts")
+
+        for row in rows:
+            series = self._series.setdefault(row["puuid"], LpSeries())
+            series.timestamps.append(row["ts"])
+            series.scores.append(row["score"])
+
+        logger.info(f"Historique LP chargé: {len(rows)} points pour {len(self._series)} joueurs")
+        self._seed_aggregates()
+
+    def _seed_aggregates(self):
+        """Reconstruit les gains par période à partir des séries chargées"""
+        now = int(time.time())
+
+        for puuid, series in self._series.items():
+            if not series:
+                continue
+
+            for period in PERIODS:
+                start = period_start(period, now, self.aggregates.season_start)
+                start_ts = calendar.timegm(start.timetuple())
+
+                # Score en vigueur au début de la période, sinon premier relevé de la période
+                baseline = series.value_at(start_ts)
+                if baseline is None:
+                    baseline = series.scores[0]
+
+                self.aggregates.seed(puuid, period, start, baseline, series.scores[-1])
+
+    def get(self, puuid: str) -> Optional[LpSeries]:
+        """Retourne la série d'un joueur"""
+        return self._series.get(puuid)
+
+    def append(self, puuid: str, ts: int, score: int) -> bool:
+        """
+        Ajoute un relevé si le score a changé
+
+        Returns:
+            True si un point a été ajouté
+        """
+        series = self._series.setdefault(puuid, LpSeries())
+
+        if series.last_score() == score:
+            return False
+        if series.timestamps and ts <= series.timestamps[-1]:
+            return False
+
+        series.timestamps.append(ts)
+        series.scores.append(score)
+        self._pending.append((puuid, ts, score))
+        self.aggregates.update(puuid, ts, score)
+        return True
+
+    async def flush(self):
+        """Écrit les points en attente"""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        try:
+            await self.db.executemany(
+                "INSERT OR IGNORE INTO lp_points (puuid, ts, score) VALUES (?, ?, ?)",
+                pending
+            )
+        except Exception:
+            # Les points restent en attente pour le prochain flush
+            self._pending = pending + self._pending
+            raise
+
+    async def close(self):
+        """Écrit les points en attente et ferme la base"""
+        await self.flush()
+        await self.db.close()
@@ -0,0 +1,120 @@
+import time
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.riot_api import RiotAPIClient
+
+logger = logging.getLogger(__name__)
+
+class MasteryStore:
+    """
+    Masteries complètes des joueurs, indexées par championId
+
+    Une seule requête champion-masteries/by-puuid par joueur remplace les
+    appels par champion (lobby) et le top masteries (summoner) : toutes les
+    lectures suivantes se font en mémoire. Une liste plus ancienne que
+    `ttl` est servie telle quelle pendant qu'elle est rafraîchie en tâche
+    de fond ; seul un joueur inconnu fait attendre l'appelant.
+
+    Seuls championId, points et niveau sont gardés, dans des tableaux
+    compacts triés par championId (recherche dichotomique), plus les
+    `top_count` meilleurs champions : environ 2 Ko par joueur au lieu
+    de la réponse JSON complète.
+    """
+
+    def __init__(self, riot_api: RiotAPIClient, ttl: float, max_players: int, top_count: int = 3):
+        """
+        Args:
+            riot_api: Client Riot API partagé
+            ttl: Âge (secondes) au-delà duquel une liste est rafraîchie
+            max_players: Nombre de joueurs gardés en mémoire (LRU)
+            top_count: Nombre de meilleurs champions conservés pour get_top
+        """
+        self.riot_api = riot_api
+        self.ttl = ttl
+        self.max_players = max_players
+        self.top_count = top_count
+
+        # puuid -> {"fetched_at", "ids", "points", "levels" (triés par championId),
+        #           "top": [(championId, points, niveau)] par points décroissants}
+        self._players: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Récupérations en cours par puuid
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def _fetch(self, puuid: str) -> Dict[str, Any]:
+        """Récupère et indexe toutes les masteries d'un joueur"""
+        masteries = await self.riot_api.get_all_champion_masteries(puuid)
+
+        rows = sorted(
+            (m["championId"], m["championPoints"], m["championLevel"]) for m in masteries
+        )
+        top = sorted(rows, key=lambda row: row[1], reverse=True)[:self.top_count]
+
+        entry = {
+            "fetched_at": time.monotonic(),
+            "ids": array("i", (row[0] for row in rows)),
+            "points": array("i", (row[1] for row in rows)),
+            "levels": array("h", (row[2] for row in rows)),
+            "top": top
+        }
+
+        self._players[puuid] = entry
+        self._players.move_to_end(puuid)
+        while len(self._players) > self.max_players:
+            self._players.popitem(last=False)
+
+        return entry
+
+    def _refresh(self, puuid: str) -> asyncio.Task:
+        """Lance (ou rejoint) la récupération d'un joueur"""
+        task = self._inflight.get(puuid)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(puuid))
+            self._inflight[puuid] = task
+            task.add_done_callback(lambda t: self._forget(puuid, t))
+        return task
+
+    def _forget(self, puuid: str, task: asyncio.Task):
+        """Retire une récupération terminée et journalise un échec en tâche de fond"""
+        if self._inflight.get(puuid) is task:
+            del self._inflight[puuid]
+
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Rafraîchissement des masteries impossible pour {puuid}: {task.exception()}")
+
+    async def _get_entry(self, puuid: str) -> Dict[str, Any]:
+        """Retourne l'entrée d'un joueur (récupérée si inconnue, rafraîchie si ancienne)"""
+        entry = self._players.get(puuid)
+
+        if entry is None:
+            # shield: l'annulation d'un appelant n'annule pas la requête des autres
+            return await asyncio.shield(self._refresh(puuid))
+
+        self._players.move_to_end(puuid)
+        if time.monotonic() - entry["fetched_at"] >= self.ttl:
+            self._refresh(puuid)
+        return entry
+
+    @staticmethod
+    def _as_mastery(row: Tuple[int, int, int]) -> Dict[str, Any]:
+        """Reconstitue une mastery au format champion-mastery-v4"""
+        champion_id, points, level = row
+        return {"championId": champion_id, "championPoints": points, "championLevel": level}
+
+    async def get_champion(self, puuid: str, champion_id: int) -> Optional[Dict[str, Any]]:
+        """Retourne la mastery d'un joueur sur un champion (None si jamais joué)"""
+        entry = await self._get_entry(puuid)
+        ids = entry["ids"]
+        index = bisect_left(ids, champion_id)
+        if index == len(ids) or ids[index] != champion_id:
+            return None
+        return self._as_mastery((champion_id, entry["points"][index], entry["levels"][index]))
+
+    async def get_top(self, puuid: str, count: int = 3) -> List[Dict[str, Any]]:
+        """Retourne les `count` champions les mieux maîtrisés d'un joueur (au plus `top_count`)"""
+        entry = await self._get_entry(puuid)
+        return [self._as_mastery(row) for row in entry["top"][:count]]
@@ -0,0 +1,111 @@
+import os
+import gzip
+import json
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.database import SQLiteDatabase
+
+try:
+    import zstandard
+except ImportError:  # Compression gzip si zstandard n'est pas installé
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    codec TEXT NOT NULL
+);
+"""
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class MatchStore:
+    """
+    Stockage local immuable des parties match-v5
+
+    Une partie terminée ne change plus : son JSON est écrit une seule fois,
+    compressé, dans un fichier nommé par le hash de son contenu. Un index
+    SQLite associe chaque match_id à son fichier.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.codec = "zst" if zstandard else "gz"
+        self.db = SQLiteDatabase(self.root / "index.sqlite3", SCHEMA)
+
+    def _object_path(self, digest: str, codec: str) -> Path:
+        """Chemin du fichier d'une partie (répartis par préfixe du hash)"""
+        return self.objects_dir / digest[:2] / f"{digest}.json.{codec}"
+
+    async def has(self, match_id: str) -> bool:
+        """Vérifie si une partie est déjà stockée"""
+        row = await self.db.fetchone(
+            "SELECT 1 FROM matches WHERE match_id = ?",
+            (match_id,)
+        )
+        return row is not None
+
+    async def get(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne une partie stockée ou None"""
+        row = await self.db.fetchone(
+            "SELECT digest, codec FROM matches WHERE match_id = ?",
+            (match_id,)
+        )
+        if not row:
+            return None
+
+        path = self._object_path(row["digest"], row["codec"])
+
+        def _read() -> Dict[str, Any]:
+            return json.loads(_decompress(path.read_bytes(), row["codec"]))
+
+        try:
+            return await asyncio.to_thread(_read)
+        except (OSError, ValueError) as e:
+            logger.error(f"Partie {match_id} illisible ({path}): {e}")
+            return None
+
+    async def put(self, match_id: str, match_data: Dict[str, Any]):
+        """Stocke une partie terminée (sans effet si elle est déjà connue)"""
+        if await self.has(match_id):
+            return
+
+        codec = self.codec
+        raw = json.dumps(match_data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest, codec)
+
+        def _write():
+            if path.exists():
+                return
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_bytes(_compress(raw, codec))
+            os.replace(tmp_path, path)
+
+        await asyncio.to_thread(_write)
+
+        await self.db.execute(
+            "INSERT OR IGNORE INTO matches (match_id, digest, codec) VALUES (?, ?, ?)",
+            (match_id, digest, codec)
+        )
+
+    async def close(self):
+        """Ferme l'index"""
+        await self.db.close()
@@ -0,0 +1,122 @@
+import hashlib
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Dimensions
+WIDTH = 800
+HEIGHT = 400
+ICON_SIZE = 80
+
+# Couleurs
+BG_COLOR = (47, 49, 54)
+GOLD = (255, 215, 0)
+SILVER = (192, 192, 192)
+BRONZE = (205, 127, 50)
+
+# Positions et hauteurs du podium
+PODIUM_LAYOUT = [
+    {"pos": 1, "x": 150, "height": 180, "color": GOLD, "y_offset": 0},      # 1er
+    {"pos": 0, "x": 30, "height": 140, "color": SILVER, "y_offset": 40},   # 2ème
+    {"pos": 2, "x": 270, "height": 100, "color": BRONZE, "y_offset": 80}   # 3ème
+]
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> ImageFont.ImageFont:
+    """Charge une police une seule fois par taille"""
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+def podium_key(top_players: Sequence[Dict]) -> str:
+    """
+    Calcule l'empreinte d'un podium
+
+    Deux podiums de même empreinte produisent exactement la même image.
+    """
+    state = tuple(
+        (
+            player["riot_id"],
+            player.get("rank_display", "Unranked"),
+            player.get("lp", 0),
+            player.get("profile_icon_id", 1)
+        )
+        for player in top_players[:3]
+    )
+    return hashlib.sha1(repr(state).encode("utf-8")).hexdigest()
+
+def _draw_centered(draw: ImageDraw.ImageDraw, center_x: int, y: int, text: str, font, fill):
+    """Écrit un texte centré horizontalement sur center_x"""
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    draw.text((center_x - text_width // 2, y), text, fill=fill, font=font)
+
+def render_podium(
+    top_players: Sequence[Dict],
+    icons: List[Optional[Image.Image]]
+) -> bytes:
+    """
+    Dessine le podium des 3 meilleurs joueurs
+
+    Fonction synchrone (PIL) : à exécuter hors de la boucle asyncio.
+
+    Args:
+        top_players: Les 3 meilleurs joueurs (riot_id, rank_display, lp)
+        icons: Icône de profil de chaque joueur, déjà redimensionnée à ICON_SIZE
+            et masquée en cercle (None si indisponible)
+
+    Returns:
+        Contenu du fichier PNG
+    """
+    font_large = get_font(24)
+    font_small = get_font(16)
+
+    img = Image.new("RGBA", (WIDTH, HEIGHT), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    for layout in PODIUM_LAYOUT:
+        if layout["pos"] >= len(top_players):
+            continue
+
+        player = top_players[layout["pos"]]
+        center_x = layout["x"] + 50
+
+        # Dessiner le podium
+        podium_y = HEIGHT - layout["height"]
+        draw.rectangle(
+            [layout["x"], podium_y, layout["x"] + 100, HEIGHT],
+            fill=layout["color"]
+        )
+
+        # Numéro de place
+        _draw_centered(draw, center_x, podium_y + 10, f"#{layout['pos'] + 1}", font_large, (0, 0, 0))
+
+        # Icône de profil (au-dessus du podium)
+        icon = icons[layout["pos"]]
+        if icon:
+            icon_x = layout["x"] + 10
+            icon_y = podium_y - ICON_SIZE - 10 + layout["y_offset"]
+            img.paste(icon, (icon_x, icon_y), icon)
+
+        # Nom du joueur (sous l'icône), limité en longueur
+        game_name = player["riot_id"].split("#")[0] or "Unknown"
+        if len(game_name) > 10:
+            game_name = game_name[:10] + "..."
+        _draw_centered(
+            draw, center_x, podium_y - 25 + layout["y_offset"],
+            game_name, font_small, (255, 255, 255)
+        )
+
+        # Rang et LP
+        _draw_centered(
+            draw, center_x, podium_y + 40,
+            player.get("rank_display", "Unranked"), font_small, (0, 0, 0)
+        )
+        _draw_centered(draw, center_x, podium_y + 65, f"{player.get('lp', 0)} LP", font_small, (0, 0, 0))
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
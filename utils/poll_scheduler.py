@@ -0,0 +1,230 @@
+import time
+import heapq
+import logging
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.lp_series import LpSeriesStore
+
+logger = logging.getLogger(__name__)
+
+# Intervalle de rafraîchissement selon l'ancienneté de la dernière activité
+# (secondes depuis l'activité, intervalle en secondes), du plus actif au moins actif
+ACTIVITY_TIERS = [
+    (3600, 5 * 60),
+    (6 * 3600, 10 * 60),
+    (24 * 3600, 20 * 60),
+    (3 * 24 * 3600, 60 * 60),
+    (7 * 24 * 3600, 2 * 3600)
+]
+
+# Intervalle d'un joueur sans historique (nouveau ou jamais vu changer) :
+# ni le minimum, qui coûterait cher, ni le maximum, qui le laisserait de côté
+UNKNOWN_ACTIVITY_INTERVAL = 30 * 60
+
+# Au-delà de ce nombre de changements de rang sur 24h, l'intervalle est divisé par deux
+FREQUENT_CHANGES = 3
+
+class PollScheduler:
+    """
+    Cadence de rafraîchissement propre à chaque joueur suivi
+
+    L'intervalle d'un joueur dépend de son activité récente : fin de sa
+    dernière partie, fréquence de ses changements de rang et présence en
+    partie (radar spectator). Un joueur en pleine session est rafraîchi
+    toutes les quelques minutes, un compte inactif depuis des semaines
+    quelques fois par jour.
+
+    Les prochaines échéances sont dans un tas (heapq) : pop_due() ne
+    parcourt que les joueurs dont le tour est venu. Une échéance
+    remplacée reste dans le tas et est ignorée à la sortie.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        post_game_delay: float,
+        lp_series: Optional[LpSeriesStore] = None
+    ):
+        """
+        Args:
+            min_interval: Intervalle minimal (joueur en partie ou très actif)
+            max_interval: Intervalle maximal (compte inactif)
+            post_game_delay: Délai avant rafraîchissement après une fin de partie
+            lp_series: Historique des scores, pour initialiser l'activité au démarrage
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.post_game_delay = post_game_delay
+        self.lp_series = lp_series
+
+        # (échéance, puuid), et échéance en vigueur par puuid
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+
+        # Activité par puuid (timestamps Unix)
+        self._last_activity: Dict[str, float] = {}
+        self._changes: Dict[str, List[float]] = {}
+        self._in_game: Dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    # ---- Calendrier ----
+
+    def _schedule(self, puuid: str, due: float):
+        """Place (ou déplace) l'échéance d'un joueur"""
+        self._due[puuid] = due
+        heapq.heappush(self._heap, (due, puuid))
+
+    def sync(self, puuids: Iterable[str]) -> List[str]:
+        """
+        Aligne le calendrier sur les joueurs suivis
+
+        Les nouveaux joueurs sont dus immédiatement, les joueurs qui ne sont
+        plus suivis sont oubliés.
+
+        Returns:
+            Les nouveaux joueurs sans historique des scores (activité inconnue)
+        """
+        puuids = set(puuids)
+        now = time.time()
+
+        unknown = []
+        for puuid in puuids - set(self._due):
+            self._seed(puuid, now)
+            self._schedule(puuid, now)
+            if puuid not in self._last_activity:
+                unknown.append(puuid)
+
+        for puuid in set(self._due) - puuids:
+            del self._due[puuid]
+            self._last_activity.pop(puuid, None)
+            self._changes.pop(puuid, None)
+            self._in_game.pop(puuid, None)
+
+        return unknown
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Retire et retourne les joueurs dont l'échéance est passée"""
+        now = now if now is not None else time.time()
+        due = []
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, puuid = heapq.heappop(self._heap)
+            # Échéance remplacée depuis, ou joueur oublié
+            if self._due.get(puuid) != due_at:
+                continue
+            due.append(puuid)
+
+        # Sans nouvelle échéance, un joueur reste dû au prochain passage
+        for puuid in due:
+            self._schedule(puuid, now + self.interval(puuid))
+
+        # Compacter le tas quand les échéances périmées dominent
+        if len(self._heap) > 4 * len(self._due) + 64:
+            self._heap = [(due_at, puuid) for puuid, due_at in self._due.items()]
+            heapq.heapify(self._heap)
+
+        return due
+
+    def next_due_in(self, puuid: str) -> Optional[float]:
+        """Secondes avant la prochaine échéance d'un joueur"""
+        due_at = self._due.get(puuid)
+        return max(due_at - time.time(), 0) if due_at is not None else None
+
+    # ---- Activité ----
+
+    def _seed(self, puuid: str, now: float):
+        """Initialise l'activité d'un joueur depuis l'historique des scores"""
+        series = self.lp_series.get(puuid) if self.lp_series else None
+        if not series:
+            return
+
+        self._last_activity[puuid] = series.timestamps[-1]
+        start = bisect_left(series.timestamps, now - 24 * 3600)
+        self._changes[puuid] = list(series.timestamps[start:])
+
+    def interval(self, puuid: str) -> float:
+        """Intervalle de rafraîchissement d'un joueur selon son activité"""
+        if self._in_game.get(puuid):
+            return self.min_interval
+
+        last = self._last_activity.get(puuid)
+        if last is None:
+            return min(max(UNKNOWN_ACTIVITY_INTERVAL, self.min_interval), self.max_interval)
+
+        since = time.time() - last
+        interval = next(
+            (tier_interval for limit, tier_interval in ACTIVITY_TIERS if since < limit),
+            self.max_interval
+        )
+
+        if len(self._changes.get(puuid, ())) >= FREQUENT_CHANGES:
+            interval /= 2
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def activity_factor(self, puuid: str) -> float:
+        """Rapport entre l'intervalle d'un joueur et l'intervalle minimal (1 = très actif)"""
+        return self.interval(puuid) / self.min_interval
+
+    def record_refresh(self, puuid: str, changed: bool):
+        """
+        Prend en compte un rafraîchissement du rang
+
+        Args:
+            puuid: Joueur rafraîchi
+            changed: True si son score de classement a changé
+        """
+        if puuid not in self._due:
+            return
+
+        now = time.time()
+        if changed:
+            self._last_activity[puuid] = now
+            changes = self._changes.setdefault(puuid, [])
+            changes.append(now)
+            # Ne garder que les changements des dernières 24h
+            while changes and changes[0] < now - 24 * 3600:
+                changes.pop(0)
+
+        self._schedule(puuid, now + self.interval(puuid))
+
+    def record_match_end(self, puuid: str, end_ts: float):
+        """
+        Prend en compte la fin de la dernière partie d'un joueur (match-v5)
+
+        Args:
+            puuid: Joueur concerné
+            end_ts: Fin de la partie (timestamp Unix)
+        """
+        if puuid not in self._due or end_ts <= self._last_activity.get(puuid, 0):
+            return
+
+        self._last_activity[puuid] = end_ts
+        due = time.time() + self.interval(puuid)
+        if self._due[puuid] > due:
+            self._schedule(puuid, due)
+
+    def record_game_start(self, puuid: str):
+        """Un joueur est en partie (radar) : il passe à l'intervalle minimal"""
+        if puuid not in self._due:
+            return
+
+        now = time.time()
+        self._in_game[puuid] = True
+        self._last_activity[puuid] = now
+        if self._due[puuid] > now + self.min_interval:
+            self._schedule(puuid, now + self.min_interval)
+
+    def record_game_end(self, puuid: str):
+        """Fin de partie (radar) : rafraîchissement peu après, le temps que les LP soient à jour"""
+        if puuid not in self._due:
+            return
+
+        now = time.time()
+        self._in_game[puuid] = False
+        self._last_activity[puuid] = now
+        if self._due[puuid] > now + self.post_game_delay:
+            self._schedule(puuid, now + self.post_game_delay)
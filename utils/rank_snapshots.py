@@ -0,0 +1,243 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Set
+
+from utils.riot_api import RiotAPIClient
+from utils.lp_series import LpSeriesStore
+from utils.poll_scheduler import PollScheduler
+from utils.constants import calculate_ladder_score
+
+logger = logging.getLogger(__name__)
+
+# Avec un PollScheduler, une entrée reste fraîche jusqu'à l'échéance du
+# joueur, sans jamais dépasser SCHEDULED_MAX_AGE_FACTOR * max_age
+SCHEDULED_MAX_AGE_FACTOR = 2
+
+# Recherches de dernière partie (match-v5) lancées au plus par passage
+MATCH_END_LOOKUPS_PER_TICK = 10
+
+class RankSnapshotService:
+    """
+    Instantané en mémoire des rangs Solo/Duo des joueurs suivis
+
+    Registre global : un même PUUID suivi sur plusieurs serveurs n'a qu'une
+    entrée, rafraîchie une seule fois par cycle et partagée par tous les
+    serveurs qui le suivent. Le coût API dépend du nombre de joueurs uniques,
+    pas du nombre d'inscriptions. Seules les entrées trop anciennes sont
+    récupérées en direct par les commandes.
+
+    Avec un PollScheduler, chaque passage ne rafraîchit que les joueurs
+    dont l'échéance est venue : le budget API va aux rangs qui bougent.
+    Une entrée reste fraîche jusqu'à l'échéance du joueur, dans la limite
+    de SCHEDULED_MAX_AGE_FACTOR * max_age.
+    """
+
+    def __init__(
+        self,
+        riot_api: RiotAPIClient,
+        max_age: int,
+        lp_series: Optional[LpSeriesStore] = None,
+        scheduler: Optional[PollScheduler] = None
+    ):
+        """
+        Args:
+            riot_api: Client Riot API partagé
+            max_age: Âge (secondes) au-delà duquel une entrée est récupérée en direct
+            lp_series: Historique long terme alimenté à chaque relevé
+            scheduler: Cadence adaptative des joueurs (sinon tous à chaque passage)
+        """
+        self.riot_api = riot_api
+        self.max_age = max_age
+        self.lp_series = lp_series
+        self.scheduler = scheduler
+
+        # puuid -> snapshot
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        # puuid -> serveurs qui suivent ce joueur
+        self._guilds: Dict[str, Set[int]] = {}
+        # Nouveaux joueurs sans historique dont la dernière partie reste à chercher
+        self._match_end_queue: Deque[str] = deque()
+        self._match_end_task: Optional[asyncio.Task] = None
+
+    async def fetch_player(self, puuid: str) -> Optional[Dict[str, Any]]:
+        """Récupère le niveau, l'icône et le rang Solo/Duo d'un joueur"""
+        summoner, league_entries = await asyncio.gather(
+            self.riot_api.get_summoner_by_puuid(puuid),
+            self.riot_api.get_league_entries(puuid)
+        )
+        if not summoner:
+            return None
+
+        solo_rank = next(
+            (entry for entry in league_entries
+             if entry.get("queueType") == "RANKED_SOLO_5x5"),
+            None
+        )
+
+        return {
+            "puuid": puuid,
+            "summoner_level": summoner.get("summonerLevel", 0),
+            "profile_icon_id": summoner.get("profileIconId", 1),
+            "solo_rank": solo_rank,
+            "fetched_at": datetime.utcnow()
+        }
+
+    async def _fetch_into(self, puuids: List[str]):
+        """Récupère des joueurs et met à jour le registre"""
+        results = await self.riot_api.get_many(self.fetch_player(puuid) for puuid in puuids)
+
+        for puuid, result in zip(puuids, results):
+            # En cas d'échec, l'ancienne entrée reste disponible
+            if isinstance(result, Exception):
+                logger.warning(f"Rafraîchissement impossible pour {puuid}: {result}")
+                continue
+            if result:
+                previous = self._snapshots.get(puuid)
+                self._snapshots[puuid] = result
+                self._record_score(result)
+                
+                if self.scheduler is not None:
+                    self.scheduler.record_refresh(puuid, self._score_changed(previous, result))
+
+    def _start_match_end_lookups(self):
+        """Lance en tâche de fond la recherche de dernière partie d'un lot de joueurs"""
+        if not self._match_end_queue:
+            return
+        if self._match_end_task is not None and not self._match_end_task.done():
+            return
+
+        count = min(MATCH_END_LOOKUPS_PER_TICK, len(self._match_end_queue))
+        batch = [self._match_end_queue.popleft() for _ in range(count)]
+        self._match_end_task = asyncio.create_task(self._fetch_match_ends(batch))
+
+    async def _fetch_match_ends(self, puuids: List[str]):
+        """Signale au calendrier la fin de la dernière partie de chaque joueur"""
+        try:
+            await self._record_match_ends(puuids)
+        except Exception as e:
+            logger.warning(f"Recherche des dernières parties impossible: {e}")
+
+    async def _record_match_ends(self, puuids: List[str]):
+        """Récupère la dernière partie de chaque joueur (match-v5) et sa date de fin"""
+        histories = await self.riot_api.get_many(
+            self.riot_api.get_match_history(puuid, count=1) for puuid in puuids
+        )
+        latest = {
+            puuid: history[0] for puuid, history in zip(puuids, histories)
+            if not isinstance(history, Exception) and history
+        }
+
+        # Une partie déjà stockée n'est pas retéléchargée (MatchStore)
+        matches = await self.riot_api.get_many(
+            self.riot_api.get_match_details(match_id) for match_id in latest.values()
+        )
+        for puuid, match in zip(latest, matches):
+            if isinstance(match, Exception) or not match:
+                continue
+
+            game_end = match.get("info", {}).get("gameEndTimestamp")
+            if game_end:
+                self.scheduler.record_match_end(puuid, game_end / 1000)
+
+    @staticmethod
+    def _score_changed(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> bool:
+        """Vérifie si le score de classement a changé depuis le relevé précédent"""
+        if previous is None:
+            return False
+        
+        def _score(snapshot):
+            return calculate_ladder_score(snapshot["solo_rank"]) if snapshot["solo_rank"] else None
+        
+        return _score(previous) != _score(current)
+    
+    def _record_score(self, snapshot: Dict[str, Any]):
+        """Ajoute le score de classement d'un relevé à l'historique long terme"""
+        if not self.lp_series or not snapshot["solo_rank"]:
+            return
+
+        self.lp_series.append(
+            snapshot["puuid"],
+            int(time.time()),
+            calculate_ladder_score(snapshot["solo_rank"])
+        )
+
+    def get_guilds(self, puuid: str) -> Set[int]:
+        """Retourne les serveurs qui suivent un joueur"""
+        return self._guilds.get(puuid, set())
+
+    async def refresh_all(self, guild_players: Mapping[int, Iterable[str]]):
+        """
+        Rafraîchit une fois chaque joueur unique de tous les serveurs
+
+        Args:
+            guild_players: guild_id -> PUUID des joueurs suivis par ce serveur
+        """
+        guilds: Dict[str, Set[int]] = {}
+        for guild_id, puuids in guild_players.items():
+            for puuid in puuids:
+                guilds.setdefault(puuid, set()).add(guild_id)
+        self._guilds = guilds
+
+        # Oublier les joueurs qui ne sont plus suivis nulle part
+        for puuid in set(self._snapshots) - set(guilds):
+            del self._snapshots[puuid]
+
+        if self.scheduler is not None:
+            # Un nouveau joueur sans historique part de sa dernière partie, cherchée
+            # en tâche de fond par lots pour ne pas retarder les rafraîchissements
+            self._match_end_queue.extend(self.scheduler.sync(guilds))
+            self._start_match_end_lookups()
+            due = self.scheduler.pop_due()
+        else:
+            due = list(guilds)
+        
+        if not due:
+            return
+        
+        registrations = sum(len(guild_ids) for guild_ids in guilds.values())
+        logger.info(
+            f"Rafraîchissement de {len(due)}/{len(guilds)} joueur(s) unique(s) "
+            f"pour {registrations} inscription(s)"
+        )
+        await self._fetch_into(due)
+
+    def is_fresh(self, snapshot: Dict[str, Any]) -> bool:
+        """Vérifie si une entrée est assez récente pour être servie telle quelle"""
+        age = (datetime.utcnow() - snapshot["fetched_at"]).total_seconds()
+        
+        # Un joueur peu actif garde son entrée jusqu'à sa prochaine échéance,
+        # mais un rang trop ancien est toujours récupéré en direct
+        max_age = self.max_age
+        if self.scheduler is not None:
+            max_age = min(
+                max(max_age, self.scheduler.interval(snapshot["puuid"])),
+                self.max_age * SCHEDULED_MAX_AGE_FACTOR
+            )
+        return age < max_age
+
+    async def get_snapshots(
+        self,
+        guild_id: int,
+        puuids: Iterable[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne l'instantané des joueurs d'un serveur
+
+        Les joueurs absents ou trop anciens sont récupérés en direct avant de répondre.
+        """
+        puuids = list(puuids)
+        for puuid in puuids:
+            self._guilds.setdefault(puuid, set()).add(guild_id)
+
+        stale = [
+            puuid for puuid in puuids
+            if puuid not in self._snapshots or not self.is_fresh(self._snapshots[puuid])
+        ]
+        if stale:
+            logger.info(f"Récupération en direct de {len(stale)} joueur(s) périmé(s)")
+            await self._fetch_into(stale)
+
+        return {puuid: self._snapshots[puuid] for puuid in puuids if puuid in self._snapshots}
@@ -1,37 +1,193 @@
 import aiohttp
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
-from urllib.parse import quote
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Deque, Mapping, Iterable, Awaitable
+from urllib.parse import quote, urlsplit
+
+from config import Config
+from utils.cache import TTLCache, json_size
+from utils.identity_store import IdentityStore
+from utils.match_store import MatchStore
 
 logger = logging.getLogger(__name__)
 
+# Valeur sentinelle pour distinguer un cache miss d'une valeur None
+_MISSING = object()
+
+class RateLimitWindow:
+    """Fenêtre glissante de rate limiting (limit appels par période)"""
+    
+    __slots__ = ("limit", "period", "slots")
+    
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        # Instants des derniers appels, en ordre croissant : seuls les `limit`
+        # derniers comptent, la deque bornée rend chaque opération O(1)
+        self.slots: Deque[float] = deque(maxlen=limit)
+    
+    def next_free(self, now: float) -> float:
+        """Retourne le premier instant où un nouvel appel est autorisé"""
+        if len(self.slots) < self.limit:
+            return now
+        return max(now, self.slots[0] + self.period)
+    
+    def reserve(self, at: float):
+        """Enregistre un appel à l'instant donné"""
+        self.slots.append(at)
+    
+    def resize(self, limit: int):
+        """Change la limite en conservant les créneaux récents"""
+        if limit != self.limit:
+            self.limit = limit
+            self.slots = deque(self.slots, maxlen=limit)
+    
+    def sync_count(self, count: int, now: float):
+        """Aligne le compteur local sur le compteur renvoyé par Riot"""
+        used = 0
+        for slot in reversed(self.slots):
+            if slot <= now - self.period:
+                break
+            used += 1
+        
+        # Riot a vu plus d'appels que nous (autre process, redémarrage...)
+        for _ in range(count - used):
+            self.slots.append(now)
+
 class RateLimiter:
-    """Gère le rate limiting pour l'API Riot"""
+    """
+    Gère le rate limiting pour l'API Riot
+    
+    Suit toutes les fenêtres annoncées par Riot (ex: 20/1s et 100/120s) pour
+    la limite applicative et pour chaque famille d'endpoints (limite de
+    méthode), à partir des headers X-App-Rate-Limit / X-Method-Rate-Limit.
+    Les limites sont propres à chaque hôte (région ou routing).
+    
+    Un appel attend d'abord sa limite de méthode, puis la limite de l'hôte,
+    chacune derrière un verrou FIFO. Il n'est compté dans les fenêtres
+    qu'au moment où il part : une méthode bloquée (429) ne retarde pas les
+    autres méthodes de l'hôte, et un appelant annulé ne garde aucun créneau.
+    """
+    
+    def __init__(self, default_limits: List[Tuple[int, int]]):
+        self.default_limits = default_limits
+        self._buckets: Dict[str, List[RateLimitWindow]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    @staticmethod
+    def _parse_limits(header: Optional[str]) -> List[Tuple[int, int]]:
+        """Parse un header au format "20:1,100:120" en [(20, 1), (100, 120)]"""
+        if not header:
+            return []
+        
+        limits = []
+        for part in header.split(","):
+            try:
+                value, period = part.split(":")
+                limits.append((int(value), int(period)))
+            except ValueError:
+                logger.warning(f"Header de rate limit invalide: {header}")
+        return limits
+    
+    def _get_bucket(self, key: str) -> List[RateLimitWindow]:
+        """Retourne les fenêtres d'un bucket (créé avec les limites par défaut pour l'app)"""
+        if key not in self._buckets:
+            limits = self.default_limits if key.startswith("app:") else []
+            self._buckets[key] = [RateLimitWindow(limit, period) for limit, period in limits]
+        return self._buckets[key]
     
-    def __init__(self, calls_per_second: int = 20):
-        self.calls_per_second = calls_per_second
-        self.calls = []
-        self._lock = asyncio.Lock()
+    def _next_free(self, key: str, now: float) -> float:
+        """Premier instant où un bucket autorise un appel (blocage 429 compris)"""
+        at = max(now, self._blocked_until.get(key, 0.0))
+        for window in self._get_bucket(key):
+            at = max(at, window.next_free(now))
+        return at
     
-    async def acquire(self):
+    async def _wait_for(self, key: str):
+        """Attend qu'un bucket autorise un appel (sans rien réserver)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            at = self._next_free(key, now)
+            if at <= now:
+                return
+            await asyncio.sleep(at - now)
+    
+    async def acquire(self, host: str, method: str):
         """Attend si nécessaire avant d'autoriser un appel"""
-        async with self._lock:
-            now = datetime.now()
-            
-            # Nettoyer les appels de plus d'1 seconde
-            self.calls = [call for call in self.calls 
-                         if now - call < timedelta(seconds=1)]
+        loop = asyncio.get_running_loop()
+        app_key = f"app:{host}"
+        method_key = f"method:{host}:{method}"
+        
+        # Verrous FIFO : les appelants sont servis dans leur ordre d'arrivée
+        method_lock = self._locks.setdefault(method_key, asyncio.Lock())
+        app_lock = self._locks.setdefault(app_key, asyncio.Lock())
+        
+        async with method_lock:
+            while True:
+                await self._wait_for(method_key)
+                async with app_lock:
+                    await self._wait_for(app_key)
+                    
+                    # La méthode a pu être bloquée (429) pendant l'attente de l'hôte
+                    now = loop.time()
+                    if self._next_free(method_key, now) > now:
+                        continue
+                    
+                    for window in self._get_bucket(app_key) + self._get_bucket(method_key):
+                        window.reserve(now)
+                    return
+    
+    def update(self, host: str, method: str, headers: Mapping[str, str]):
+        """Met à jour les fenêtres à partir des headers d'une réponse Riot"""
+        now = asyncio.get_running_loop().time()
+        
+        for key, limit_header, count_header in (
+            (f"app:{host}", "X-App-Rate-Limit", "X-App-Rate-Limit-Count"),
+            (f"method:{host}:{method}", "X-Method-Rate-Limit", "X-Method-Rate-Limit-Count"),
+        ):
+            limits = self._parse_limits(headers.get(limit_header))
+            if not limits:
+                continue
             
-            # Attendre si limite atteinte
-            if len(self.calls) >= self.calls_per_second:
-                sleep_time = 1.0 - (now - self.calls[0]).total_seconds()
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                    self.calls = []
+            windows = {window.period: window for window in self._get_bucket(key)}
+            bucket = []
+            for limit, period in limits:
+                window = windows.get(period)
+                if window:
+                    window.resize(limit)
+                else:
+                    window = RateLimitWindow(limit, period)
+                bucket.append(window)
+            self._buckets[key] = bucket
             
-            self.calls.append(now)
+            counts = dict(
+                (period, count)
+                for count, period in self._parse_limits(headers.get(count_header))
+            )
+            for window in bucket:
+                if window.period in counts:
+                    window.sync_count(counts[window.period], now)
+    
+    def penalize(self, host: str, method: str, headers: Mapping[str, str]) -> float:
+        """
+        Bloque le bucket concerné après une réponse 429
+        
+        Returns:
+            Délai d'attente en secondes
+        """
+        retry_after = float(headers.get("Retry-After", 1))
+        limit_type = headers.get("X-Rate-Limit-Type", "")
+        until = asyncio.get_running_loop().time() + retry_after
+        
+        if limit_type == "application":
+            self._blocked_until[f"app:{host}"] = until
+        elif limit_type == "method":
+            self._blocked_until[f"method:{host}:{method}"] = until
+        
+        return retry_after
 
 class RiotAPIError(Exception):
     """Exception personnalisée pour les erreurs API Riot"""
@@ -40,18 +196,42 @@ class RiotAPIError(Exception):
 class RiotAPIClient:
     """Client asynchrone pour l'API Riot Games"""
     
-    def __init__(self, api_key: str, region: str, routing: str):
+    def __init__(
+        self,
+        api_key: str,
+        region: str,
+        routing: str,
+        identity_store: Optional[IdentityStore] = None,
+        match_store: Optional[MatchStore] = None
+    ):
         self.api_key = api_key
         self.region = region
         self.routing = routing
-        self.rate_limiter = RateLimiter(calls_per_second=20)
+        self.identity_store = identity_store
+        self.match_store = match_store
+        self.rate_limiter = RateLimiter(default_limits=Config.RATE_LIMITS)
         self.session: Optional[aiohttp.ClientSession] = None
-        self._champion_cache: Optional[Dict[str, Any]] = None
+        # Requêtes en cours, partagées entre appelants simultanés (singleflight)
+        self._inflight: Dict[Tuple[str, Tuple], asyncio.Task] = {}
+        # Cache des réponses, durée de vie configurée par famille d'endpoints
+        self.cache = TTLCache(
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_bytes=Config.CACHE_MAX_BYTES,
+            sizeof=json_size
+        )
     
     async def __aenter__(self):
         """Context manager entry"""
+        # Un seul pool de connexions pour tout le bot (Riot API + Data Dragon)
+        connector = aiohttp.TCPConnector(
+            limit=Config.HTTP_POOL_SIZE,
+            limit_per_host=Config.HTTP_POOL_PER_HOST,
+            ttl_dns_cache=Config.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT
+        )
         self.session = aiohttp.ClientSession(
-            headers={"X-Riot-Token": self.api_key}
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
         )
         return self
     
@@ -59,18 +239,26 @@ class RiotAPIClient:
         """Context manager exit"""
         if self.session:
             await self.session.close()
+            self.session = None
     
     async def _request(
         self,
         url: str,
-        max_retries: int = 3,
+        endpoint: str,
+        max_retries: int = Config.MAX_RETRIES,
         **kwargs
     ) -> Optional[Dict[str, Any]]:
         """
-        Effectue une requête HTTP avec retry automatique
+        Effectue une requête HTTP, mise en cache et mutualisée entre appelants
+        
+        Les réponses des endpoints listés dans Config.CACHE_TTLS sont servies
+        depuis le cache pendant leur durée de vie. Si une requête identique
+        (même URL, mêmes paramètres) est déjà en cours, l'appelant attend son
+        résultat au lieu d'en lancer une autre.
         
         Args:
             url: URL à requêter
+            endpoint: Famille d'endpoints (pour la limite de méthode)
             max_retries: Nombre maximum de tentatives
             **kwargs: Arguments additionnels pour aiohttp
         
@@ -80,21 +268,102 @@ class RiotAPIClient:
         Raises:
             RiotAPIError: Si l'API retourne une erreur
         """
+        params = kwargs.get("params") or {}
+        key = (url, tuple(sorted(params.items())))
+        ttl = Config.CACHE_TTLS.get(endpoint)
+        
+        if ttl:
+            cached = self.cache.get(key, _MISSING)
+            if cached is not _MISSING:
+                return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_and_cache(key, ttl, url, endpoint, max_retries, **kwargs)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        else:
+            logger.debug(f"Requête mutualisée: {url}")
+        
+        # shield: l'annulation d'un appelant n'annule pas la requête des autres
+        return await asyncio.shield(task)
+    
+    async def _fetch_and_cache(
+        self,
+        key: Tuple[str, Tuple],
+        ttl: Optional[int],
+        url: str,
+        endpoint: str,
+        max_retries: int,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """Effectue la requête et met la réponse en cache si l'endpoint le permet"""
+        data = await self._fetch(url, endpoint, max_retries, **kwargs)
+        
+        if ttl and data is not None:
+            self.cache.set(key, data, ttl)
+        
+        return data
+    
+    def _forget_inflight(self, key: Tuple[str, Tuple], task: asyncio.Task):
+        """Retire une requête terminée de la table des requêtes en cours"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        
+        # Marquer l'exception comme récupérée si tous les appelants ont abandonné
+        if not task.cancelled():
+            task.exception()
+    
+    async def _fetch(
+        self,
+        url: str,
+        endpoint: str,
+        max_retries: int = Config.MAX_RETRIES,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Effectue une requête HTTP avec retry automatique
+        
+        Args:
+            url: URL à requêter
+            endpoint: Famille d'endpoints (pour la limite de méthode)
+            max_retries: Nombre maximum de tentatives
+            **kwargs: Arguments additionnels pour aiohttp
+        
+        Returns:
+            Données JSON ou None si la ressource n'existe pas (404)
+        
+        Raises:
+            RiotAPIError: Si l'API retourne une erreur ou reste en rate limit
+        """
         logger.info(f"URL: {url}")
 
         if not self.session:
             raise RuntimeError("Session non initialisée. Utilisez 'async with'")
         
-        await self.rate_limiter.acquire()
+        host = urlsplit(url).netloc
         
         for attempt in range(max_retries):
+            await self.rate_limiter.acquire(host, endpoint)
+            
             try:
-                async with self.session.get(url, timeout=10, **kwargs) as response:
+                async with self.session.get(
+                    url,
+                    headers={"X-Riot-Token": self.api_key},
+                    **kwargs
+                ) as response:
+                    self.rate_limiter.update(host, endpoint, response.headers)
+                    
                     # Gestion du rate limiting
                     if response.status == 429:
-                        retry_after = int(response.headers.get("Retry-After", 1))
-                        logger.warning(f"Rate limited. Retry après {retry_after}s")
-                        await asyncio.sleep(retry_after)
+                        retry_after = self.rate_limiter.penalize(host, endpoint, response.headers)
+                        logger.warning(f"Rate limited ({endpoint}). Retry après {retry_after}s")
+                        
+                        # Limite "service" : rien à bloquer côté bucket, on attend ici
+                        if response.headers.get("X-Rate-Limit-Type") not in ("application", "method"):
+                            await asyncio.sleep(retry_after)
                         continue
                     
                     # Ressource non trouvée
@@ -126,7 +395,39 @@ class RiotAPIClient:
                     raise RiotAPIError(f"Erreur réseau: {e}")
                 await asyncio.sleep(1)
         
-        return None
+        # Toutes les tentatives ont été refusées (429) : ce n'est pas un 404,
+        # l'appelant ne doit pas conclure que la ressource n'existe pas
+        raise RiotAPIError(f"Rate limit persistant ({endpoint}) après {max_retries} tentatives")
+    
+    async def get_many(
+        self,
+        calls: Iterable[Awaitable[Any]],
+        concurrency: int = Config.FANOUT_CONCURRENCY
+    ) -> List[Any]:
+        """
+        Exécute plusieurs appels API en parallèle avec une concurrence bornée
+        
+        Le rate limiter reste le seul juge du débit : la borne évite seulement
+        de lancer des centaines de requêtes en attente d'un coup.
+        
+        Args:
+            calls: Appels à exécuter (coroutines)
+            concurrency: Nombre maximum d'appels simultanés
+        
+        Returns:
+            Résultats dans l'ordre des appels ; un appel en échec renvoie
+            son exception au lieu de faire échouer les autres
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _run(call: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await call
+        
+        return await asyncio.gather(
+            *(_run(call) for call in calls),
+            return_exceptions=True
+        )
     
     async def get_account_by_riot_id(
         self,
@@ -134,11 +435,37 @@ class RiotAPIClient:
         tag_line: str
     ) -> Optional[Dict[str, Any]]:
         """Récupère un compte via Riot ID (GameName#TagLine)"""
+        if self.identity_store:
+            known, account = await self.identity_store.lookup(game_name, tag_line)
+            if known:
+                return account
+        
         url = (
             f"https://{self.routing}.api.riotgames.com/riot/account/v1/"
             f"accounts/by-riot-id/{quote(game_name)}/{quote(tag_line)}"
         )
-        return await self._request(url)
+        account = await self._request(url, endpoint="account-v1.by-riot-id")
+        
+        if self.identity_store:
+            if account:
+                await self.identity_store.save_account(account)
+            else:
+                await self.identity_store.save_miss(game_name, tag_line)
+        
+        return account
+    
+    async def get_account_by_puuid(self, puuid: str) -> Optional[Dict[str, Any]]:
+        """Récupère le Riot ID actuel d'un compte via PUUID"""
+        url = (
+            f"https://{self.routing}.api.riotgames.com/riot/account/v1/"
+            f"accounts/by-puuid/{puuid}"
+        )
+        account = await self._request(url, endpoint="account-v1.by-puuid")
+        
+        if account and self.identity_store:
+            await self.identity_store.save_account(account)
+        
+        return account
     
     async def get_summoner_by_puuid(self, puuid: str) -> Optional[Dict[str, Any]]:
         """Récupère les infos d'un summoner via PUUID"""
@@ -146,7 +473,7 @@ class RiotAPIClient:
             f"https://{self.region}.api.riotgames.com/lol/summoner/v4/"
             f"summoners/by-puuid/{puuid}"
         )
-        return await self._request(url)
+        return await self._request(url, endpoint="summoner-v4.by-puuid")
     
     async def get_league_entries(self, puuid: str) -> List[Dict[str, Any]]:
         """Récupère les rangs d'un joueur"""
@@ -154,43 +481,67 @@ class RiotAPIClient:
             f"https://{self.region}.api.riotgames.com/lol/league/v4/"
             f"entries/by-puuid/{puuid}"
         )
-        result = await self._request(url)
+        result = await self._request(url, endpoint="league-v4.entries-by-puuid")
         return result if result else []
     
-    async def get_champion_masteries(
-        self,
-        puuid: str,
-        count: int = 3
-    ) -> List[Dict[str, Any]]:
-        """Récupère les masteries d'un joueur"""
+    async def get_all_champion_masteries(self, puuid: str) -> List[Dict[str, Any]]:
+        """
+        Récupère toutes les masteries d'un joueur (triées par points décroissants)
+        
+        Pas de cache ici : la liste complète est conservée par MasteryStore.
+        """
         url = (
             f"https://{self.region}.api.riotgames.com/lol/"
-            f"champion-mastery/v4/champion-masteries/by-puuid/{puuid}/top"
+            f"champion-mastery/v4/champion-masteries/by-puuid/{puuid}"
         )
-        result = await self._request(url, params={"count": count})
+        result = await self._request(url, endpoint="champion-mastery-v4.by-puuid")
         return result if result else []
     
-    async def get_champion_mastery_by_champion(
-        self,
-        puuid: str,
-        champion_id: int
-    ) -> Optional[Dict[str, Any]]:
-        """Récupère la mastery d'un joueur pour un champion spécifique"""
-        url = (
-            f"https://{self.region}.api.riotgames.com/lol/"
-            f"champion-mastery/v4/champion-masteries/by-puuid/"
-            f"{puuid}/by-champion/{champion_id}"
-        )
-        return await self._request(url
-    )
-
     async def get_lobby_by_puuid(self, puuid: str) -> Optional[Dict[str, Any]]:
         """Récupère les infos d'un lobby via Summoner ID"""
         url = (
             f"https://{self.region}.api.riotgames.com/lol/spectator/v5/"
             f"active-games/by-summoner/{puuid}"
         )
-        return await self._request(url)
+        return await self._request(url, endpoint="spectator-v5.active-games")
+    
+    async def get_match_history(
+        self,
+        puuid: str,
+        count: int = 20,
+        start: int = 0,
+        queue: Optional[int] = None
+    ) -> List[str]:
+        """Récupère les IDs des dernières parties d'un joueur (match-v5)"""
+        url = (
+            f"https://{self.routing}.api.riotgames.com/lol/match/v5/"
+            f"matches/by-puuid/{puuid}/ids"
+        )
+        params = {"start": start, "count": count}
+        if queue is not None:
+            params["queue"] = queue
+        
+        result = await self._request(url, endpoint="match-v5.ids-by-puuid", params=params)
+        return result if result else []
+    
+    async def get_match_details(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """Récupère le détail d'une partie (stockage local, puis match-v5)"""
+        if self.match_store:
+            match_data = await self.match_store.get(match_id)
+            if match_data:
+                return match_data
+        
+        url = (
+            f"https://{self.routing}.api.riotgames.com/lol/match/v5/"
+            f"matches/{match_id}"
+        )
+        match_data = await self._request(url, endpoint="match-v5.match")
+        
+        # Une partie terminée est immuable : on ne la télécharge qu'une fois
+        if match_data and self.match_store:
+            await self.match_store.put(match_id, match_data)
+        
+        return match_data
     
     async def get_champion_rotation(self) -> Optional[Dict[str, Any]]:
         """Récupère la rotation gratuite de champions"""
@@ -198,15 +549,30 @@ class RiotAPIClient:
             f"https://{self.region}.api.riotgames.com/lol/platform/v3/"
             f"champion-rotations"
         )
-        return await self._request(url)
+        return await self._request(url, endpoint="champion-v3.rotations")
+    
+    async def get_ddragon_versions(self) -> List[str]:
+        """Récupère la liste des versions Data Dragon (la plus récente en premier)"""
+        if not self.session:
+            raise RuntimeError("Session non initialisée")
+        
+        async with self.session.get(Config.DDRAGON_VERSIONS_URL) as response:
+            if response.status == 200:
+                return await response.json()
+        
+        return []
     
-    async def get_champion_data(self) -> Dict[str, Any]:
-        """Récupère les données champions de Data Dragon (avec cache)"""
-        if self._champion_cache:
-            return self._champion_cache
+    async def get_champion_data(self, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Télécharge les données champions de Data Dragon
+        
+        Args:
+            version: Version Data Dragon (par défaut la version courante)
         
-        from config import Config
-        url = Config.DDRAGON_CHAMPION_DATA_URL
+        Returns:
+            Champ "data" de champion.json (vide en cas d'échec)
+        """
+        url = Config.get_champion_data_url(version)
         
         if not self.session:
             raise RuntimeError("Session non initialisée")
@@ -214,21 +580,8 @@ class RiotAPIClient:
         async with self.session.get(url) as response:
             if response.status == 200:
                 data = await response.json()
-                self._champion_cache = data.get("data", {})
-                return self._champion_cache
+                return data.get("data", {})
         
         return {}
     
-    def get_champion_name_by_id(self, champion_id: int) -> Optional[str]:
-        """Retourne le nom d'un champion à partir de son ID"""
-        if not self._champion_cache:
-            return None
-        
-        champion_id_str = str(champion_id)
-        for name, data in self._champion_cache.items():
-            if data.get("key") == champion_id_str:
-                return name
-        
-        return None
-    
     
\ No newline at end of file
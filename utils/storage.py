@@ -0,0 +1,298 @@
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Tuple
+
+from utils.database import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    puuid TEXT PRIMARY KEY,
+    riot_id TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS guild_members (
+    guild_id INTEGER NOT NULL,
+    puuid TEXT NOT NULL,
+    discord_user_id TEXT NOT NULL,
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (guild_id, puuid)
+);
+
+CREATE INDEX IF NOT EXISTS idx_guild_members_puuid
+    ON guild_members (puuid);
+CREATE INDEX IF NOT EXISTS idx_guild_members_discord_user
+    ON guild_members (guild_id, discord_user_id);
+
+CREATE TABLE IF NOT EXISTS lp_snapshots (
+    guild_id INTEGER NOT NULL,
+    puuid TEXT NOT NULL,
+    date TEXT NOT NULL,
+    lp INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, puuid, date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_lp_snapshots_date
+    ON lp_snapshots (date);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+PLAYER_COLUMNS = (
+    "m.discord_user_id, p.riot_id, m.puuid, m.added_at "
+    "FROM guild_members m JOIN players p ON p.puuid = m.puuid"
+)
+
+def _player_from_row(row) -> Dict[str, Any]:
+    """Convertit une ligne SQL au format joueur historique des leaderboards"""
+    return {
+        "discord_user_id": row["discord_user_id"],
+        "riot_id": row["riot_id"],
+        "puuid": row["puuid"],
+        "added_at": row["added_at"]
+    }
+
+class LeaderboardStorage:
+    """
+    Stockage SQLite des leaderboards et de l'historique LP
+
+    Remplace les fichiers data/leaderboards/{guild}.json et
+    {guild}_lp_history.json : chaque ajout de joueur est une écriture indexée
+    et les relevés LP sont regroupés puis écrits en différé.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db = SQLiteDatabase(db_path, SCHEMA)
+
+        # LP de début de journée par (guild_id, date), et relevés pas encore écrits
+        self._lp_days: Dict[Tuple[int, str], Dict[str, int]] = {}
+        self._pending_lp: Dict[Tuple[int, str, str], int] = {}
+
+    # ---- Leaderboards ----
+
+    async def get_guild_ids(self) -> List[int]:
+        """Retourne les IDs des serveurs ayant au moins un joueur"""
+        rows = await self.db.fetchall("SELECT DISTINCT guild_id FROM guild_members")
+        return [row["guild_id"] for row in rows]
+
+    async def get_players(self, guild_id: int) -> List[Dict[str, Any]]:
+        """Retourne les joueurs d'un serveur, dans l'ordre d'ajout"""
+        rows = await self.db.fetchall(
+            f"SELECT {PLAYER_COLUMNS} WHERE m.guild_id = ? ORDER BY m.added_at",
+            (guild_id,)
+        )
+        return [_player_from_row(row) for row in rows]
+
+    async def get_players_by_discord_id(
+        self,
+        guild_id: int,
+        discord_id: int
+    ) -> List[Dict[str, Any]]:
+        """Retourne tous les comptes d'un utilisateur Discord sur un serveur"""
+        rows = await self.db.fetchall(
+            f"SELECT {PLAYER_COLUMNS} WHERE m.guild_id = ? AND m.discord_user_id = ? "
+            "ORDER BY m.added_at",
+            (guild_id, str(discord_id))
+        )
+        return [_player_from_row(row) for row in rows]
+
+    async def get_all_players(self) -> Dict[str, str]:
+        """Retourne tous les comptes suivis (puuid -> Riot ID)"""
+        rows = await self.db.fetchall(
+            "SELECT p.puuid, p.riot_id FROM players p "
+            "WHERE EXISTS (SELECT 1 FROM guild_members m WHERE m.puuid = p.puuid)"
+        )
+        return {row["puuid"]: row["riot_id"] for row in rows}
+
+    async def player_exists(self, guild_id: int, puuid: str) -> bool:
+        """Vérifie si un joueur est déjà dans le leaderboard d'un serveur"""
+        row = await self.db.fetchone(
+            "SELECT 1 FROM guild_members WHERE guild_id = ? AND puuid = ?",
+            (guild_id, puuid)
+        )
+        return row is not None
+
+    async def add_player(self, guild_id: int, player: Dict[str, Any]):
+        """Ajoute un joueur au leaderboard d'un serveur"""
+        def _add(conn):
+            with conn:
+                conn.execute(
+                    "INSERT INTO players (puuid, riot_id) VALUES (?, ?) "
+                    "ON CONFLICT (puuid) DO UPDATE SET riot_id = excluded.riot_id",
+                    (player["puuid"], player["riot_id"])
+                )
+                conn.execute(
+                    "INSERT OR IGNORE INTO guild_members "
+                    "(guild_id, puuid, discord_user_id, added_at) VALUES (?, ?, ?, ?)",
+                    (guild_id, player["puuid"], player["discord_user_id"], player["added_at"])
+                )
+
+        await self.db.run(_add)
+
+    async def update_riot_id(self, puuid: str, riot_id: str):
+        """Met à jour le Riot ID d'un compte (renommage) pour tous les serveurs"""
+        await self.db.execute(
+            "UPDATE players SET riot_id = ? WHERE puuid = ?",
+            (riot_id, puuid)
+        )
+
+    # ---- Historique LP ----
+
+    async def _get_lp_day(self, guild_id: int, date: str) -> Dict[str, int]:
+        """Retourne les LP de début de journée d'un serveur (chargés une fois par jour)"""
+        key = (guild_id, date)
+        if key not in self._lp_days:
+            # Changement de jour : les journées précédentes ne servent plus
+            for old_key in [k for k in self._lp_days if k[1] != date]:
+                del self._lp_days[old_key]
+
+            rows = await self.db.fetchall(
+                "SELECT puuid, lp FROM lp_snapshots WHERE guild_id = ? AND date = ?",
+                (guild_id, date)
+            )
+            # setdefault : un appel concurrent a pu charger la journée entre-temps
+            self._lp_days.setdefault(key, {row["puuid"]: row["lp"] for row in rows})
+        return self._lp_days[key]
+
+    async def record_lp_batch(
+        self,
+        guild_id: int,
+        date: str,
+        current_lps: Mapping[str, int]
+    ) -> Dict[str, int]:
+        """
+        Enregistre les LP actuels de plusieurs joueurs d'un serveur
+
+        Le premier relevé du jour sert de référence. Les nouveaux relevés sont
+        gardés en mémoire et écrits en une seule transaction par flush_lp().
+
+        Args:
+            guild_id: ID du serveur
+            date: Date du relevé (YYYY-MM-DD)
+            current_lps: puuid -> LP actuels
+
+        Returns:
+            puuid -> gain de LP depuis le début de la journée
+        """
+        day = await self._get_lp_day(guild_id, date)
+
+        gains = {}
+        for puuid, lp in current_lps.items():
+            if puuid in day:
+                gains[puuid] = lp - day[puuid]
+            else:
+                # Première entrée de la journée
+                day[puuid] = lp
+                self._pending_lp[(guild_id, puuid, date)] = lp
+                gains[puuid] = 0
+
+        return gains
+
+    async def flush_lp(self):
+        """Écrit les relevés LP en attente"""
+        if not self._pending_lp:
+            return
+
+        pending, self._pending_lp = self._pending_lp, {}
+        try:
+            await self.db.executemany(
+                "INSERT OR IGNORE INTO lp_snapshots (guild_id, puuid, date, lp) "
+                "VALUES (?, ?, ?, ?)",
+                [(guild_id, puuid, date, lp) for (guild_id, puuid, date), lp in pending.items()]
+            )
+        except Exception:
+            # Ces relevés ne seront plus jamais remis en attente : les garder pour le prochain flush
+            pending.update(self._pending_lp)
+            self._pending_lp = pending
+            raise
+
+    async def prune_lp_history(self, cutoff_date: str):
+        """Supprime les relevés LP antérieurs à une date (YYYY-MM-DD)"""
+        await self.db.execute("DELETE FROM lp_snapshots WHERE date < ?", (cutoff_date,))
+
+    # ---- Migration ----
+
+    async def migrate_json(self, data_dir: Path):
+        """
+        Importe une seule fois les anciens fichiers JSON de data_dir
+
+        Les fichiers importés sont renommés en *.json.migrated.
+        """
+        row = await self.db.fetchone("SELECT value FROM meta WHERE key = 'json_migrated'")
+        if row:
+            return
+
+        data_dir = Path(data_dir)
+        members: List[Tuple] = []
+        players: Dict[str, str] = {}
+        lp_rows: List[Tuple] = []
+        migrated_files: List[Path] = []
+
+        for file_path in sorted(data_dir.glob("*.json")):
+            guild_part, _, suffix = file_path.stem.partition("_")
+            if not guild_part.isdigit() or suffix not in ("", "lp_history"):
+                continue
+
+            guild_id = int(guild_part)
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"Migration impossible pour {file_path}: {e}")
+                continue
+
+            if suffix == "lp_history":
+                # Structure: {puuid: {date: lp}}
+                for puuid, history in data.items():
+                    for date, lp in history.items():
+                        lp_rows.append((guild_id, puuid, date, lp))
+            else:
+                for player in data.get("players", []):
+                    players[player["puuid"]] = player["riot_id"]
+                    members.append((
+                        guild_id,
+                        player["puuid"],
+                        player["discord_user_id"],
+                        player["added_at"]
+                    ))
+
+            migrated_files.append(file_path)
+
+        def _migrate(conn):
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO players (puuid, riot_id) VALUES (?, ?)",
+                    players.items()
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO guild_members "
+                    "(guild_id, puuid, discord_user_id, added_at) VALUES (?, ?, ?, ?)",
+                    members
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO lp_snapshots (guild_id, puuid, date, lp) "
+                    "VALUES (?, ?, ?, ?)",
+                    lp_rows
+                )
+                conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+
+        await self.db.run(_migrate)
+
+        for file_path in migrated_files:
+            os.replace(file_path, file_path.with_suffix(".json.migrated"))
+
+        logger.info(
+            f"Migration JSON terminée: {len(members)} inscription(s), "
+            f"{len(lp_rows)} relevé(s) LP depuis {len(migrated_files)} fichier(s)"
+        )
+
+    async def close(self):
+        """Écrit les relevés en attente et ferme la base"""
+        await self.flush_lp()
+        await self.db.close()